@@ -4,6 +4,9 @@ from mystics_and_manuscripts.level import Action, Path, Achievement
 fake_throne_room_discovered = False
 drink_wine_attempts = 0
 
+# module globals saved with the game
+saved_globals = ["fake_throne_room_discovered", "drink_wine_attempts"]
+
 
 def create_ladder(game: Game):
     """
@@ -0,0 +1,33 @@
+import json
+from argparse import ArgumentParser
+
+from mystics_and_manuscripts.analysis.reachability import ReachabilityReport
+from mystics_and_manuscripts.level import load_levels
+
+parser = ArgumentParser(prog="python -m mystics_and_manuscripts.analysis", description="Analyze a level without playing it.")
+subparsers = parser.add_subparsers(dest="analysis", required=True)
+
+reachability_parser = subparsers.add_parser("reachability", help="find unreachable places, soft-locks and unusable paths")
+reachability_parser.add_argument("level", help="path to the level file, e.g. levels/castle/level.yaml")
+reachability_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+markov_parser = subparsers.add_parser("markov", help="outcome probabilities for a player choosing options at random")
+markov_parser.add_argument("level", help="path to the level file, e.g. levels/castle/level.yaml")
+markov_parser.add_argument("--ignore-actions", action="store_true", help="don't count actions among the options")
+markov_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+args = parser.parse_args()
+level = load_levels([args.level])[0]
+
+if args.analysis == "reachability":
+    report = ReachabilityReport(level)
+else:
+    # NumPy is an optional dependency, only imported when needed
+    from mystics_and_manuscripts.analysis.markov import MarkovChain
+
+    report = MarkovChain(level, include_actions=not args.ignore_actions).analyze()
+
+if args.json:
+    print(json.dumps(report.to_dict(), indent=2))
+else:
+    print(report.to_text())
@@ -0,0 +1,312 @@
+from mystics_and_manuscripts.analysis.reachability import ENDINGS, StateGraph
+from mystics_and_manuscripts.level import Level
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("The Markov chain analysis needs NumPy, install it with: pip install numpy") from error
+
+try:
+    # optional, makes large levels much faster
+    from scipy.sparse import csc_matrix, identity
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    spsolve = None
+
+# outcomes of play-throughs that never reach an ending
+STUCK = "stuck"  # no usable path (only actions, which aren't analyzed, are left)
+TRAPPED = "trapped"  # wandering forever between places from which no ending can be reached
+
+# note: both are absorbing, states from which no ending is reachable aren't analyzed any further
+
+OUTCOMES = ENDINGS + (STUCK, TRAPPED)
+
+# number of states up to which the linear systems are solved with dense matrices (when SciPy isn't available)
+DENSE_STATE_LIMIT = 3000
+
+# precision of the iterative solver used for bigger levels
+ITERATIVE_TOLERANCE = 1e-10
+ITERATIVE_MAX_ITERATIONS = 1_000_000
+
+
+class MarkovChain:
+    def __init__(self, level: Level, include_actions: bool = True):
+        """
+        A level compiled into an absorbing Markov chain over (place, inventory) states, for a player choosing options
+        uniformly at random. Level scripts aren't run, so actions only count as staying in place.
+
+        Args:
+            level (Level): Level to compile.
+            include_actions (bool, optional): True if actions are among the options (the player then sometimes stays
+                in place, which only affects the step counts). Default: True
+        """
+
+        graph = StateGraph(level)
+
+        self.level = level
+        self.states = graph.states
+
+        state_count = len(graph.states)
+
+        place_ends = {place.id: place.end for place in level.places}
+        is_ending = np.array([place_ends[place_id] in ENDINGS for place_id, _ in graph.states], dtype=bool)
+
+        # states that can never reach an ending are a single absorbing "trapped" outcome
+        reaching_ending = graph.get_states_reaching(set(np.flatnonzero(is_ending).tolist()))
+        is_trapped = np.ones(state_count, dtype=bool)
+        is_trapped[list(reaching_ending)] = False
+
+        # the remaining states are transient
+        self.transient_states = np.flatnonzero(~is_ending & ~is_trapped)
+        transient_indexes = np.full(state_count, -1)
+        transient_indexes[self.transient_states] = np.arange(len(self.transient_states))
+
+        # sparse transition matrix between transient states (coordinates format) and absorption probabilities
+        rows, columns, values = [], [], []
+        self.absorbing = np.zeros((len(self.transient_states), len(OUTCOMES)))
+
+        for transient_index, state_index in enumerate(self.transient_states):
+            successors = graph.successors[state_index]
+            probabilities = np.array(graph.probabilities[state_index])
+
+            # actions are chosen as often as each path, but the player stays in the same state
+            stay_probability = 0.0
+
+            if include_actions:
+                place_id = graph.states[state_index][0]
+                action_count = len(level.get_actions_in_place(place_id))
+                stay_probability = action_count / (action_count + graph.usable_path_counts[state_index])
+                probabilities = probabilities * (1 - stay_probability)
+
+            if stay_probability > 0:
+                rows.append(transient_index)
+                columns.append(transient_index)
+                values.append(stay_probability)
+
+            for successor, probability in zip(successors, probabilities):
+                if transient_indexes[successor] >= 0:
+                    rows.append(transient_index)
+                    columns.append(transient_indexes[successor])
+                    values.append(probability)
+                elif is_ending[successor]:
+                    ending = place_ends[graph.states[successor][0]]
+                    self.absorbing[transient_index, OUTCOMES.index(ending)] += probability
+                else:
+                    outcome = STUCK if len(graph.successors[successor]) == 0 else TRAPPED
+                    self.absorbing[transient_index, OUTCOMES.index(outcome)] += probability
+
+            # no usable path, or destinations that don't exist
+            leak = 1 - stay_probability - probabilities.sum()
+
+            if leak > 1e-12:
+                self.absorbing[transient_index, OUTCOMES.index(STUCK)] += leak
+
+        self.rows = np.array(rows, dtype=np.int64)
+        self.columns = np.array(columns, dtype=np.int64)
+        self.values = np.array(values, dtype=np.float64)
+
+        # initial distribution over all states, the starting place is chosen uniformly
+        self.initial = np.zeros(state_count)
+
+        for state_index in graph.start_states.values():
+            self.initial[state_index] = 1 / len(graph.start_states)
+
+        self.start_states = graph.start_states
+        self.is_ending = is_ending
+        self.is_stuck = np.array([len(successors) == 0 for successors in graph.successors], dtype=bool) & ~is_ending
+
+    def multiply(self, vectors, transpose: bool = False):
+        """
+        Multiply vectors by the transient transition matrix Q (or its transpose).
+
+        Args:
+            vectors: Array of shape (transient state count, k).
+            transpose (bool, optional): True to multiply by the transposed matrix. Default: False
+
+        Returns:
+            Array of shape (transient state count, k).
+        """
+
+        rows, columns = (self.columns, self.rows) if transpose else (self.rows, self.columns)
+        result = np.empty_like(vectors)
+
+        for k in range(vectors.shape[1]):
+            result[:, k] = np.bincount(rows, self.values * vectors[columns, k], minlength=vectors.shape[0])
+
+        return result
+
+    def solve(self, right_side, transpose: bool = False):
+        """
+        Solve (I - Q) X = B (or the transposed system) for X.
+
+        Args:
+            right_side: Array B of shape (transient state count, k).
+            transpose (bool, optional): True to solve the transposed system. Default: False
+
+        Returns:
+            Array X of shape (transient state count, k).
+        """
+
+        size = len(self.transient_states)
+        rows, columns = (self.columns, self.rows) if transpose else (self.rows, self.columns)
+
+        if spsolve is not None:
+            matrix = identity(size, format="csc") - csc_matrix((self.values, (rows, columns)), shape=(size, size))
+            return np.asarray(spsolve(matrix, right_side)).reshape(right_side.shape)
+
+        if size <= DENSE_STATE_LIMIT:
+            matrix = np.eye(size)
+            np.add.at(matrix, (rows, columns), -self.values)
+            return np.linalg.solve(matrix, right_side)
+
+        # X = B + Q X converges, as every transient state eventually gets absorbed
+        solution = right_side.copy()
+
+        for _ in range(ITERATIVE_MAX_ITERATIONS):
+            new_solution = right_side + self.multiply(solution, transpose)
+
+            if np.abs(new_solution - solution).max() <= ITERATIVE_TOLERANCE:
+                return new_solution
+
+            solution = new_solution
+
+        return solution
+
+    def analyze(self) -> "MarkovReport":
+        """
+        Compute absorption probabilities, expected step counts and visit frequencies.
+
+        Returns:
+            MarkovReport: Results of the analysis.
+        """
+
+        transient_initial = self.initial[self.transient_states]
+
+        # absorption probabilities B = (I - Q)^-1 R and expected steps t = (I - Q)^-1 1
+        right_side = np.hstack([self.absorbing, np.ones((len(self.transient_states), 1))])
+        solution = self.solve(right_side) if len(self.transient_states) > 0 else right_side
+
+        absorption = solution[:, :-1]
+        expected_steps = solution[:, -1]
+
+        # expected visits of each transient state v = (I - Q)^-T p0
+        visits = self.solve(transient_initial[:, np.newaxis], transpose=True)[:, 0] \
+            if len(self.transient_states) > 0 else transient_initial
+
+        return MarkovReport(self, absorption, expected_steps, visits)
+
+
+class MarkovReport:
+    def __init__(self, chain: MarkovChain, absorption, expected_steps, visits):
+        """
+        Results of a Markov chain analysis.
+
+        Args:
+            chain (MarkovChain): Analyzed chain.
+            absorption: Absorption probabilities of each transient state, shape (transient state count, outcomes).
+            expected_steps: Expected number of steps until absorption of each transient state.
+            visits: Expected number of visits of each transient state in one play-through.
+        """
+
+        self.state_count = len(chain.states)
+        self.transient_state_count = len(chain.transient_states)
+
+        transient_indexes = {state_index: i for i, state_index in enumerate(chain.transient_states.tolist())}
+
+        # starting place ID -> (outcome -> probability, expected steps)
+        self.starts = {}
+
+        for place_id, state_index in chain.start_states.items():
+            outcome_probabilities = dict.fromkeys(OUTCOMES, 0.0)
+
+            if state_index in transient_indexes:
+                transient_index = transient_indexes[state_index]
+                outcome_probabilities.update(zip(OUTCOMES, absorption[transient_index].tolist()))
+                steps = float(expected_steps[transient_index])
+            elif chain.is_ending[state_index]:
+                # the game ends right at the start
+                outcome_probabilities[chain.level.get_place_by_id(place_id).end] = 1.0
+                steps = 0.0
+            else:
+                outcome_probabilities[STUCK if chain.is_stuck[state_index] else TRAPPED] = 1.0
+                steps = float("inf")
+
+            self.starts[place_id] = (outcome_probabilities, steps)
+
+        # outcome probabilities and expected steps over the random choice of the starting place
+        start_weight = 1 / len(self.starts) if len(self.starts) > 0 else 0.0
+        self.outcomes = {
+            outcome: sum(probabilities[outcome] for probabilities, _ in self.starts.values()) * start_weight
+            for outcome in OUTCOMES
+        }
+        self.expected_steps = sum(steps for _, steps in self.starts.values()) * start_weight
+
+        # share of time spent in each place (stationary visit frequencies of the transient part)
+        place_visits = {}
+
+        for transient_index, state_index in enumerate(chain.transient_states.tolist()):
+            place_id = chain.states[state_index][0]
+            place_visits[place_id] = place_visits.get(place_id, 0.0) + float(visits[transient_index])
+
+        total_visits = sum(place_visits.values())
+        self.visit_frequencies = {
+            place_id: count / total_visits
+            for place_id, count in sorted(place_visits.items(), key=lambda item: -item[1])
+        } if total_visits > 0 else {}
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "states": self.state_count,
+            "transient_states": self.transient_state_count,
+            "outcomes": self.outcomes,
+            "expected_steps": self.expected_steps,
+            "starts": {
+                str(place_id): {"outcomes": probabilities, "expected_steps": steps}
+                for place_id, (probabilities, steps) in self.starts.items()
+            },
+            "visit_frequencies": {str(place_id): frequency for place_id, frequency in self.visit_frequencies.items()},
+        }
+
+    def to_text(self, top_places: int = 10) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Args:
+            top_places (int, optional): Number of most visited places to list. Default: 10
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        lines = [
+            f"{self.state_count} (place, inventory) states, {self.transient_state_count} transient. Options are chosen "
+            f"uniformly at random, level scripts aren't taken into account.",
+            "",
+            f"Expected steps: {self.expected_steps:.2f}",
+            "Outcome probabilities:",
+        ]
+
+        for outcome, probability in self.outcomes.items():
+            lines.append(f"  {outcome}: {probability:.4%}")
+
+        for place_id, (probabilities, steps) in self.starts.items():
+            lines.append("")
+            lines.append(f"Starting at place {place_id} (expected steps: {steps:.2f}):")
+
+            for outcome, probability in probabilities.items():
+                lines.append(f"  {outcome}: {probability:.4%}")
+
+        lines.append("")
+        lines.append("Most visited places:")
+
+        for place_id, frequency in list(self.visit_frequencies.items())[:top_places]:
+            lines.append(f"  {place_id}: {frequency:.2%}")
+
+        return "\n".join(lines)
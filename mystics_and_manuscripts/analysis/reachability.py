@@ -0,0 +1,235 @@
+from collections import deque
+
+from mystics_and_manuscripts.level import Level
+
+# endings a place can have
+ENDINGS = ("win", "loss", "draw")
+
+
+class StateGraph:
+    def __init__(self, level: Level):
+        """
+        Graph of every (place, inventory) state the player can reach in a level, built from the level data only (level
+        scripts aren't run). Inventories are stored as item bit masks, so each state is just a pair of integers.
+
+        Args:
+            level (Level): Level to analyze.
+        """
+
+        self.level = level
+
+        self.states = []  # state index -> (place ID, inventory mask)
+        self.state_indexes = {}  # (place ID, inventory mask) -> state index
+        self.successors = []  # state index -> list of state indexes
+        self.probabilities = []  # state index -> probabilities of moving to the successors (paths chosen uniformly)
+        self.usable_path_counts = []  # state index -> number of paths the player can choose from
+        self.start_states = {}  # starting place ID -> state index
+
+        self.used_paths = set()  # IDs (Python object IDs) of paths that can be used in some state
+        self.missing_place_ids = set()  # place IDs referenced by paths but not defined
+
+        # items added when entering each place
+        self.place_item_masks = {place.id: level.item_registry.get_mask(place.items) for place in level.places}
+
+        self.build()
+
+    def add_state(self, place_id: int, inventory_mask: int, queue: deque) -> int:
+        """
+        Return the index of a state, add it to the graph (and the queue) if it's new.
+        """
+
+        key = (place_id, inventory_mask)
+        state_index = self.state_indexes.get(key)
+
+        if state_index is None:
+            state_index = len(self.states)
+            self.states.append(key)
+            self.state_indexes[key] = state_index
+            self.successors.append([])
+            self.probabilities.append([])
+            self.usable_path_counts.append(0)
+            queue.append(state_index)
+
+        return state_index
+
+    def build(self) -> None:
+        """
+        Explore the states reachable from all starting places (breadth-first).
+        """
+
+        queue = deque()
+
+        for place in self.level.find_starting_places():
+            self.start_states[place.id] = self.add_state(place.id, self.place_item_masks[place.id], queue)
+
+        while len(queue) > 0:
+            state_index = queue.popleft()
+            place_id, inventory_mask = self.states[state_index]
+
+            place = self.level.get_place_by_id(place_id)
+
+            # the game ends in ending places, the player can't go anywhere else
+            if place.end in ENDINGS:
+                continue
+
+            successors = self.successors[state_index]
+            probabilities = self.probabilities[state_index]
+
+            usable_paths = []
+
+            for path in self.level.get_paths_from_place(place_id):
+                required_mask, forbidden_mask = self.level.get_item_masks(path)
+
+                if required_mask & ~inventory_mask or forbidden_mask & inventory_mask:
+                    continue
+
+                usable_paths.append(path)
+                self.used_paths.add(id(path))
+
+            self.usable_path_counts[state_index] = len(usable_paths)
+
+            for path in usable_paths:
+                # the same as in Game.move_player, one occurrence of the current place is removed
+                destinations = list(path.places)
+                destinations.remove(place_id)
+
+                for destination_id in destinations:
+                    if destination_id not in self.place_item_masks:
+                        self.missing_place_ids.add(destination_id)
+                        continue
+
+                    new_mask = inventory_mask | self.place_item_masks[destination_id]
+                    successors.append(self.add_state(destination_id, new_mask, queue))
+                    probabilities.append(1 / (len(usable_paths) * len(destinations)))
+
+    def get_states_reaching(self, target_states: set[int]) -> set[int]:
+        """
+        Return all states from which at least one of the target states can be reached.
+
+        Args:
+            target_states (set[int]): Indexes of the target states.
+
+        Returns:
+            set[int]: Indexes of the states (including the targets).
+        """
+
+        predecessors = [[] for _ in self.states]
+
+        for state_index, successors in enumerate(self.successors):
+            for successor in successors:
+                predecessors[successor].append(state_index)
+
+        reaching = set(target_states)
+        queue = deque(target_states)
+
+        while len(queue) > 0:
+            for predecessor in predecessors[queue.popleft()]:
+                if predecessor not in reaching:
+                    reaching.add(predecessor)
+                    queue.append(predecessor)
+
+        return reaching
+
+
+class ReachabilityReport:
+    def __init__(self, level: Level):
+        """
+        Static analysis of a level: unreachable places, dead ends, unusable paths and reachable endings.
+
+        Args:
+            level (Level): Level to analyze.
+        """
+
+        graph = StateGraph(level)
+
+        self.state_count = len(graph.states)
+        self.missing_place_ids = sorted(graph.missing_place_ids)
+
+        reached_place_ids = {place_id for place_id, _ in graph.states}
+        self.unreachable_place_ids = [place.id for place in level.places if place.id not in reached_place_ids]
+
+        # states of ending places, by ending
+        ending_states = {ending: set() for ending in ENDINGS}
+
+        for state_index, (place_id, _) in enumerate(graph.states):
+            ending = level.get_place_by_id(place_id).end
+
+            if ending in ENDINGS:
+                ending_states[ending].add(state_index)
+
+        # states from which each ending can be reached
+        reaching_ending = {ending: graph.get_states_reaching(states) for ending, states in ending_states.items()}
+        reaching_any_ending = set().union(*reaching_ending.values())
+
+        # places where the player can end up without any usable path (only actions may help)
+        self.dead_end_place_ids = sorted({
+            place_id
+            for state_index, (place_id, _) in enumerate(graph.states)
+            if len(graph.successors[state_index]) == 0 and level.get_place_by_id(place_id).end not in ENDINGS
+        })
+
+        # places where the player can get into a state from which no ending is reachable
+        self.soft_lock_place_ids = sorted({
+            place_id
+            for state_index, (place_id, _) in enumerate(graph.states)
+            if state_index not in reaching_any_ending
+        })
+
+        self.unusable_paths = [path for path in level.paths if id(path) not in graph.used_paths]
+
+        # starting place ID -> endings reachable from it
+        self.reachable_endings = {
+            start_place_id: [ending for ending in ENDINGS if state_index in reaching_ending[ending]]
+            for start_place_id, state_index in graph.start_states.items()
+        }
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "states": self.state_count,
+            "unreachable_places": self.unreachable_place_ids,
+            "dead_end_places": self.dead_end_place_ids,
+            "soft_lock_places": self.soft_lock_place_ids,
+            "unusable_paths": [{"name": path.name, "places": list(path.places)} for path in self.unusable_paths],
+            "missing_places": self.missing_place_ids,
+            "reachable_endings": {str(place_id): endings for place_id, endings in self.reachable_endings.items()},
+        }
+
+    def to_text(self) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        def format_ids(ids: list[int]) -> str:
+            return ", ".join(str(i) for i in ids) if len(ids) > 0 else "none"
+
+        lines = [
+            f"Explored {self.state_count} (place, inventory) states. Level scripts aren't taken into account.",
+            "",
+            f"Unreachable places: {format_ids(self.unreachable_place_ids)}",
+            f"Dead-end places (no usable path, no ending): {format_ids(self.dead_end_place_ids)}",
+            f"Soft-lock places (no ending reachable from some state): {format_ids(self.soft_lock_place_ids)}",
+            f"Places referenced by paths but not defined: {format_ids(self.missing_place_ids)}",
+            "",
+            f"Paths that can never be used: {len(self.unusable_paths) if len(self.unusable_paths) > 0 else 'none'}",
+        ]
+
+        for path in self.unusable_paths:
+            lines.append(f"  {path.name} {list(path.places)}")
+
+        lines.append("")
+        lines.append("Reachable endings by starting place:")
+
+        for place_id, endings in self.reachable_endings.items():
+            lines.append(f"  {place_id}: {', '.join(endings) if len(endings) > 0 else 'none'}")
+
+        return "\n".join(lines)
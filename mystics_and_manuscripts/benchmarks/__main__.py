@@ -0,0 +1,97 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+from mystics_and_manuscripts.benchmarks.engine import BENCHMARK_NAMES, DEFAULT_BENCHMARK_LEVELS, EngineReport
+from mystics_and_manuscripts.benchmarks.memory import MemoryReport
+from mystics_and_manuscripts.benchmarks.startup import StartupReport
+from mystics_and_manuscripts.level.texts import TEXT_STORAGES
+
+parser = ArgumentParser(prog="python -m mystics_and_manuscripts.benchmarks", description="Measure the game's performance.")
+subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+startup_parser = subparsers.add_parser("startup", help="time from starting the game to the level menu")
+startup_parser.add_argument("-n", "--runs", type=int, default=10, help="number of measured starts (default: 10)")
+startup_parser.add_argument("--cold", action="store_true", help="delete the level caches before every start")
+startup_parser.add_argument("--max-ms", type=float, default=None,
+                            help="exit with 1 if the median time to the menu is higher, to catch regressions")
+startup_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+memory_parser = subparsers.add_parser("memory", help="memory held by a loaded synthetic level")
+memory_parser.add_argument("-p", "--places", type=int, default=100_000,
+                           help="number of places of the synthetic level (default: 100000)")
+memory_parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the synthetic level (default: 0)")
+memory_parser.add_argument("-t", "--text-storage", choices=TEXT_STORAGES, default="plain",
+                           help="text storage of the level (default: plain)")
+memory_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+engine_parser = subparsers.add_parser(
+    "engine", help="time per operation of the engine on the castle and on synthetic levels"
+)
+engine_parser.add_argument("-l", "--levels", nargs="+", default=list(DEFAULT_BENCHMARK_LEVELS),
+                           help="\"castle\" or numbers of places of synthetic levels (default: castle 1000 10000 100000)")
+engine_parser.add_argument("-b", "--benchmarks", nargs="+", choices=BENCHMARK_NAMES, default=list(BENCHMARK_NAMES),
+                           help="benchmarks to run (default: all)")
+engine_parser.add_argument("-r", "--repeats", type=int, default=5,
+                           help="number of measurements of every benchmark (default: 5)")
+engine_parser.add_argument("--min-time", type=float, default=0.1,
+                           help="minimal seconds of a measurement, more operations are run otherwise (default: 0.1)")
+engine_parser.add_argument("-s", "--seed", type=int, default=0,
+                           help="seed of the synthetic levels, places and options (default: 0)")
+engine_parser.add_argument("--save", metavar="BASELINE", help="save the report as JSON to compare later runs with")
+engine_parser.add_argument("--compare", metavar="BASELINE", help="compare the median times with a saved report")
+engine_parser.add_argument("--max-slowdown", type=float, default=None,
+                           help="exit with 1 if a median time is more times slower than the baseline, e.g. 1.2")
+engine_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+args = parser.parse_args()
+baseline = None
+
+if args.benchmark == "startup":
+    report = StartupReport(args.runs, args.cold)
+elif args.benchmark == "memory":
+    report = MemoryReport(args.places, args.seed, args.text_storage)
+else:
+    if args.max_slowdown is not None and args.compare is None:
+        parser.error("--max-slowdown needs --compare")
+
+    # the baseline is read first, a missing file shouldn't waste a whole run
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    report = EngineReport(
+        args.levels, args.benchmarks, args.repeats, args.min_time, args.seed,
+        on_progress=lambda level, benchmark_name: print(f"{level}: {benchmark_name}", file=sys.stderr)
+    )
+
+    if args.save is not None:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report.to_dict(), file, indent=2)
+
+if args.json:
+    report_dict = report.to_dict()
+
+    if baseline is not None:
+        report_dict["baseline_ratios"] = report.compare(baseline)
+
+    print(json.dumps(report_dict, indent=2))
+elif baseline is not None:
+    print(report.to_text(baseline))
+else:
+    print(report.to_text())
+
+if args.benchmark == "startup" and args.max_ms is not None and report.median_first_menu_time * 1000 > args.max_ms:
+    print(f"The median time to the first menu is over the limit of {args.max_ms} ms", file=sys.stderr)
+    sys.exit(1)
+
+if args.benchmark == "engine" and args.max_slowdown is not None:
+    slowdowns = [
+        f"{level} {benchmark_name} ({ratio:.2f}x)"
+        for level, ratios in report.compare(baseline).items() for benchmark_name, ratio in ratios.items()
+        if ratio > args.max_slowdown
+    ]
+
+    if len(slowdowns) > 0:
+        print(f"Slower than {args.max_slowdown}x the baseline: {', '.join(slowdowns)}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,373 @@
+import platform
+import tempfile
+from pathlib import Path as FilePath
+from random import Random
+from statistics import median
+from time import perf_counter
+
+from mystics_and_manuscripts.benchmarks.synthetic import write_synthetic_level
+from mystics_and_manuscripts.level import Level, LevelLibrary, load_levels
+from mystics_and_manuscripts.level.bundle import LevelBundle, compile_level_file
+from mystics_and_manuscripts.simulation import create_headless_game, play_through
+from mystics_and_manuscripts.simulation.policies import create_policy
+
+# bump this number whenever the benchmarks change what they measure, reports of other versions can't be compared
+ENGINE_REPORT_VERSION = 1
+
+CASTLE_LEVEL_PATH = "levels/castle/level.yaml"
+
+# levels measured by default, "castle" or a number of places of a synthetic level
+DEFAULT_BENCHMARK_LEVELS = ("castle", "1000", "10000", "100000")
+
+# synthetic levels and compiled bundles are kept here between runs, creating the big ones takes minutes
+BENCHMARK_FOLDER_PATH = FilePath(tempfile.gettempdir()) / "mystics-and-manuscripts-benchmarks"
+
+# numbers of random places the lookups and the options are measured at, and of rendered scenes
+PLACE_SAMPLE_SIZE = 1000
+SCENE_SAMPLE_SIZE = 100
+
+# step limit of the measured play-throughs
+MAX_PLAY_THROUGH_STEPS = 1000
+
+
+class LevelBenchmarks:
+    def __init__(self, level_path: str, bundle_file_path: str, seed: int = 0):
+        """
+        Benchmarks of the engine on one level. Every benchmark is a method taking a number of operations, running them
+        and returning the seconds they took, so that preparations aren't measured.
+
+        Args:
+            level_path (str): Path to the level file.
+            bundle_file_path (str): Path to the compiled level.
+            seed (int, optional): Seed choosing the places and the options. Default: 0
+        """
+
+        self.level_path = level_path
+        self.bundle_file_path = bundle_file_path
+        self.seed = seed
+
+        self.level = load_levels([level_path])[0]
+
+        rng = Random(seed)
+        self.places = rng.sample(list(self.level.places), min(PLACE_SAMPLE_SIZE, len(self.level.places)))
+
+    def load_level(self, operations: int) -> float:
+        """Load the level in a new library, through the binary cache of the parsed level file."""
+
+        duration = 0.0
+
+        for _ in range(operations):
+            start_time = perf_counter()
+            LevelLibrary().get_level(self.level_path)
+            duration += perf_counter() - start_time
+
+        return duration
+
+    def load_levels(self, operations: int) -> float:
+        """Load the level with "load_levels", which creates a new level through the binary cache every time."""
+
+        start_time = perf_counter()
+
+        for _ in range(operations):
+            load_levels([self.level_path])
+
+        return perf_counter() - start_time
+
+    def open_bundle(self, operations: int) -> float:
+        """Create the level from its bundle."""
+
+        duration = 0.0
+
+        for _ in range(operations):
+            start_time = perf_counter()
+            Level(LevelBundle(self.bundle_file_path), self.level_path)
+            duration += perf_counter() - start_time
+
+        return duration
+
+    def get_place_by_id(self, operations: int) -> float:
+        """Look up a place by its ID."""
+
+        level = self.level
+        place_ids = [self.places[index % len(self.places)].id for index in range(operations)]
+
+        start_time = perf_counter()
+
+        for place_id in place_ids:
+            level.get_place_by_id(place_id)
+
+        return perf_counter() - start_time
+
+    def get_available_paths(self, operations: int) -> float:
+        """List the paths from a place and separate the ones the player's items don't allow."""
+
+        game = create_headless_game(self.level)
+        places = [self.places[index % len(self.places)] for index in range(operations)]
+
+        start_time = perf_counter()
+
+        for place in places:
+            game.current_place = place
+            game.separate_unusable_item_paths(game.get_available_paths())
+
+        return perf_counter() - start_time
+
+    def scene_to_text(self, operations: int) -> float:
+        """Turn the scene of a place into text."""
+
+        game = create_headless_game(self.level)
+        scenes = []
+
+        for place in self.places[:SCENE_SAMPLE_SIZE]:
+            game.current_place = place
+            scenes.append(game.observe(render=True).scene)
+
+        scenes = [scenes[index % len(scenes)] for index in range(operations)]
+
+        start_time = perf_counter()
+
+        for scene in scenes:
+            scene.to_text()
+
+        return perf_counter() - start_time
+
+    def step(self, operations: int) -> float:
+        """Observe the current place and apply a random option, as a headless game does on every step."""
+
+        policy = create_policy("random")
+        policy.reset(self.seed)
+
+        game = None
+        duration = 0.0
+        steps = 0
+
+        while steps < operations:
+            if game is None:
+                game = create_headless_game(self.level)
+                game.begin()
+
+            start_time = perf_counter()
+
+            observation = game.observe()
+            option_index = policy.choose(observation) if observation.ending is None else None
+
+            if option_index is not None:
+                game.apply(*observation.get_option(option_index))
+
+            duration += perf_counter() - start_time
+            steps += 1
+
+            # a new play-through starts after an ending (or with no options left), that isn't a step
+            if option_index is None:
+                game = None
+
+        return duration
+
+    def play_through(self, operations: int) -> float:
+        """Play the level from the start to an ending (or the step limit), choosing random options."""
+
+        policy = create_policy("random")
+        duration = 0.0
+
+        for seed in range(self.seed, self.seed + operations):
+            policy.reset(seed)
+
+            start_time = perf_counter()
+            play_through(create_headless_game(self.level), policy, MAX_PLAY_THROUGH_STEPS)
+            duration += perf_counter() - start_time
+
+        return duration
+
+
+# names of the LevelBenchmarks methods, in the order they're run
+BENCHMARK_NAMES = (
+    "load_level", "load_levels", "open_bundle", "get_place_by_id", "get_available_paths", "scene_to_text", "step",
+    "play_through",
+)
+
+
+def measure(benchmark, repeats: int = 5, min_time: float = 0.1) -> dict:
+    """
+    Measure a benchmark. The number of operations is doubled until they take at least "min_time" (the calibration
+    warms the benchmark up as well), then they're run "repeats" times.
+
+    Args:
+        benchmark: Method of LevelBenchmarks.
+        repeats (int, optional): Number of measurements. Default: 5
+        min_time (float, optional): Minimal seconds of a measurement. Default: 0.1
+
+    Returns:
+        dict: Median, minimal and all seconds per operation, and the number of operations per measurement.
+    """
+
+    operations = 1
+
+    while benchmark(operations) < min_time:
+        operations *= 2
+
+    times = [benchmark(operations) / operations for _ in range(repeats)]
+
+    return {"median": median(times), "min": min(times), "operations": operations, "times": times}
+
+
+def prepare_level(level: str, seed: int = 0) -> tuple[str, str]:
+    """
+    Return the level file of a benchmark level (writing a synthetic one if needed) and compile it into a bundle kept
+    apart from it, so that the level file itself is still loaded from the yaml.
+
+    Args:
+        level (str): "castle" or a number of places of a synthetic level.
+        seed (int, optional): Seed of the synthetic level. Default: 0
+
+    Returns:
+        tuple[str, str]: Path to the level file at index 0 and to the bundle at index 1.
+
+    Raises:
+        ValueError: The level is neither "castle" nor a number.
+    """
+
+    if level == "castle":
+        level_path = CASTLE_LEVEL_PATH
+    elif level.isdigit():
+        level_path = str(write_synthetic_level(BENCHMARK_FOLDER_PATH / f"synthetic-{level}-{seed}", int(level), seed))
+    else:
+        raise ValueError(f"Unknown benchmark level {level!r}, use \"castle\" or a number of places")
+
+    bundle_file_path = BENCHMARK_FOLDER_PATH / "bundles" / f"{level}-{seed}.mmbundle"
+    bundle_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # note: recompiled on every run, the bundle has to match the current level file and bundle format
+    compile_level_file(level_path, bundle_file_path)
+
+    return level_path, str(bundle_file_path)
+
+
+class EngineReport:
+    def __init__(self, levels=DEFAULT_BENCHMARK_LEVELS, benchmark_names=BENCHMARK_NAMES, repeats: int = 5,
+                 min_time: float = 0.1, seed: int = 0, on_progress=None):
+        """
+        Engine benchmark: time per operation of loading a level, looking up places, listing options, rendering scenes,
+        headless steps and whole play-throughs, on the castle and on synthetic levels.
+
+        Args:
+            levels (optional): Levels to measure, "castle" or numbers of places of synthetic levels (as strings).
+                Default: DEFAULT_BENCHMARK_LEVELS
+            benchmark_names (optional): Benchmarks to run. Default: BENCHMARK_NAMES
+            repeats (int, optional): Number of measurements of every benchmark. Default: 5
+            min_time (float, optional): Minimal seconds of a measurement. Default: 0.1
+            seed (int, optional): Seed of the synthetic levels, the places and the options. Default: 0
+            on_progress (optional): Function called with the level and the benchmark name before every benchmark.
+                Default: None
+        """
+
+        self.repeats = repeats
+        self.min_time = min_time
+        self.seed = seed
+
+        self.results = {}  # level -> {"places": number of places, "benchmarks": benchmark name -> measurement}
+
+        for level in levels:
+            level_benchmarks = LevelBenchmarks(*prepare_level(level, seed), seed)
+            measurements = {}
+
+            for benchmark_name in benchmark_names:
+                if on_progress is not None:
+                    on_progress(level, benchmark_name)
+
+                measurements[benchmark_name] = measure(getattr(level_benchmarks, benchmark_name), repeats, min_time)
+
+            self.results[level] = {"places": len(level_benchmarks.level.places), "benchmarks": measurements}
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary, which can be saved as a baseline.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "version": ENGINE_REPORT_VERSION,
+            "python": platform.python_version(),
+            "repeats": self.repeats,
+            "min_time": self.min_time,
+            "seed": self.seed,
+            "levels": self.results,
+        }
+
+    def compare(self, baseline: dict) -> dict[str, dict[str, float]]:
+        """
+        Compare the median times with a baseline report.
+
+        Args:
+            baseline (dict): Report data (see "to_dict").
+
+        Returns:
+            dict[str, dict[str, float]]: Level -> benchmark name -> current median divided by the baseline one (over 1
+                for a slowdown). Only benchmarks in both reports are compared.
+
+        Raises:
+            ValueError: The baseline was measured by another version of the benchmarks.
+        """
+
+        if baseline.get("version") != ENGINE_REPORT_VERSION:
+            raise ValueError(f"The baseline was created by version {baseline.get('version')} of the benchmarks, "
+                             f"not {ENGINE_REPORT_VERSION}")
+
+        ratios = {}
+
+        for level, result in self.results.items():
+            baseline_measurements = baseline["levels"].get(level, {}).get("benchmarks", {})
+
+            ratios[level] = {
+                benchmark_name: measurement["median"] / baseline_measurements[benchmark_name]["median"]
+                for benchmark_name, measurement in result["benchmarks"].items()
+                if benchmark_name in baseline_measurements
+            }
+
+        return ratios
+
+    def to_text(self, baseline: dict | None = None) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Args:
+            baseline (dict | None, optional): Report data to compare with (see "compare"). Default: None
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        ratios = self.compare(baseline) if baseline is not None else {}
+        lines = []
+
+        for level, result in self.results.items():
+            lines.append(f"{level} ({result['places']} places):")
+
+            for benchmark_name, measurement in result["benchmarks"].items():
+                line = f"  {benchmark_name}: {format_duration(measurement['median'])}"
+
+                if benchmark_name in ratios.get(level, {}):
+                    line += f" ({ratios[level][benchmark_name]:.2f}x the baseline)"
+
+                lines.append(line)
+
+        return "\n".join(lines)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration with a unit fitting its size.
+
+    Args:
+        seconds (float): Duration in seconds.
+
+    Returns:
+        str: The formatted duration, e.g. "12.3 µs".
+    """
+
+    for unit, size in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= size:
+            return f"{seconds / size:.1f} {unit}"
+
+    return f"{seconds / 1e-9:.0f} ns"
@@ -0,0 +1,84 @@
+import gc
+import tracemalloc
+from time import perf_counter
+
+from mystics_and_manuscripts.benchmarks.synthetic import create_synthetic_level_dict
+from mystics_and_manuscripts.level import Level
+
+
+class MemoryReport:
+    def __init__(self, place_count: int = 100_000, seed: int = 0, text_storage: str = "plain"):
+        """
+        Memory benchmark: memory held by a loaded synthetic level, measured with tracemalloc. The level dictionary is
+        created while tracing and dropped afterwards, so strings the level keeps from it are counted, as they would be
+        for a parsed level file.
+
+        Args:
+            place_count (int, optional): Number of places of the synthetic level. Default: 100000
+            seed (int, optional): Seed of the synthetic level. Default: 0
+            text_storage (str, optional): Text storage of the level (see Level). Default: "plain"
+        """
+
+        self.place_count = place_count
+        self.seed = seed
+        self.text_storage = text_storage
+
+        gc.collect()
+        tracemalloc.start()
+
+        try:
+            level_dict = create_synthetic_level_dict(place_count, seed)
+            self.path_count = len(level_dict["paths"])
+
+            start_time = perf_counter()
+            level = Level(level_dict, "levels/synthetic/level.yaml", text_storage)
+            self.load_time = perf_counter() - start_time  # slowed down by the tracing
+
+            del level_dict
+            gc.collect()
+
+            self.level_bytes, self.peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        del level
+
+    @property
+    def bytes_per_place(self) -> float:
+        """float: Memory held by the level divided by its number of places."""
+
+        return self.level_bytes / self.place_count
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "places": self.place_count,
+            "paths": self.path_count,
+            "seed": self.seed,
+            "text_storage": self.text_storage,
+            "level_bytes": self.level_bytes,
+            "peak_bytes": self.peak_bytes,
+            "bytes_per_place": self.bytes_per_place,
+            "load_time": self.load_time,
+        }
+
+    def to_text(self) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        return "\n".join([
+            f"Synthetic level with {self.place_count} places and {self.path_count} paths (seed {self.seed}), "
+            f"{self.text_storage} text storage",
+            f"Held by the level: {self.level_bytes / 2 ** 20:.1f} MiB, {self.bytes_per_place:.0f} bytes per place",
+            f"Peak while loading (including the level dictionary): {self.peak_bytes / 2 ** 20:.1f} MiB",
+        ])
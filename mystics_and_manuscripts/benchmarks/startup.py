@@ -0,0 +1,189 @@
+import os
+import shutil
+import subprocess
+import sys
+from glob import glob
+from statistics import median
+from time import perf_counter
+
+from mystics_and_manuscripts.level.cache import CACHE_FOLDER_NAME
+
+# the game asks for the level after the first menu is shown
+FIRST_MENU_PROMPT = b"I choose "
+
+GAME_COMMAND = [sys.executable, "-m", "mystics_and_manuscripts.main"]
+
+
+def clear_level_caches() -> None:
+    """
+    Delete the binary level caches, so that the next start has to parse the levels again.
+    """
+
+    for cache_folder_path in glob(f"levels/*/{CACHE_FOLDER_NAME}"):
+        shutil.rmtree(cache_folder_path, ignore_errors=True)
+
+
+def create_game_environment() -> dict:
+    """
+    Return the environment of a measured game process.
+
+    Returns:
+        dict: Environment variables.
+    """
+
+    environment = dict(os.environ)
+
+    # the output must not wait in a buffer, the prompt marks the end of the measurement
+    environment["PYTHONUNBUFFERED"] = "1"
+    environment["MM_RENDERER"] = "ansi"
+
+    return environment
+
+
+def measure_first_menu_time(cold: bool = False) -> float:
+    """
+    Start the game and measure the time until the level menu is shown, then exit it.
+
+    Args:
+        cold (bool, optional): True to delete the level caches first. Default: False
+
+    Returns:
+        float: Seconds from starting the process to the first menu.
+
+    Raises:
+        RuntimeError: The game exited without showing the menu.
+    """
+
+    if cold:
+        clear_level_caches()
+
+    start_time = perf_counter()
+
+    process = subprocess.Popen(
+        GAME_COMMAND, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        env=create_game_environment()
+    )
+
+    output = b""
+
+    while FIRST_MENU_PROMPT not in output:
+        chunk = process.stdout.read1(4096)
+
+        if chunk == b"":
+            process.wait()
+            raise RuntimeError(f"The game exited with code {process.returncode} before showing the level menu")
+
+        output += chunk
+
+    first_menu_time = perf_counter() - start_time
+
+    # choose "Exit game"
+    process.communicate(b"e\n")
+
+    return first_menu_time
+
+
+def measure_import_times() -> dict[str, tuple[float, float]]:
+    """
+    Measure the import time of every module imported before the first menu (with "python -X importtime").
+
+    Returns:
+        dict[str, tuple[float, float]]: Module name -> seconds spent importing only the module at index 0 and including
+            the modules it imported at index 1.
+    """
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *GAME_COMMAND[1:]], input=b"e\n", stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE, env=create_game_environment()
+    )
+
+    import_times = {}
+
+    # lines look like "import time:       497 |       1023 |     module.name", times in microseconds
+    for line in process.stderr.decode(errors="replace").splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_time, cumulative_time, module_name = line[len("import time:"):].split("|")
+
+        if not self_time.strip().isdigit():
+            # the header line
+            continue
+
+        import_times[module_name.strip()] = (int(self_time) / 1e6, int(cumulative_time) / 1e6)
+
+    return import_times
+
+
+class StartupReport:
+    def __init__(self, runs: int = 10, cold: bool = False):
+        """
+        Startup benchmark: time to the first menu over several runs and import times of the modules.
+
+        Args:
+            runs (int, optional): Number of measured starts. Default: 10
+            cold (bool, optional): True to delete the level caches before every start. Default: False
+        """
+
+        self.cold = cold
+
+        # the first start may rebuild the caches and warm up the OS file cache, it isn't counted in warm runs
+        if not cold:
+            measure_first_menu_time()
+
+        self.first_menu_times = [measure_first_menu_time(cold) for _ in range(runs)]
+        self.import_times = measure_import_times()
+
+    @property
+    def median_first_menu_time(self) -> float:
+        """float: Median seconds to the first menu."""
+
+        return median(self.first_menu_times)
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "cold": self.cold,
+            "first_menu": {
+                "median": self.median_first_menu_time,
+                "min": min(self.first_menu_times),
+                "max": max(self.first_menu_times),
+                "runs": self.first_menu_times,
+            },
+            "imports": {
+                module_name: {"self": self_time, "cumulative": cumulative_time}
+                for module_name, (self_time, cumulative_time) in self.import_times.items()
+            },
+        }
+
+    def to_text(self, top_modules: int = 15) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Args:
+            top_modules (int, optional): Number of slowest imports to list. Default: 15
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        lines = [
+            f"Time to the first menu ({'cold' if self.cold else 'warm'} level caches, {len(self.first_menu_times)} runs): "
+            f"median {self.median_first_menu_time * 1000:.1f} ms, min {min(self.first_menu_times) * 1000:.1f} ms, "
+            f"max {max(self.first_menu_times) * 1000:.1f} ms",
+            "",
+            f"{len(self.import_times)} modules imported before the first menu, slowest (cumulative / self):",
+        ]
+
+        slowest = sorted(self.import_times.items(), key=lambda item: -item[1][1])[:top_modules]
+
+        for module_name, (self_time, cumulative_time) in slowest:
+            lines.append(f"  {module_name}: {cumulative_time * 1000:.1f} ms / {self_time * 1000:.1f} ms")
+
+        return "\n".join(lines)
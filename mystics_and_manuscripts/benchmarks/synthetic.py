@@ -0,0 +1,130 @@
+from pathlib import Path as FilePath
+from random import Random
+
+from mystics_and_manuscripts.level.generator import create_sentence
+
+# script of the synthetic levels, defining the function of their action
+SYNTHETIC_LEVEL_SCRIPT = '''def look(game):
+    return "You look around, but there's nothing more to see."
+'''
+
+
+def create_synthetic_level_dict(place_count: int, seed: int = 0) -> dict:
+    """
+    Create a level dictionary of any size, shaped like a hand-written level: a corridor through all places with extra
+    random paths, item locks, a few endings, actions and achievements. Strings are created one by one, as if they were
+    parsed from a level file.
+
+    Args:
+        place_count (int): Number of places.
+        seed (int, optional): Seed of the random number generator. Default: 0
+
+    Returns:
+        dict: Level data.
+    """
+
+    rng = Random(seed)
+    item_count = max(1, min(50, place_count // 20))
+
+    places = []
+
+    for place_id in range(place_count):
+        place = {
+            "id": place_id,
+            "name": f"Room {place_id}",
+            "description": " ".join(create_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(2, 4))),
+        }
+
+        if place_id == 0:
+            place["start"] = True
+        elif rng.random() < 0.01:
+            place["end"] = rng.choice(["win", "loss", "draw"])
+
+        if rng.random() < 0.2:
+            place["first-time-description"] = create_sentence(rng, 10)
+
+        if rng.random() < 0.1:
+            place["items"] = [f"item {rng.randrange(item_count)}"]
+
+        places.append(place)
+
+    paths = []
+
+    for place_id in range(place_count - 1):
+        paths.append({
+            "places": [place_id, place_id + 1],
+            "name": f"Go to room {place_id + 1}",
+            "description": " ".join(create_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(1, 3))),
+        })
+
+    for _ in range(place_count):
+        place_ids = [rng.randrange(place_count), rng.randrange(place_count)]
+        path = {"places": place_ids, "name": f"Take the stairs to room {place_ids[1]}"}
+
+        if rng.random() < 0.3:
+            path["description"] = [create_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(2, 3))]
+        else:
+            path["description"] = create_sentence(rng, rng.randint(8, 16))
+
+        if rng.random() < 0.1:
+            path["required-items"] = [f"item {rng.randrange(item_count)}"]
+            path["items-hint"] = True
+
+        if rng.random() < 0.05:
+            path["one-way"] = True
+            path["one-way-start"] = [place_ids[0]]
+
+        paths.append(path)
+
+    actions = [
+        {"name": "Look around", "places": rng.sample(range(place_count), min(place_count, 10)), "function": "look"}
+    ]
+
+    achievements = [
+        {"id": achievement_id, "name": f"Achievement {achievement_id}", "description": create_sentence(rng, 6)}
+        for achievement_id in range(5)
+    ]
+
+    return {
+        "name": f"Synthetic level ({place_count} places)",
+        "introduction": create_sentence(rng, 20),
+        "places": places,
+        "paths": paths,
+        "actions": actions,
+        "achievements": achievements,
+    }
+
+
+def write_synthetic_level(folder_path: str | FilePath, place_count: int, seed: int = 0) -> FilePath:
+    """
+    Write a synthetic level (see "create_synthetic_level_dict") and its script into a folder, unless the folder already
+    holds it. Dumping and parsing huge levels takes a while, so the files are reused.
+
+    Args:
+        folder_path (str | FilePath): Folder of the level, created if it doesn't exist.
+        place_count (int): Number of places.
+        seed (int, optional): Seed of the random number generator. Default: 0
+
+    Returns:
+        FilePath: Path to the level file.
+    """
+
+    folder_path = FilePath(folder_path)
+    level_file_path = folder_path / "level.yaml"
+
+    if not level_file_path.is_file():
+        # PyYAML is only needed to create the level, see "level.cache.parse_yaml"
+        import yaml
+
+        folder_path.mkdir(parents=True, exist_ok=True)
+        (folder_path / "level.py").write_text(SYNTHETIC_LEVEL_SCRIPT)
+
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        content = yaml.dump(create_synthetic_level_dict(place_count, seed), Dumper=dumper, sort_keys=False)
+
+        # the level file is written last and atomically, an interrupted run leaves no half-written level behind
+        temporary_file_path = level_file_path.with_suffix(".tmp")
+        temporary_file_path.write_text(content)
+        temporary_file_path.replace(level_file_path)
+
+    return level_file_path
@@ -1,48 +1,195 @@
-import json
-from importlib import import_module
+import copy
+import warnings
 from random import choice
 from string import ascii_lowercase
 
 from colorama import Back, Style
 
-from mystics_and_manuscripts.level import Level, Place, Path, Achievement
+from mystics_and_manuscripts.level import Level, Place, Path, Achievement, Inventory
 from mystics_and_manuscripts.level.action import Action
-from mystics_and_manuscripts.ui.output.display_manager import DisplayManager
+from mystics_and_manuscripts.level.hooks import ON_START_HOOK, HookTable
+from mystics_and_manuscripts.level.journal import ChangeSet
+from mystics_and_manuscripts.level.scripts import copy_script_module, create_script_module
+from mystics_and_manuscripts.observation import Observation
+from mystics_and_manuscripts.progress import AchievementsStore, MemoryAchievementsStore, get_achievements_store
+from mystics_and_manuscripts.recording import Recorder
+from mystics_and_manuscripts.tracing import HOOK_CATEGORY, trace
+from mystics_and_manuscripts.ui.output.display_manager import PRESS_ENTER_PROMPT, DisplayManager
 from mystics_and_manuscripts.ui.output.scene import Scene
 from mystics_and_manuscripts.ui.output.sections import Section
 from mystics_and_manuscripts.ui.output.sections.hints_section import HintsSection
 from mystics_and_manuscripts.ui.output.sections.options_menu import OptionsMenu
-from mystics_and_manuscripts.ui.output.sections.title_section import TitleSection
+from mystics_and_manuscripts.ui.output.sections.title_section import get_title_section
+
+# name of the level script variable listing the module globals that belong to a play-through (saved and forked with it)
+SAVED_GLOBALS_NAME = "saved_globals"
+
+# prompt asking the player to choose an option
+CHOOSE_PROMPT = "I choose "
 
 
 class Game:
-    def __init__(self, level: Level) -> None:
+    def __init__(self, level: Level, achievements_store: AchievementsStore | None = None,
+                 recorder: Recorder | None = None, display_manager: DisplayManager | None = None) -> None:
         """
         Object containing play-through information and necessary functions.
 
         Args:
             level (Level): Level being played.
+            achievements_store (AchievementsStore | None, optional): Store for unlocked achievements. None for the
+                level's shared store. Default: None
+            recorder (Recorder | None, optional): Recorder of the play-through for a later replay. Default: None
+            display_manager (DisplayManager | None, optional): Display manager of the player's terminal or session.
+                None for a new one with the backend set by the MM_RENDERER environment variable. Default: None
         """
 
         self.level = level
+        self.recorder = recorder
 
-        self.inventory = []  # list of items that the player holds
+        self.inventory = []  # items that the player holds (turned into an Inventory by the setter)
         self.last_path = None  # last path used
         self.current_place = None  # data of the current place where the player resides
 
-        self.display_manager = DisplayManager()
+        # unlocked achievements are kept in memory and written in batches
+        self.achievements_store = achievements_store if achievements_store is not None else get_achievements_store(level)
+
+        self.display_manager = display_manager if display_manager is not None else DisplayManager()
 
         # only load the level script if it exists
-        if (level.folder_path / "level.py").is_file():
-            self.level_script = import_module(f"levels.{level.folder_path.name}.level")
+        # note: every game runs the (compiled) script in its own module, so the script's globals belong to one game
+        script_path = level.folder_path / "level.py"
+
+        if script_path.is_file():
+            self.level_script = create_script_module(script_path, f"levels.{level.folder_path.name}.level")
+
+        # hook and action functions are resolved once, instead of looking them up in the script on every step
+        self.hooks = HookTable(getattr(self, "level_script", None))
+        missing_hooks = self.hooks.find_missing(level)
+
+        if len(missing_hooks) > 0:
+            warnings.warn(f"The level {level.name!r} refers to functions its script doesn't define: "
+                          f"{', '.join(missing_hooks)}", stacklevel=2)
+
+        # changes of the level made by this play-through, kept while another game uses the level
+        self.__change_set = None
+
+        # the new play-through continues from the current state of the level
+        self.check_out()
+
+    def get_saved_globals(self) -> dict:
+        """
+        Return the module globals the level script registered in its "saved_globals" variable.
+
+        Returns:
+            dict: Name -> value.
+        """
+
+        level_script = getattr(self, "level_script", None)
+        names = getattr(level_script, SAVED_GLOBALS_NAME, ())
+
+        return {name: getattr(level_script, name) for name in names}
+
+    def set_saved_globals(self, saved_globals: dict) -> None:
+        """
+        Set module globals of the level script.
+
+        Args:
+            saved_globals (dict): Name -> value.
+        """
+
+        level_script = getattr(self, "level_script", None)
+
+        for name, value in saved_globals.items():
+            setattr(level_script, name, value)
+
+    def check_out(self) -> None:
+        """
+        Make the level hold the state of this play-through. Games forked from each other share one level, the game that
+        used it last keeps its changes in a change set. Switching costs time proportional to the changes the two games
+        made since the fork they have in common (see "Level.switch_to").
+        """
+
+        owner = self.level.owner
+
+        if owner is self:
+            return
+
+        # note: script globals don't have to be swapped, every game has its own script module
+        if owner is not None:
+            owner.__change_set = self.level.take_change_set()
+
+        if self.__change_set is not None:
+            self.level.switch_to(self.__change_set)
+            self.__change_set = None
+
+        self.level.set_owner(self)
+
+    def check_in(self) -> None:
+        """
+        Keep the changes of this play-through in its change set and restore the level to its loaded state, so that a
+        new play-through can start on it while this one goes on later (see "check_out").
+        """
+
+        if self.level.owner is not self:
+            return
+
+        self.__change_set = self.level.take_change_set()
+
+        # the reset level isn't held by any game
+        self.level.reset()
+
+    def fork(self) -> "Game":
+        """
+        Create an independent copy of the play-through, e.g. to find out what happens after choosing an option. The
+        level isn't copied, the forks share it and only keep the changes they made since the fork (see "check_out").
+        The fork gets a copy of the script module, so its globals start with the values they have in this game.
+        Achievements unlocked by the fork aren't saved and it isn't recorded.
+
+        Returns:
+            Game: The fork, in the same state as this game.
+        """
+
+        self.check_out()
+
+        # the level's state becomes the change set both games are based on, the fork takes the level over right away
+        fork_change_set = self.level.take_change_set()
+        self.__change_set = ChangeSet([], fork_change_set)
+
+        # note: the fork isn't created by "__init__", the script and its hooks are already loaded and checked
+        game = copy.copy(self)
+        game.__change_set = None
+        game.recorder = None
+        game.inventory = list(self.inventory)
+
+        game.achievements_store = MemoryAchievementsStore()
+        game.achievements_store.unlocked = dict.fromkeys(self.achievements_store.get_unlocked())
+
+        if hasattr(self, "level_script"):
+            game.level_script = copy_script_module(self.level_script)
+            game.hooks = HookTable(game.level_script)
+
+        self.level.set_owner(game)
+
+        return game
+
+    @property
+    def inventory(self) -> Inventory:
+        """Inventory: Items that the player holds, stored as a bit mask but usable like a list."""
+
+        return self.__inventory
+
+    @inventory.setter
+    def inventory(self, items):
+        self.__inventory = Inventory(self.level.item_registry, items)
 
     @staticmethod
-    def create_place_scene(place: Place) -> Scene:
+    def create_place_scene(place: Place, description: str | None = None) -> Scene:
         """
         Create a place scene.
 
         Args:
             place (Place): Place to display.
+            description (str | None, optional): Description to show. None to get it from the place. Default: None
 
         Returns:
             Scene: Scene with info about a place.
@@ -50,27 +197,35 @@ class Game:
 
         scene = Scene()
 
+        # note: descriptions are picked at random, so they are only retrieved once
+        if description is None:
+            description = place.description
+
         entry_section = Section(f"You've entered {place.name}", padding_bottom=1)
-        title = TitleSection(place.name)
-        description = Section(place.description, padding_bottom=1)
+        title = get_title_section(place.name)
+        description = Section(description, padding_bottom=1)
 
         scene.add_sections(entry_section, title, description)
         return scene
 
     @staticmethod
-    def create_path_scene(path: Path) -> Scene:
+    def create_path_scene(path: Path, description: str | None = None) -> Scene:
         """
         Create a scene about a path.
 
         Args:
             path (Path): Path to extract the information from.
+            description (str | None, optional): Description to show. None to get it from the path. Default: None
 
         Returns:
             Scene: Scene with path information.
         """
 
+        if description is None:
+            description = path.description
+
         scene = Scene()
-        scene.add_sections(Section(path.description, padding_bottom=1))
+        scene.add_sections(Section(description, padding_bottom=1))
         return scene
 
     @staticmethod
@@ -90,39 +245,74 @@ class Game:
         return scene
 
     @staticmethod
-    def select_path_or_action(
-            available_paths: list[Path], available_actions: list[Action]) -> tuple[Path | None, Action | None]:
+    def select_path_or_action(available_paths: list[Path], available_actions: list[Action],
+                              display_manager: DisplayManager | None = None) -> tuple[Path | None, Action | None]:
+        """
+        Make the user choose a path to go through or an action to take, reading the answers with
+        "DisplayManager.read_line".
+
+        Deprecated: play-throughs ask with the "choose_path_or_action" generator, so a server can answer for the player
+        (see "run").
+
+        Args:
+            available_paths (list[Path]): List of available paths from the current location.
+            available_actions (list[Action]): List of available actions in the current location.
+            display_manager (DisplayManager | None, optional): Display manager reading the answers and showing the
+                errors. None for a new one. Default: None
+
+        Returns:
+            tuple: A chosen path at index 0 and a chosen action at index 1. One of them will always be None.
+        """
+
+        warnings.warn("Game.select_path_or_action is deprecated, use the Game.choose_path_or_action generator",
+                      DeprecationWarning, stacklevel=2)
+
+        display_manager = display_manager if display_manager is not None else DisplayManager()
+        chooser = Game.choose_path_or_action(available_paths, available_actions, display_manager)
+        prompt = next(chooser)
+
+        while True:
+            try:
+                prompt = chooser.send(display_manager.read_line(prompt))
+            except StopIteration as stop:
+                return stop.value
+
+    @staticmethod
+    def choose_path_or_action(available_paths: list[Path], available_actions: list[Action],
+                              display_manager: DisplayManager):
         """
-        Make the user choose a path to go through or an action to take.
+        Make the user choose a path to go through or an action to take. This is a generator, it yields the prompt and
+        is sent the player's answer until a valid one is given (see "run").
 
         Args:
             available_paths (list[Path]): List of available paths from the current location.
             available_actions (list[Action]): List of available actions in the current location.
+            display_manager (DisplayManager): Display manager showing the errors.
 
         Returns:
             tuple: A chosen path at index 0 and a chosen action at index 1. One of them will always be None.
         """
 
         error_message = f"You must enter a number between 0 and {len(available_paths) + len(available_actions) - 1}"
-        
+
         option_index = None
 
         # ask user until a correct answer is given
         while True:
-            user_input = input("I choose ")
+            user_input = yield CHOOSE_PROMPT
 
             # check the option is a number
             try:
                 option_index = int(user_input)
             except ValueError:
-                print(error_message)
+                display_manager.write_line(error_message)
                 continue
 
             # check the option is within range
-            if option_index < len(available_paths) + len(available_actions):
+            if 0 <= option_index < len(available_paths) + len(available_actions):
                 break
 
-            print(error_message)
+            display_manager.write_line(error_message)
 
         # check if the index is part of the paths or actions
         if option_index < len(available_paths):
@@ -139,18 +329,8 @@ class Game:
             list[Path]: List of paths that can be used from the current location.
         """
 
-        def is_valid(path) -> bool:
-            # check that the path is connected to the current place
-            if self.current_place.id not in path.places:
-                return False
-
-            # check that the path is bidirectional or is one way from the current place
-            if path.one_way and self.current_place.id not in path.one_way_start:
-                return False
-
-            return True
-
-        return [path for path in self.level.paths if is_valid(path)]
+        # the level keeps the paths indexed by the places they can be taken from (one-way paths included)
+        return self.level.get_paths_from_place(self.current_place.id)
 
     @staticmethod
     def add_hint_message(path: Path, items: list[str], hints: list[str], problem: str):
@@ -167,12 +347,12 @@ class Game:
         letter_index = ascii_lowercase[len(hints) % 26]  # turn the hint's index into a letter
         hints.append(f"{letter_index}. {path.name} ({problem}: {', '.join(items)})")
 
-    def check_for_required_items(self, required_items: list[str], hints: list[str], path: Path) -> bool:
+    def check_for_required_items(self, required_mask: int, hints: list[str], path: Path) -> bool:
         """
         Check if the player has all required items.
 
         Args:
-            required_items (list[str]): List of required items.
+            required_mask (int): Bit mask of the required items.
             hints (list[str]): List of previous hints.
             path (Path): Path with the required items.
 
@@ -180,22 +360,23 @@ class Game:
             bool: True if path was invalidated, False otherwise.
         """
 
-        remaining_required_items = [item for item in required_items if item not in self.inventory]
+        missing_mask = required_mask & ~self.inventory.mask
 
-        if len(remaining_required_items) == 0:
+        if missing_mask == 0:
             return False
 
         if path.items_hint:
+            remaining_required_items = self.level.item_registry.filter_items(path.required_items, missing_mask)
             Game.add_hint_message(path, remaining_required_items, hints, "Missing")
 
         return True
 
-    def check_for_forbidden_items(self, forbidden_items: list[str], hints: list[str], path: Path) -> bool:
+    def check_for_forbidden_items(self, forbidden_mask: int, hints: list[str], path: Path) -> bool:
         """
         Check if the player has a forbidden item.
 
         Args:
-            forbidden_items (list[str]): List of forbidden items.
+            forbidden_mask (int): Bit mask of the forbidden items.
             hints (list[str]): List of previous hints.
             path (Path): Path with forbidden items.
 
@@ -203,12 +384,13 @@ class Game:
             bool: True if path is invalid, False otherwise.
         """
 
-        owned_forbidden_items = [item for item in forbidden_items if item in self.inventory]
+        owned_forbidden_mask = forbidden_mask & self.inventory.mask
 
-        if len(owned_forbidden_items) == 0:
+        if owned_forbidden_mask == 0:
             return False
 
         if path.items_hint:
+            owned_forbidden_items = self.level.item_registry.filter_items(path.forbidden_items, owned_forbidden_mask)
             Game.add_hint_message(path, owned_forbidden_items, hints, "Can't have")
 
         return True
@@ -227,15 +409,14 @@ class Game:
         hints = []
 
         def is_valid(path: Path) -> bool:
-            required_items = path.required_items
-            forbidden_items = path.forbidden_items
+            required_mask, forbidden_mask = self.level.get_item_masks(path)
 
             # check for required items
-            path_invalidated = self.check_for_required_items(required_items, hints, path)
+            path_invalidated = self.check_for_required_items(required_mask, hints, path)
 
             # check for forbidden items
             if not path_invalidated:
-                path_invalidated = self.check_for_forbidden_items(forbidden_items, hints, path)
+                path_invalidated = self.check_for_forbidden_items(forbidden_mask, hints, path)
 
             return not path_invalidated
 
@@ -251,7 +432,7 @@ class Game:
         """
 
         # create a copy of the "places" attribute in the path
-        destinations = path.places.copy()
+        destinations = list(path.places)
 
         # remove the current place from the list of possible destinations
         destinations.remove(self.current_place.id)
@@ -261,12 +442,12 @@ class Game:
 
         self.current_place = self.level.get_place_by_id(new_place_id)
 
-    def check_end_conditions(self, scene: Scene) -> bool:
+    def check_end_conditions(self, scene: Scene | None = None) -> bool:
         """
         Check for an ending and add a section to the scene if so.
 
         Args:
-            scene (Scene): A section will be added to the scene if the game ended.
+            scene (Scene | None, optional): A section will be added to the scene if the game ended. Default: None
 
         Returns:
             bool: True if the game ended, False otherwise.
@@ -274,33 +455,37 @@ class Game:
 
         ending = self.current_place.end
 
-        if ending:
-            if ending == "win":
-                scene.add_sections(Section(f"{Back.GREEN}YOU WON!{Back.RESET}", padding_top=1))
-                return True
+        ending_sections = {
+            "win": f"{Back.GREEN}YOU WON!{Back.RESET}",
+            "loss": f"{Back.RED}YOU LOST!{Back.RESET}",
+            "draw": f"{Back.WHITE}YOU DREW!{Back.RESET}",
+        }
 
-            if ending == "loss":
-                scene.add_sections(Section(f"{Back.RED}YOU LOST!{Back.RESET}", padding_top=1))
-                return True
+        if ending not in ending_sections:
+            return False
 
-            if ending == "draw":
-                scene.add_sections(Section(f"{Back.WHITE}YOU DREW!{Back.RESET}", padding_top=1))
-                return True
+        if scene is not None:
+            scene.add_sections(Section(ending_sections[ending], padding_top=1))
 
-        return False
+        return True
 
-    def add_items(self, scene: Scene):
+    def add_items(self, scene: Scene | None = None) -> list[str]:
         """
         Add items from a place to the player's inventory.
 
         Args:
-            scene (Scene): A section with acquired items will be added if any new items were received.
+            scene (Scene | None, optional): A section with acquired items will be added if any new items were
+                received. Default: None
+
+        Returns:
+            list[str]: Newly acquired items.
         """
 
         items = self.current_place.items
+        acquired_items = []
 
         if items is None or len(items) == 0:
-            return
+            return acquired_items
 
         section_text = ""
 
@@ -310,10 +495,14 @@ class Game:
 
             section_text += f"{Style.BRIGHT}ITEM ACQUIRED:{Style.RESET_ALL} {item}"
             self.inventory.append(item)
+            acquired_items.append(item)
 
         # display the acquired items
-        section = Section(section_text, padding_top=1, padding_bottom=1)
-        scene.add_sections(section)
+        if scene is not None:
+            section = Section(section_text, padding_top=1, padding_bottom=1)
+            scene.add_sections(section)
+
+        return acquired_items
 
     def create_introduction_scene(self) -> Scene:
         """
@@ -326,7 +515,7 @@ class Game:
         scene = Scene()
 
         # display the title
-        title_section = TitleSection(self.level.name)
+        title_section = get_title_section(self.level.name)
         scene.add_sections(title_section)
 
         # display level description
@@ -344,16 +533,7 @@ class Game:
             list[dict]: Available actions to take.
         """
 
-        actions = self.level.actions
-        return [action for action in actions if self.current_place.id in action.places]
-
-    def init_achievements_file(self):
-        """
-        Create a new file for storing achievements.
-        """
-
-        with open(self.level.achievements_file_path, "w") as f:
-            json.dump([], f)
+        return self.level.get_actions_in_place(self.current_place.id)
 
     def get_achievement_by_id(self, achievement_id: int) -> Achievement | None:
         """
@@ -366,46 +546,40 @@ class Game:
             Achievement: Achievement object or None if not found.
         """
 
-        for achievement in self.level.achievements:
-            if achievement.id == achievement_id:
-                return achievement
-
-        return None
+        return self.level.get_achievement_by_id(achievement_id)
 
-    def add_achievement_from_place(self, place: Place, scene: Scene):
+    def add_achievement_from_place(self, place: Place, scene: Scene | None = None) -> Achievement | None:
         """
         Award the player an achievement from a place.
 
         Args:
             place (Place): Place with the achievement.
-            scene (Scene): Scene for displaying the added achievement.
-        """
+            scene (Scene | None, optional): Scene for displaying the added achievement. Default: None
 
-        with open(self.level.achievements_file_path, "r") as f:
-            existing_achievements = json.load(f)
+        Returns:
+            Achievement | None: The newly unlocked achievement or None.
+        """
 
         if place.achievement_id is None:
-            return
-
-        if place.achievement_id in existing_achievements:
-            return
-
-        # add the achievement to unlocked achievements
-        existing_achievements.append(place.achievement_id)
+            return None
 
-        with open(self.level.achievements_file_path, "w") as f:
-            json.dump(existing_achievements, f)
+        # add the achievement to unlocked achievements (written to the disk later)
+        if not self.achievements_store.unlock(place.achievement_id):
+            return None
 
         # get the related achievement object
         achievement = self.get_achievement_by_id(place.achievement_id)
 
         # add the achievement to the scene
-        scene.add_sections(Section(
-            f"{Style.BRIGHT}ACHIEVEMENT UNLOCKED:{Style.RESET_ALL} "
-            f"{achievement.name} - {achievement.description}",
-            padding_top=1,
-            padding_bottom=1
-        ))
+        if scene is not None:
+            scene.add_sections(Section(
+                f"{Style.BRIGHT}ACHIEVEMENT UNLOCKED:{Style.RESET_ALL} "
+                f"{achievement.name} - {achievement.description}",
+                padding_top=1,
+                padding_bottom=1
+            ))
+
+        return achievement
 
     def run_function_if_exists(self, function_name: str) -> None:
         """
@@ -415,100 +589,233 @@ class Game:
             function_name (str): Name of the function to call.
         """
 
-        if function_name is None:
-            return
+        # note: errors raised by the function itself aren't caught
+        function = self.hooks.get(function_name)
 
-        try:
-            getattr(self.level_script, function_name)(self)
-        except AttributeError:
-            pass
+        if function is not None:
+            with trace("hook", HOOK_CATEGORY, function_name):
+                function(self)
 
-    def start(self) -> None:
+    def begin(self) -> None:
         """
-        Start a new level play-through.
+        Prepare a new play-through: run the level's on start function and place the player at a starting place.
         """
 
-        # create a new achievements file if it doesn't exist yet
-        if not self.level.achievements_file_path.is_file():
-            self.init_achievements_file()
+        self.check_out()
 
-        # run the level's on start function
-        self.run_function_if_exists("on_start")
+        # a recorded play-through is seeded, so it can be replayed
+        if self.recorder is not None:
+            self.recorder.begin()
 
-        # print the introduction to the level
-        introduction = self.create_introduction_scene()
-        self.display_manager.new_scene(introduction)
-        self.display_manager.stop()
+        # run the level's on start function
+        self.run_function_if_exists(ON_START_HOOK)
 
         # randomly choose between the starting places
         self.current_place = self.level.pick_starting_place()
 
-        # game loop
-        while True:
-            # call custom "before" function
-            self.run_function_if_exists(self.current_place.call_before)
+    def observe(self, render: bool = False) -> Observation:
+        """
+        Handle the player entering the current place (or staying there after an action) and return what they see.
+
+        Args:
+            render (bool, optional): True to also create the scene of the place. Default: False
+
+        Returns:
+            Observation: The place, its outcome and the options the player can choose from.
+        """
 
-            place_scene = self.create_place_scene(self.current_place)
+        self.check_out()
 
-            # mark the current place as visited
-            self.current_place.visited = True
+        place = self.current_place
 
-            # add any new achievements
-            self.add_achievement_from_place(self.current_place, place_scene)
+        # call custom "before" function
+        self.run_function_if_exists(place.call_before)
 
-            # check the ending conditions
-            end = self.check_end_conditions(place_scene)
+        # the description depends on the visited flag, so it has to be retrieved first
+        description = place.description
 
-            if end:
-                self.display_manager.new_scene(place_scene)
-                self.display_manager.stop()
-                break
+        if render:
+            with trace("build scene"):
+                scene = self.create_place_scene(place, description)
+        else:
+            scene = None
+
+        # mark the current place as visited
+        place.visited = True
+
+        # add any new achievements
+        achievement = self.add_achievement_from_place(place, scene)
+
+        # check the ending conditions
+        if self.check_end_conditions(scene):
+            # save the achievements unlocked during the play-through
+            self.achievements_store.flush()
 
-            # add any items to the player's inventory
-            self.add_items(place_scene)
+            return self.__observed(Observation(place, description, achievement, place.end, [], [], [], [], scene))
 
-            # prepare paths and actions
+        # add any items to the player's inventory
+        acquired_items = self.add_items(scene)
+
+        # prepare paths and actions
+        with trace("filter paths"):
             available_paths = self.get_available_paths()
             hints, available_paths = self.separate_unusable_item_paths(available_paths)
             available_actions = self.get_available_actions()
 
-            # call custom "after" function
-            self.run_function_if_exists(self.current_place.call_after)
+        # call custom "after" function
+        self.run_function_if_exists(place.call_after)
 
-            # visualize path information
-            if len(hints) > 0:
-                hints_section = HintsSection(hints)
-                place_scene.add_sections(hints_section)
+        if scene is not None:
+            with trace("build scene"):
+                # visualize path information
+                if len(hints) > 0:
+                    hints_section = HintsSection(hints)
+                    scene.add_sections(hints_section)
 
-            option_menu = OptionsMenu(available_paths, available_actions, self.last_path)
-            place_scene.add_sections(option_menu)
+                option_menu = OptionsMenu(available_paths, available_actions, self.last_path)
+                scene.add_sections(option_menu)
 
-            # update the scene to display all changes
-            self.display_manager.new_scene(place_scene)
+        return self.__observed(Observation(
+            place, description, achievement, None, acquired_items, hints, available_paths, available_actions, scene
+        ))
 
-            # let the user select a path
-            path, action = Game.select_path_or_action(available_paths, available_actions)
+    def __observed(self, observation: Observation) -> Observation:
+        """
+        Record an observation if the play-through is recorded.
 
-            # handle an action
-            if action is not None:
-                action_func = getattr(self.level_script, action.function)
-                action_message = action_func(self)
+        Args:
+            observation (Observation): The observation.
+
+        Returns:
+            Observation: The same observation.
+        """
 
-                scene = self.create_action_scene(action_message)
-                self.display_manager.new_scene(scene)
-                self.display_manager.stop()
+        if self.recorder is not None:
+            self.recorder.record_observation(observation)
 
-                continue
+        return observation
+
+    def apply(self, path: Path | None, action: Action | None) -> str:
+        """
+        Take an action or move the player along a path.
+
+        Args:
+            path (Path | None): Chosen path or None if an action was chosen.
+            action (Action | None): Chosen action or None if a path was chosen.
+
+        Returns:
+            str: Message of the action or description of the path.
+        """
+
+        self.check_out()
+
+        if self.recorder is not None:
+            self.recorder.record_choice(path, action)
+
+        # handle an action
+        if action is not None:
+            action_func = self.hooks.get(action.function)
+
+            if action_func is None:
+                raise ValueError(f"The action {action.name!r} calls {action.function!r}, which the level script doesn't "
+                                 f"define")
+
+            with trace("action", HOOK_CATEGORY, action.function):
+                return action_func(self)
+
+        self.last_path = path
+
+        # the description depends on the visited flag, so it has to be retrieved first
+        description = path.description
+
+        # mark path as visited
+        path.visited = True
+
+        # move the player to a new destination
+        self.move_player(path)
+
+        return description
+
+    def wait_for_player(self):
+        """
+        Wait for the player to press ENTER. This is a generator yielding the prompt (see "run").
+        """
+
+        yield PRESS_ENTER_PROMPT
+
+        if self.recorder is not None:
+            self.recorder.record_acknowledgement()
+
+    def start(self) -> None:
+        """
+        Start a new level play-through.
+        """
+
+        try:
+            with trace("play-through", detail=self.level.name):
+                self.play()
+        finally:
+            # unfinished play-throughs are saved as well
+            if self.recorder is not None:
+                self.recorder.finish()
+
+    def play(self) -> None:
+        """
+        Play the level with rendering and player input, until an ending is reached. The player's answers are read by
+        the display manager.
+        """
+
+        play_through = self.run()
+        answer = None
+
+        while True:
+            try:
+                prompt = play_through.send(answer)
+            except StopIteration:
+                return
+
+            answer = self.display_manager.read_line(prompt)
+
+    def run(self):
+        """
+        Play the level with rendering, until an ending is reached. This is a generator: it yields a prompt whenever it
+        needs the player's answer, and the answer (a line without the line break) has to be sent back. That way one
+        loop serves both the blocking terminal ("play") and sessions waiting for their players asynchronously.
+        """
 
-            self.last_path = path
+        self.begin()
 
-            # display the path info
-            path_scene = self.create_path_scene(path)
-            self.display_manager.new_scene(path_scene)
-            self.display_manager.stop()
+        # print the introduction to the level
+        introduction = self.create_introduction_scene()
+        self.display_manager.new_scene(introduction)
+        yield from self.wait_for_player()
 
-            # mark path as visited
-            path.visited = True
+        # game loop
+        while True:
+            with trace("observe"):
+                observation = self.observe(render=True)
 
-            # move the player to a new destination
-            self.move_player(path)
+            # update the scene to display all changes
+            self.display_manager.new_scene(observation.scene)
+
+            if observation.ending is not None:
+                yield from self.wait_for_player()
+                break
+
+            # let the user select a path
+            path, action = yield from self.choose_path_or_action(
+                observation.paths, observation.actions, self.display_manager
+            )
+
+            with trace("apply"):
+                message = self.apply(path, action)
+
+            # display the action's message or the path info
+            with trace("build scene"):
+                if action is not None:
+                    scene = self.create_action_scene(message)
+                else:
+                    scene = self.create_path_scene(path, message)
+
+            self.display_manager.new_scene(scene)
+            yield from self.wait_for_player()
@@ -1,34 +1,112 @@
+import os
+from collections import OrderedDict
 from glob import glob
 from random import choice
 
-from yaml import safe_load
-
 from mystics_and_manuscripts.level.achievement import Achievement
 from mystics_and_manuscripts.level.action import Action
+from mystics_and_manuscripts.level.bundle import BUNDLE_EXTENSION, LevelBundle, open_bundle
+from mystics_and_manuscripts.level.cache import load_level_dict, load_manifest_dict
+from mystics_and_manuscripts.level.hooks import hook
+from mystics_and_manuscripts.level.items import ItemRegistry, Inventory
+from mystics_and_manuscripts.level.journal import MISSING, ChangeSet, Journal, ObservedList, TrackedObject
+from mystics_and_manuscripts.level.manifest import LevelManifest
 from mystics_and_manuscripts.level.place import Place
 from mystics_and_manuscripts.level.path import Path
+from mystics_and_manuscripts.level.texts import TextStore, get_text_storage, keep_text, resolve_text
 
 from pathlib import Path as FilePath
 
+from mystics_and_manuscripts.tracing import trace
 from mystics_and_manuscripts.utils import mirror_or_empty
 
+# classes of the objects in the lists of a level, by the name of the list
+LEVEL_OBJECT_CLASSES = {"places": Place, "paths": Path, "actions": Action, "achievements": Achievement}
+
 
-class Level:
-    def __init__(self, level: dict, path_to_level: str):
+class Level(TrackedObject):
+    def __init__(self, level: dict | LevelBundle, path_to_level: str, text_storage: str | None = None):
         """
-        A class mirror of the level dictionary.
+        A class mirror of the level dictionary. Levels loaded from a compiled bundle create their places, paths and
+        actions when they're first needed, and answer lookups from the bundle's precomputed tables until the lists are
+        used directly (e.g. "level.places") or the looked up attributes change.
 
         Args:
-            level (dict): Level data used in this object.
+            level (dict | LevelBundle): Level data used in this object.
             path_to_level (str): Path to the level's folder.
+            text_storage (str | None, optional): "compressed" to keep the descriptions and the introduction compressed
+                in memory, decoding them when they're used, "plain" to keep them as they are. None for the storage set
+                by the MM_TEXT_STORAGE environment variable. Bundles always keep them compressed. Default: None
         """
 
-        self.name = level["name"]
-        self.introduction = level.get("introduction")
-        self.places = [Place(place_dict) for place_dict in level["places"]]
-        self.paths = mirror_or_empty(level, "paths", Path)
-        self.actions = mirror_or_empty(level, "actions", Action)
-        self.achievements = mirror_or_empty(level, "achievements", Achievement)
+        # indexes for lookups by place/achievement ID, the lists of places, paths, actions and achievements keep them
+        # up-to-date when items are appended or removed, other changes mark them as stale and they get rebuilt lazily
+        self.__indexes = {"places": {}, "paths": {}, "actions": {}, "achievements": {}}
+        self.__stale_indexes = set(self.__indexes)
+
+        # path -> bit masks of its required and forbidden items, dropped when the items change
+        self.__item_masks = {}
+
+        # ID of an object the level was loaded with -> (name of its list, position), built when first needed
+        self.__object_references = None
+
+        # compiled level the objects are created from, None for levels loaded from a dictionary
+        self.__bundle = level if isinstance(level, LevelBundle) else None
+
+        # names of the lists whose lookups are answered by the bundle, the lists aren't created yet
+        self.__bundle_indexes = set()
+
+        # every item name gets its own bit, so inventories and item requirements can be compared as integers
+        self.item_registry = ItemRegistry()
+
+        # store of the descriptions and the introduction kept compressed, objects refer to their texts by index,
+        # None if they're kept as they are
+        self.__text_store = self.__bundle.texts if self.__bundle is not None else None
+
+        if self.__bundle is not None:
+            self.name = self.__bundle.name
+            self.introduction = self.__bundle.introduction
+
+            # achievements are few and listed with the level anyway, so they're created right away
+            self.achievements = ObservedList(
+                [Achievement(self.__bundle.get_dict("achievements", position))
+                 for position in range(self.__bundle.get_count("achievements"))],
+                self._on_list_change
+            )
+
+            self.__bundle_indexes.update(("places", "paths", "actions"))
+            self.item_registry.get_mask(self.__bundle.item_names)
+        else:
+            # prose is most of a level's memory, while a play-through only shows a fraction of it, so it can be kept
+            # compressed, the objects add their descriptions to the store as they're created
+            if get_text_storage(text_storage) == "compressed":
+                self.__text_store = TextStore()
+
+            self.name = level["name"]
+            self.introduction = keep_text(level.get("introduction"), self.__text_store)
+            self.places = ObservedList(
+                [Place(place_dict, self.__text_store) for place_dict in level["places"]], self._on_list_change
+            )
+            self.paths = ObservedList(
+                [Path(path_dict, self.__text_store) for path_dict in level.get("paths") or []], self._on_list_change
+            )
+            self.actions = ObservedList(mirror_or_empty(level, "actions", Action), self._on_list_change)
+            self.achievements = ObservedList(
+                mirror_or_empty(level, "achievements", Achievement), self._on_list_change
+            )
+
+            if self.__text_store is not None:
+                self.__text_store.compress()
+
+            for place in self.places:
+                self.item_registry.get_mask(place.items)
+
+            for path in self.paths:
+                self.item_registry.get_mask(path.required_items)
+                self.item_registry.get_mask(path.forbidden_items)
+
+        # names of the hook and action functions the level was loaded with, a bundle lists them when they're first needed
+        self.__function_names = None if self.__bundle is not None else self.__collect_function_names()
 
         self.level_file_path = FilePath(path_to_level)
         self.folder_path = self.level_file_path.parent
@@ -36,6 +114,379 @@ class Level:
         # note: adding a file/sub-folder to a pathlib "Path" is done using a slash
         self.achievements_file_path = self.folder_path / "achievements.json"
 
+        # level scripts modify the level during a play-through, the journal records the changes so they can be undone
+        self.journal = Journal()
+        self.journal.listeners.append(self._on_object_change)
+
+        # objects the level was loaded with, by the name of their list, saved games refer to them by their position,
+        # None marks objects of a bundle that aren't created yet
+        self.__loaded_objects = {
+            name: [None] * self.__bundle.get_count(name) if name in self.__bundle_indexes else list(getattr(self, name))
+            for name in self.__indexes
+        }
+
+        # game whose play-through the level currently holds, forks of the game share the level (see Game.fork)
+        self.owner = None
+
+        # change set the changes since the journal's mark are made on top of, None for the loaded level
+        self.__change_set = None
+
+        for loaded_objects in self.__loaded_objects.values():
+            for level_object in loaded_objects:
+                if level_object is not None:
+                    level_object.attach_journal(self.journal)
+
+        self.attach_journal(self.journal)
+
+    @property
+    def introduction(self) -> str | None:
+        """str | None: Introduction to the level, shown before the play-through."""
+
+        return resolve_text(self.__introduction, self.__text_store)
+
+    @introduction.setter
+    def introduction(self, value: str | None):
+        self.__introduction = value
+
+    def __getattr__(self, name: str):
+        # only called for missing attributes, i.e. the lists of a bundle's objects before they're first used
+        if name.startswith("_") or name not in LEVEL_OBJECT_CLASSES or self.__bundle is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        level_objects = ObservedList(
+            [self.__get_loaded_object(name, position) for position in range(len(self.__loaded_objects[name]))],
+            self._on_list_change
+        )
+        level_objects.track(self.journal, self, name)
+
+        # the list is a part of the loaded level, so creating it isn't recorded in the journal
+        object.__setattr__(self, name, level_objects)
+
+        # lookups use the list from now on, so they see the changes scripts make to it
+        self.__bundle_indexes.discard(name)
+        self.__stale_indexes.add(name)
+
+        return level_objects
+
+    def __get_loaded_object(self, name: str, position: int):
+        """
+        Return an object the level was loaded with, create it from the bundle first if it doesn't exist yet.
+
+        Args:
+            name (str): Name of the object's list.
+            position (int): Position of the object in the list.
+
+        Returns:
+            Place, path, action or achievement.
+        """
+
+        loaded_objects = self.__loaded_objects[name]
+        level_object = loaded_objects[position]
+
+        if level_object is None:
+            level_dict = self.__bundle.get_dict(name, position)
+
+            # descriptions of places and paths are indexes in the bundle's text store
+            if name in ("places", "paths"):
+                level_object = LEVEL_OBJECT_CLASSES[name](level_dict, self.__text_store)
+            else:
+                level_object = LEVEL_OBJECT_CLASSES[name](level_dict)
+            level_object.attach_journal(self.journal)
+            loaded_objects[position] = level_object
+
+            if self.__object_references is not None:
+                self.__object_references[id(level_object)] = (name, position)
+
+        return level_object
+
+    @staticmethod
+    def __get_index_keys(index_name: str, level_object) -> list:
+        """
+        Return the keys a level object is stored under in an index.
+
+        Args:
+            index_name (str): Name of the index (same as the name of the indexed list).
+            level_object: Place, path, action or achievement.
+
+        Returns:
+            list: Keys of the object.
+        """
+
+        if index_name == "paths":
+            return level_object.get_start_place_ids()
+
+        if index_name == "actions":
+            return list(dict.fromkeys(level_object.places))
+
+        return [level_object.id]
+
+    def __get_index(self, index_name: str) -> dict:
+        """
+        Return an index, rebuild it first if it's stale.
+
+        Args:
+            index_name (str): Name of the index (same as the name of the indexed list).
+
+        Returns:
+            dict: Place/achievement ID -> object for places and achievements, place ID -> list of objects otherwise.
+        """
+
+        index = self.__indexes[index_name]
+
+        if index_name in self.__stale_indexes:
+            index.clear()
+            self.__stale_indexes.discard(index_name)
+            self.__add_to_index(index_name, getattr(self, index_name))
+
+        return index
+
+    def __add_to_index(self, index_name: str, level_objects) -> None:
+        index = self.__indexes[index_name]
+
+        for level_object in level_objects:
+            for key in Level.__get_index_keys(index_name, level_object):
+                # with duplicate IDs, the first place/achievement is the one that's found
+                if index_name in ("places", "achievements"):
+                    index.setdefault(key, level_object)
+                else:
+                    index.setdefault(key, []).append(level_object)
+
+    def _on_list_change(self, changed_list: ObservedList, added, removed, reordered: bool) -> None:
+        """
+        Update the index of a list of level objects after it changed.
+        """
+
+        index_name = changed_list._attribute
+
+        # objects added by scripts report their changes too, so they can be undone and saved like the loaded ones
+        for level_object in added:
+            if isinstance(level_object, TrackedObject) and level_object._journal is None:
+                level_object.attach_journal(self.journal)
+
+        if index_name is None or index_name in self.__stale_indexes:
+            return
+
+        # removing a place/achievement could uncover one with a duplicate ID, so that's left to a rebuild
+        if reordered or (removed and index_name in ("places", "achievements")):
+            self.__stale_indexes.add(index_name)
+            return
+
+        index = self.__indexes[index_name]
+
+        for level_object in removed:
+            for key in Level.__get_index_keys(index_name, level_object):
+                index[key].remove(level_object)
+
+            self.__item_masks.pop(level_object, None)
+
+        self.__add_to_index(index_name, added)
+
+    def _on_object_change(self, target, attribute: str | None) -> None:
+        """
+        Mark indexes as stale when an indexed attribute of a level object changes.
+        """
+
+        if target is self and attribute in self.__indexes:
+            # keep replaced lists observed as well
+            value = getattr(self, attribute)
+
+            if not isinstance(value, ObservedList):
+                value = ObservedList(value, self._on_list_change)
+                value.track(self.journal, self, attribute)
+                object.__setattr__(self, attribute, value)
+
+            self.__mark_stale(attribute)
+        elif isinstance(target, Path) and attribute in ("places", "one_way", "one_way_start"):
+            self.__mark_stale("paths")
+        elif isinstance(target, Path) and attribute in ("required_items", "forbidden_items"):
+            self.__item_masks.pop(target, None)
+        elif isinstance(target, Action) and attribute == "places":
+            self.__mark_stale("actions")
+        elif isinstance(target, (Place, Achievement)) and attribute == "id":
+            self.__mark_stale("places" if isinstance(target, Place) else "achievements")
+        elif isinstance(target, Place) and attribute == "start":
+            # the bundle's starting places could be wrong now
+            self.__bundle_indexes.discard("places")
+
+    def __mark_stale(self, index_name: str) -> None:
+        # the bundle's tables describe the loaded level, so they can't answer lookups after a change either
+        self.__stale_indexes.add(index_name)
+        self.__bundle_indexes.discard(index_name)
+
+    def reset(self) -> None:
+        """
+        Restore the level to the state it was in after loading. The cost only depends on the number of changes. No game
+        holds the level afterwards (see "Game.check_out").
+        """
+
+        self.journal.reset()
+        object.__setattr__(self, "_Level__change_set", None)
+        self.set_owner(None)
+
+    def set_owner(self, owner) -> None:
+        """
+        Set the game whose play-through the level holds. The owner isn't a part of the level data, so it isn't recorded
+        in the journal.
+
+        Args:
+            owner (Game | None): The game or None.
+        """
+
+        object.__setattr__(self, "owner", owner)
+
+    def take_change_set(self) -> ChangeSet:
+        """
+        Return the changes made since the level was last switched to a change set (or reset), on top of that change
+        set. The level is in the state of the returned change set afterwards, with no further changes.
+
+        Returns:
+            ChangeSet: The changes.
+        """
+
+        change_set = ChangeSet(self.journal.take_marked_changes(), self.__change_set)
+        object.__setattr__(self, "_Level__change_set", change_set)
+
+        return change_set
+
+    def switch_to(self, change_set: ChangeSet) -> None:
+        """
+        Bring the level into the state of a change set. Only the differences are undone and redone: the changes since
+        the last switch, the change sets from the current one up to the one both states are based on, and down from
+        there to the new one. The changes of the new change set itself are changes since the switch again, so taking
+        the change set later returns them together with the new ones.
+
+        Args:
+            change_set (ChangeSet): Change set from "take_change_set".
+        """
+
+        journal = self.journal
+        journal.undo_marked_changes()
+
+        current = self.__change_set
+        target = change_set.parent
+        redone = []
+
+        # go up from the deeper of the two until they meet (None, the loaded level, is above all change sets)
+        while current is not target:
+            if target is None or (current is not None and current.depth >= target.depth):
+                current.undo(journal)
+                current = current.parent
+            else:
+                redone.append(target)
+                target = target.parent
+
+        for parent in reversed(redone):
+            parent.redo(journal)
+
+        # moving between change sets isn't a change of any play-through
+        journal.mark()
+
+        change_set.redo(journal)
+        object.__setattr__(self, "_Level__change_set", change_set.parent)
+
+    def get_changes(self) -> tuple[list, list]:
+        """
+        Return the differences from the loaded state, taken from the journal. Changed lists are copied.
+
+        Returns:
+            tuple: Changed lists at index 0 as (owner, attribute, content) and changed attributes at index 1 as
+                (object, attribute, value).
+        """
+
+        lists = []
+        attributes = []
+
+        for target, attribute, original in self.journal.originals.values():
+            if attribute is None:
+                lists.append((target._owner, target._attribute, list(target)))
+                continue
+
+            value = getattr(target, attribute, MISSING)
+
+            # changed and changed back (or deleted, which scripts don't do)
+            if value is original or value is MISSING:
+                continue
+
+            # lists assigned by scripts aren't tracked, so they are copied as well
+            attributes.append((target, attribute, list(value) if isinstance(value, list) else value))
+
+        return lists, attributes
+
+    def apply_changes(self, changes: tuple[list, list]) -> None:
+        """
+        Reset the level and apply changes from "get_changes". The changes are recorded in the journal again.
+
+        Args:
+            changes (tuple[list, list]): Changed lists and attributes.
+        """
+
+        lists, attributes = changes
+
+        self.reset()
+
+        # list contents first, changed attributes may replace the lists afterwards
+        for owner, attribute, content in lists:
+            getattr(owner, attribute)[:] = content
+
+        for target, attribute, value in attributes:
+            setattr(target, attribute, list(value) if isinstance(value, list) else value)
+
+    def get_object_reference(self, level_object) -> tuple | None:
+        """
+        Return a reference to an object the level was loaded with, which stays valid between play-throughs.
+
+        Args:
+            level_object: Level, place, path, action or achievement.
+
+        Returns:
+            tuple | None: Name of the object's list and its position there, None for objects created later (by scripts).
+        """
+
+        if level_object is self:
+            return "level", 0
+
+        if self.__object_references is None:
+            object_references = {
+                id(loaded_object): (name, position)
+                for name, loaded_objects in self.__loaded_objects.items()
+                for position, loaded_object in enumerate(loaded_objects)
+                if loaded_object is not None
+            }
+
+            # a cache, not a part of the level data, so it isn't recorded in the journal
+            object.__setattr__(self, "_Level__object_references", object_references)
+
+        # note: the loaded objects are kept alive by the level, so their IDs can't be reused
+        return self.__object_references.get(id(level_object))
+
+    def get_referenced_object(self, reference: tuple):
+        """
+        Return the object a reference from "get_object_reference" points to.
+
+        Args:
+            reference (tuple): Name of the object's list and its position there.
+
+        Returns:
+            Level, place, path, action or achievement.
+        """
+
+        name, position = reference
+
+        if name == "level":
+            return self
+
+        return self.__get_loaded_object(name, position)
+
+    def get_loaded_object_counts(self) -> dict[str, int]:
+        """
+        Return the numbers of objects the level was loaded with.
+
+        Returns:
+            dict[str, int]: Name of the list -> number of objects.
+        """
+
+        return {name: len(loaded_objects) for name, loaded_objects in self.__loaded_objects.items()}
+
     def get_place_by_id(self, place_id: int) -> Place | None:
         """
         Find a place by its ID.
@@ -47,11 +498,80 @@ class Level:
             dict | None: The place with the ID or None if the place doesn't exist in the level.
         """
 
-        for place_obj in self.places:
-            if place_obj.id == place_id:
-                return place_obj
+        if "places" in self.__bundle_indexes:
+            position = self.__bundle.find_place(place_id)
+            return self.__get_loaded_object("places", position) if position is not None else None
+
+        return self.__get_index("places").get(place_id)
+
+    def get_paths_from_place(self, place_id: int) -> list[Path]:
+        """
+        Return paths that can be taken from a place, in the order they're defined in.
+
+        Args:
+            place_id (int): ID of the place.
 
-        return None
+        Returns:
+            list[Path]: Paths connected to the place, excluding one-way paths that don't start there.
+        """
+
+        if "paths" in self.__bundle_indexes:
+            return [
+                self.__get_loaded_object("paths", position) for position in self.__bundle.get_adjacent("paths", place_id)
+            ]
+
+        return list(self.__get_index("paths").get(place_id, []))
+
+    def get_actions_in_place(self, place_id: int) -> list[Action]:
+        """
+        Return actions available in a place, in the order they're defined in.
+
+        Args:
+            place_id (int): ID of the place.
+
+        Returns:
+            list[Action]: Actions available in the place.
+        """
+
+        if "actions" in self.__bundle_indexes:
+            return [
+                self.__get_loaded_object("actions", position)
+                for position in self.__bundle.get_adjacent("actions", place_id)
+            ]
+
+        return list(self.__get_index("actions").get(place_id, []))
+
+    def get_item_masks(self, path: Path) -> tuple[int, int]:
+        """
+        Return the bit masks of the items a path requires and forbids.
+
+        Args:
+            path (Path): Path to get the masks of.
+
+        Returns:
+            tuple[int, int]: Mask of the required items at index 0 and mask of the forbidden items at index 1.
+        """
+
+        masks = self.__item_masks.get(path)
+
+        if masks is None:
+            masks = (self.item_registry.get_mask(path.required_items), self.item_registry.get_mask(path.forbidden_items))
+            self.__item_masks[path] = masks
+
+        return masks
+
+    def get_achievement_by_id(self, achievement_id: int) -> Achievement | None:
+        """
+        Find an achievement by its ID.
+
+        Args:
+            achievement_id (int): ID of the achievement to look for.
+
+        Returns:
+            Achievement | None: The achievement with the ID or None if it doesn't exist in the level.
+        """
+
+        return self.__get_index("achievements").get(achievement_id)
 
     def find_starting_places(self) -> list[Place]:
         """
@@ -61,8 +581,32 @@ class Level:
             list[Place]: List of starting places.
         """
 
+        if "places" in self.__bundle_indexes:
+            return [self.__get_loaded_object("places", position) for position in self.__bundle.get_starting_places()]
+
         return [place_obj for place_obj in self.places if place_obj.start]
 
+    def __collect_function_names(self) -> list[str]:
+        names = [name for place in self.places for name in (place.call_before, place.call_after)]
+        names.extend(action.function for action in self.actions)
+
+        return [name for name in dict.fromkeys(names) if name is not None]
+
+    def get_function_names(self) -> list[str]:
+        """
+        Return names of the hook and action functions the level was loaded with. They're collected once, names changed
+        by scripts later on aren't included.
+
+        Returns:
+            list[str]: Names in the order they're referenced.
+        """
+
+        if self.__function_names is None:
+            # a cache, not a part of the level data, so it isn't recorded in the journal
+            object.__setattr__(self, "_Level__function_names", self.__bundle.get_function_names())
+
+        return list(self.__function_names)
+
     def pick_starting_place(self) -> Place:
         """
         Randomly choose a starting place of a level.
@@ -79,15 +623,145 @@ def get_all_level_paths() -> list[str]:
     Get all level paths from the "levels" folder.
 
     Returns:
-        list[str]: List of paths to level yaml files.
+        list[str]: List of paths to level yaml files, and to bundles of levels compiled without a yaml file next to them.
+    """
+
+    level_paths = glob("levels/*/level.yaml") + glob("levels/*/level.yml")
+
+    # e.g. huge generated levels can be distributed compiled only
+    for bundle_path in glob(f"levels/*/level{BUNDLE_EXTENSION}"):
+        if not any(FilePath(bundle_path).with_suffix(suffix).exists() for suffix in (".yaml", ".yml")):
+            level_paths.append(bundle_path)
+
+    return level_paths
+
+
+def get_stat_info(level_path: str) -> tuple[int, int]:
+    """
+    Return the stat info used to detect changes of a level file.
+
+    Args:
+        level_path (str): Path to the level file.
+
+    Returns:
+        tuple[int, int]: Modification time in nanoseconds at index 0 and file size at index 1.
     """
 
-    return glob("levels/*/level.yaml") + glob("levels/*/level.yml")
+    stat = os.stat(level_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class LevelLibrary:
+    def __init__(self, max_loaded_levels: int | None = 8, text_storage: str | None = None):
+        """
+        Collection of level manifests and a bounded number of fully loaded levels. Files are only read again when their
+        stat info shows that they changed on disk.
+
+        Args:
+            max_loaded_levels (int | None, optional): Number of fully loaded levels to keep, the least recently used
+                ones are dropped first. None for no limit. Default: 8
+            text_storage (str | None, optional): Text storage of the loaded levels (see Level). Default: None
+        """
+
+        self.max_loaded_levels = max_loaded_levels
+        self.text_storage = text_storage
+
+        self.manifests = {}  # path to the level file -> (stat info, manifest)
+        self.loaded_levels = OrderedDict()  # path to the level file -> (stat info, level), most recently used last
+
+    def get_manifests(self, level_paths: list[str] | None = None) -> list[LevelManifest]:
+        """
+        Return manifests of levels.
+
+        Args:
+            level_paths (list[str] | None, optional): Paths to the level files. None for all levels in the "levels"
+                folder. Default: None
+
+        Returns:
+            list[LevelManifest]: List of level manifests.
+        """
+
+        if level_paths is None:
+            level_paths = get_all_level_paths()
+
+        manifests = []
+
+        for lvl_path in level_paths:
+            lvl_path = str(lvl_path)
+            stat_info = get_stat_info(lvl_path)
+
+            loaded_stat_info, manifest = self.manifests.get(lvl_path, (None, None))
+
+            if loaded_stat_info != stat_info:
+                bundle = open_bundle(lvl_path)
+
+                if bundle is not None:
+                    with bundle:
+                        manifest = LevelManifest(bundle.get_manifest_dict(), lvl_path)
+                else:
+                    manifest = LevelManifest(load_manifest_dict(lvl_path), lvl_path)
+
+                self.manifests[lvl_path] = (stat_info, manifest)
+
+            manifests.append(manifest)
+
+        return manifests
+
+    def get_level(self, level_path: str) -> Level:
+        """
+        Return a fully loaded level in its original state. Levels that were loaded before and haven't changed on disk
+        since are reset and reused instead of being parsed again. Compiled levels (see "level.bundle") are opened from
+        their bundle.
+
+        Args:
+            level_path (str): Path to the level file or bundle.
+
+        Returns:
+            Level: Level object.
+        """
+
+        level_path = str(level_path)
+        stat_info = get_stat_info(level_path)
+
+        loaded_stat_info, level = self.loaded_levels.pop(level_path, (None, None))
+
+        with trace("load level", detail=level_path):
+            if loaded_stat_info == stat_info:
+                level.reset()
+            else:
+                level = load_level(level_path, self.text_storage)
+
+        # (re-)insert the level as the most recently used one
+        self.loaded_levels[level_path] = (stat_info, level)
+
+        if self.max_loaded_levels is not None:
+            while len(self.loaded_levels) > self.max_loaded_levels:
+                self.loaded_levels.popitem(last=False)
+
+        return level
+
+
+def load_level(level_path: str, text_storage: str | None = None) -> Level:
+    """
+    Load a level from its path. Compiled levels (see "level.bundle") are memory-mapped, others are parsed through the
+    binary cache, as parsing the yaml is slow.
+
+    Args:
+        level_path (str): Path to the level file or bundle.
+        text_storage (str | None, optional): Text storage of the level (see Level). Default: None
+
+    Returns:
+        Level: New level object.
+    """
+
+    bundle = open_bundle(level_path)
+    return Level(bundle if bundle is not None else load_level_dict(level_path), level_path, text_storage)
 
 
 def load_levels(level_paths: list[str]) -> list[Level]:
     """
-    Load levels from their paths.
+    Load levels from their paths. Every call creates new level objects, so callers never share them, use a
+    LevelLibrary to reuse levels that were loaded before.
 
     Args:
         level_paths (list[str]): List of paths to the level files.
@@ -96,14 +770,8 @@ def load_levels(level_paths: list[str]) -> list[Level]:
         list[Level]: List of level objects.
     """
 
-    levels = []
-
-    for lvl_path in level_paths:
-        with open(lvl_path, "r") as f:
-            level_dict = safe_load(f)
-            levels.append(Level(level_dict, lvl_path))
-
-    return levels
+    with trace("load levels"):
+        return [load_level(str(lvl_path)) for lvl_path in level_paths]
 
 
 def load_all_levels() -> list[Level]:
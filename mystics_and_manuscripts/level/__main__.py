@@ -0,0 +1,78 @@
+import os
+from argparse import ArgumentParser
+from time import perf_counter
+
+from mystics_and_manuscripts.level import get_all_level_paths
+from mystics_and_manuscripts.level.bundle import compile_level_file, is_bundle_file_path
+from mystics_and_manuscripts.level.generator import LevelGenerator
+
+parser = ArgumentParser(prog="python -m mystics_and_manuscripts.level", description="Level tools.")
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+compile_parser = subparsers.add_parser(
+    "compile", help="compile level files into memory-mappable bundles, loaded instead of the yaml while up-to-date"
+)
+compile_parser.add_argument(
+    "levels", nargs="*", help="paths to the level files, e.g. levels/castle/level.yaml, all levels if none are given"
+)
+compile_parser.add_argument("-o", "--output", help="path to the bundle (only for a single level), default: next to it")
+
+generate_parser = subparsers.add_parser(
+    "generate", help="write a random level of any size (level.yaml and level.py) for scale and stress testing"
+)
+generate_parser.add_argument("folder", help="folder of the level, e.g. levels/generated")
+generate_parser.add_argument("-p", "--places", type=int, default=1000, help="number of places (default: 1000)")
+generate_parser.add_argument("-b", "--branching-factor", type=float, default=3.0,
+                             help="average number of paths leading from a place, at least about 2 (default: 3)")
+generate_parser.add_argument("--one-way", type=float, default=0.05,
+                             help="share of the random paths that are one-way (default: 0.05)")
+generate_parser.add_argument("--multi-destination", type=float, default=0.05,
+                             help="share of the random paths leading to one of several places (default: 0.05)")
+generate_parser.add_argument("--item-gating", type=float, default=0.1,
+                             help="share of the random paths requiring or forbidding an item (default: 0.1)")
+generate_parser.add_argument("-a", "--actions", type=int, default=1, help="number of actions (default: 1)")
+generate_parser.add_argument("--achievements", type=int, default=5, help="number of achievements (default: 5)")
+generate_parser.add_argument("-d", "--description-sentences", type=int, default=3,
+                             help="average number of sentences of a place description (default: 3)")
+generate_parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the random level (default: 0)")
+generate_parser.add_argument("--no-script", action="store_true",
+                             help="don't write the level script, only possible without actions")
+
+args = parser.parse_args()
+
+if args.command == "generate":
+    if args.no_script and args.actions > 0:
+        parser.error("--no-script needs --actions 0, actions call functions of the level script")
+
+    try:
+        generator = LevelGenerator(
+            args.places, args.branching_factor, args.one_way, args.multi_destination, args.item_gating, args.actions,
+            args.achievements, args.description_sentences, args.seed
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    start_time = perf_counter()
+    level_file_path = generator.write(args.folder, not args.no_script)
+    duration = perf_counter() - start_time
+
+    print(f"{level_file_path} ({generator.place_count} places, {generator.path_count} paths, "
+          f"{os.path.getsize(level_file_path)} bytes, {duration:.1f} s)")
+    parser.exit()
+
+level_paths = args.levels if len(args.levels) > 0 else get_all_level_paths()
+level_paths = [level_path for level_path in level_paths if not is_bundle_file_path(level_path)]
+
+if args.output is not None and len(level_paths) != 1:
+    parser.error("--output needs exactly one level")
+
+for level_path in level_paths:
+    start_time = perf_counter()
+
+    try:
+        bundle_file_path = compile_level_file(level_path, args.output)
+    except ValueError as error:
+        parser.exit(1, f"{level_path}: {error}\n")
+
+    duration = perf_counter() - start_time
+    print(f"{level_path} -> {bundle_file_path} ({os.path.getsize(bundle_file_path)} bytes, {duration * 1000:.0f} ms)")
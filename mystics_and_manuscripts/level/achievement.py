@@ -1,4 +1,10 @@
-class Achievement:
+from mystics_and_manuscripts.level.journal import TrackedObject
+from mystics_and_manuscripts.utils import intern_text
+
+
+class Achievement(TrackedObject):
+    __slots__ = ("id", "name", "description")
+
     def __init__(self, achievement: dict):
         """
         A class mirror of the achievement dictionary.
@@ -8,8 +14,8 @@ class Achievement:
         """
 
         self.id = achievement["id"]
-        self.name = achievement["name"]
-        self.description = achievement["description"]
+        self.name = intern_text(achievement["name"])
+        self.description = intern_text(achievement["description"])
 
     # this is a neat trick to allow for dict type casting
     # (https://stackoverflow.com/a/35282286/16343968)
@@ -1,4 +1,10 @@
-class Action:
+from mystics_and_manuscripts.level.journal import TrackedObject
+from mystics_and_manuscripts.utils import intern_text
+
+
+class Action(TrackedObject):
+    __slots__ = ("name", "places", "function")
+
     def __init__(self, action: dict):
         """
         A class mirror of the action dictionary.
@@ -7,9 +13,9 @@ class Action:
             action (dict): Action data used in this object.
         """
 
-        self.name = action["name"]
-        self.places = action["places"]
-        self.function = action["function"]
+        self.name = intern_text(action["name"])
+        self.places = tuple(action["places"])
+        self.function = intern_text(action["function"])
 
     # this is a neat trick to allow for dict type casting
     # (https://stackoverflow.com/a/35282286/16343968)
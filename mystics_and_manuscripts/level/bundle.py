@@ -0,0 +1,716 @@
+import mmap
+import os
+import struct
+import warnings
+from array import array
+from bisect import bisect_left
+from pathlib import Path as FilePath
+from sys import intern
+
+from mystics_and_manuscripts.level.path import Path
+from mystics_and_manuscripts.level.texts import TextStore, resolve_text
+
+BUNDLE_MAGIC = b"MMLB"
+
+# bump this number whenever the layout changes, bundles of other versions are rejected
+BUNDLE_FORMAT_VERSION = 2
+
+BUNDLE_EXTENSION = ".mmbundle"
+
+# written in the native byte order, it reads differently on a machine with the other one
+BYTE_ORDER_MARK = 0x01020304
+
+# magic, format version, byte order mark, mtime (ns) and size of the level file the bundle was compiled from
+HEADER = struct.Struct("=4sIIqq")
+
+# every section is an array of 32-bit integers, except for the string table ("string_data" in UTF-8 and unsigned
+# "string_offsets") and the compressed texts ("text_data" and the unsigned "text_offsets", "text_block_starts" and
+# "text_block_offsets", see TextStore)
+SECTION_NAMES = (
+    "string_offsets", "string_data", "text_offsets", "text_block_starts", "text_block_offsets", "text_data",
+    "integers", "level", "items", "functions", "places", "paths", "actions", "achievements", "starting_places",
+    "node_ids", "node_places", "node_paths", "adjacent_paths", "node_actions", "adjacent_actions",
+)
+
+# sections that aren't arrays of signed integers
+BYTE_SECTION_NAMES = ("string_data", "text_data")
+UNSIGNED_SECTION_NAMES = ("string_offsets", "text_offsets", "text_block_starts", "text_block_offsets")
+
+# offset and length of every section, following the header
+SECTION_TABLE = struct.Struct("=" + "QQ" * len(SECTION_NAMES))
+
+# sections are aligned, so the tables can be viewed as integer arrays
+SECTION_ALIGNMENT = 8
+
+# stored instead of a missing value (None)
+NONE = -2 ** 31
+
+# columns of the fixed-width tables as (level file key, kind, required), the kinds are:
+#   "int" - the integer itself
+#   "bool" - 0 or 1
+#   "string" - index in the string table
+#   "text" - prose, compressed: a text (index * 2) or a list of texts (offset of their indexes in the pool * 2 + 1)
+#   "ints" - offset of a list of integers in the integer pool
+#   "items" - offset of a list of item indexes (see the "items" section) in the integer pool
+# lists in the integer pool are stored as their length followed by the elements
+LEVEL_FIELDS = (("name", "string", True), ("introduction", "text", False))
+
+TABLE_FIELDS = {
+    "places": (
+        ("id", "int", True), ("name", "string", True), ("description", "text", True),
+        ("first-time-description", "text", False), ("start", "bool", False), ("end", "string", False),
+        ("items", "items", False), ("achievement-id", "int", False), ("call-before", "string", False),
+        ("call-after", "string", False),
+    ),
+    "paths": (
+        ("places", "ints", True), ("name", "string", False), ("description", "text", False),
+        ("first-time-description", "text", False), ("one-way", "bool", False), ("one-way-start", "ints", False),
+        ("disable-go-back", "bool", False), ("required-items", "items", False), ("forbidden-items", "items", False),
+        ("items-hint", "bool", False), ("achievement-id", "int", False),
+    ),
+    "actions": (("name", "string", True), ("places", "ints", True), ("function", "string", True)),
+    "achievements": (("id", "int", True), ("name", "string", True), ("description", "string", True)),
+}
+
+
+def get_bundle_file_path(level_file_path: str | FilePath) -> FilePath:
+    """
+    Return the path of the bundle compiled from a level file.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+
+    Returns:
+        FilePath: Path to the bundle, next to the level file.
+    """
+
+    return FilePath(level_file_path).with_suffix(BUNDLE_EXTENSION)
+
+
+def is_bundle_file_path(file_path: str | FilePath) -> bool:
+    """
+    Check whether a path points to a bundle rather than a level yaml file.
+
+    Args:
+        file_path (str | FilePath): Path to check.
+
+    Returns:
+        bool: True for bundles.
+    """
+
+    return str(file_path).endswith(BUNDLE_EXTENSION)
+
+
+def check_int(value) -> int:
+    """
+    Check that a value of the level file fits an integer column.
+
+    Args:
+        value: Value to check.
+
+    Returns:
+        int: The value.
+
+    Raises:
+        ValueError: The value isn't a 32-bit integer.
+    """
+
+    # booleans are integers in Python, but not in the level file
+    if not isinstance(value, int) or isinstance(value, bool) or not NONE < value < 2 ** 31:
+        raise ValueError(f"Expected a 32-bit integer, got {value!r}")
+
+    return value
+
+
+class BundleWriter:
+    def __init__(self):
+        """
+        Builder of the sections of a bundle. Strings and item names are interned, so every distinct one is stored once.
+        """
+
+        self.strings = {}  # string -> index in the string table
+        self.items = {}  # item name -> index in the "items" section
+        self.integers = array("i")
+        self.texts = TextStore()
+
+    def add_string(self, value: str) -> int:
+        """
+        Return the index of a string in the string table, add the string first if it's new.
+
+        Args:
+            value (str): The string.
+
+        Returns:
+            int: Index of the string.
+
+        Raises:
+            ValueError: The value isn't a string.
+        """
+
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string, got {value!r}")
+
+        return self.strings.setdefault(value, len(self.strings))
+
+    def add_item(self, item: str) -> int:
+        """
+        Return the index of an item name, add the item first if it's new.
+
+        Args:
+            item (str): Name of the item.
+
+        Returns:
+            int: Index of the item.
+
+        Raises:
+            ValueError: The item name isn't a string.
+        """
+
+        if not isinstance(item, str):
+            raise ValueError(f"Expected an item name, got {item!r}")
+
+        if item not in self.items:
+            self.items[item] = len(self.items)
+            self.add_string(item)
+
+        return self.items[item]
+
+    def add_integers(self, values: list[int]) -> int:
+        """
+        Add a list to the integer pool.
+
+        Args:
+            values (list[int]): Integers to add.
+
+        Returns:
+            int: Offset of the list in the pool.
+        """
+
+        offset = len(self.integers)
+
+        self.integers.append(len(values))
+        self.integers.extend(values)
+
+        return offset
+
+    def encode(self, value, kind: str) -> int:
+        """
+        Turn a value of the level file into its table entry.
+
+        Args:
+            value: Value to encode.
+            kind (str): Kind of the column (see TABLE_FIELDS).
+
+        Returns:
+            int: Table entry.
+
+        Raises:
+            ValueError: The value doesn't fit the kind.
+        """
+
+        if value is None:
+            return NONE
+
+        if kind == "int":
+            return check_int(value)
+
+        if kind == "bool":
+            return int(bool(value))
+
+        if kind == "string":
+            return self.add_string(value)
+
+        if kind == "text":
+            index = self.texts.add(value)
+
+            if type(index) is range:
+                return self.add_integers(list(index)) * 2 + 1
+
+            if type(index) is not int:
+                raise ValueError(f"Expected a string or a list of strings, got {value!r}")
+
+            return index * 2
+
+        if not isinstance(value, list):
+            raise ValueError(f"Expected a list, got {value!r}")
+
+        if kind == "ints":
+            return self.add_integers([check_int(integer) for integer in value])
+
+        return self.add_integers([self.add_item(item) for item in value])
+
+    def encode_table(self, dictionaries: list[dict], fields: tuple) -> array:
+        """
+        Encode objects of the level file into a fixed-width table.
+
+        Args:
+            dictionaries (list[dict]): Objects to encode.
+            fields (tuple): Columns of the table (see TABLE_FIELDS).
+
+        Returns:
+            array: The table, one row after another.
+
+        Raises:
+            ValueError: A required value is missing or a value doesn't fit its column.
+        """
+
+        table = array("i")
+
+        for dictionary in dictionaries:
+            for key, kind, required in fields:
+                if required and dictionary.get(key) is None:
+                    raise ValueError(f"Missing {key!r} in {dictionary!r}")
+
+                table.append(self.encode(dictionary.get(key), kind))
+
+        return table
+
+
+def create_adjacency(node_ids: list[int], adjacent: dict[int, list[int]]) -> tuple[array, array]:
+    """
+    Create the compressed adjacency lists of the nodes.
+
+    Args:
+        node_ids (list[int]): Sorted place IDs.
+        adjacent (dict[int, list[int]]): Place ID -> positions of the adjacent paths/actions.
+
+    Returns:
+        tuple[array, array]: Offset of every node's positions and one past the last at index 0, the positions at
+            index 1.
+    """
+
+    offsets = array("i", [0])
+    positions = array("i")
+
+    for node_id in node_ids:
+        positions.extend(adjacent.get(node_id, []))
+        offsets.append(len(positions))
+
+    return offsets, positions
+
+
+def compile_level(level: dict, source_stat_info: tuple[int, int] = (0, 0)) -> bytes:
+    """
+    Compile a level dictionary into a bundle.
+
+    Args:
+        level (dict): Parsed level data.
+        source_stat_info (tuple[int, int], optional): Modification time in nanoseconds and size of the level file,
+            used to detect a stale bundle. Default: (0, 0)
+
+    Returns:
+        bytes: Content of the bundle file.
+
+    Raises:
+        ValueError: The level contains a value the bundle can't store.
+    """
+
+    writer = BundleWriter()
+
+    places = level.get("places") or []
+    paths = level.get("paths") or []
+    actions = level.get("actions") or []
+
+    # items get their indexes in the same order a loaded level registers them, so both have the same item bits
+    for place in places:
+        for item in place.get("items") or []:
+            writer.add_item(item)
+
+    for path in paths:
+        for item in [*(path.get("required-items") or []), *(path.get("forbidden-items") or [])]:
+            writer.add_item(item)
+
+    sections = {
+        "level": writer.encode_table([level], LEVEL_FIELDS),
+        **{name: writer.encode_table(level.get(name) or [], fields) for name, fields in TABLE_FIELDS.items()},
+    }
+
+    # hook and action function names in the order they're referenced
+    function_names = [name for place in places for name in (place.get("call-before"), place.get("call-after"))]
+    function_names.extend(action.get("function") for action in actions)
+
+    sections["functions"] = array(
+        "i", [writer.add_string(name) for name in dict.fromkeys(function_names) if name is not None]
+    )
+    sections["items"] = array("i", [writer.strings[item] for item in writer.items])
+    sections["starting_places"] = array("i", [position for position, place in enumerate(places) if place.get("start")])
+
+    # every place ID that's defined or referenced gets a node, with the first place of that ID (as in loaded levels)
+    node_places = {}
+
+    for position, place in enumerate(places):
+        node_places.setdefault(place["id"], position)
+
+    adjacent_paths = {}
+    adjacent_actions = {}
+
+    for position, path in enumerate(paths):
+        for place_id in Path(path).get_start_place_ids():
+            adjacent_paths.setdefault(place_id, []).append(position)
+
+    for position, action in enumerate(actions):
+        for place_id in dict.fromkeys(action["places"]):
+            adjacent_actions.setdefault(place_id, []).append(position)
+
+    node_ids = sorted({*node_places, *adjacent_paths, *adjacent_actions})
+
+    sections["node_ids"] = array("i", node_ids)
+    sections["node_places"] = array("i", [node_places.get(node_id, NONE) for node_id in node_ids])
+    sections["node_paths"], sections["adjacent_paths"] = create_adjacency(node_ids, adjacent_paths)
+    sections["node_actions"], sections["adjacent_actions"] = create_adjacency(node_ids, adjacent_actions)
+
+    sections["integers"] = writer.integers
+
+    writer.texts.compress()
+
+    sections["text_offsets"] = writer.texts.offsets
+    sections["text_block_starts"] = writer.texts.block_starts
+    sections["text_block_offsets"] = writer.texts.block_offsets
+    sections["text_data"] = writer.texts.data
+
+    encoded_strings = [string.encode() for string in writer.strings]
+    string_offsets = array("I", [0])
+
+    for encoded_string in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded_string))
+
+    sections["string_offsets"] = string_offsets
+    sections["string_data"] = b"".join(encoded_strings)
+
+    # lay the sections out after the header and the section table
+    content = bytearray(HEADER.size + SECTION_TABLE.size)
+    section_table = []
+
+    for name in SECTION_NAMES:
+        content.extend(bytes(-len(content) % SECTION_ALIGNMENT))
+
+        data = sections[name]
+        data = data.tobytes() if isinstance(data, array) else data
+
+        section_table.extend((len(content), len(data)))
+        content.extend(data)
+
+    HEADER.pack_into(content, 0, BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, BYTE_ORDER_MARK, *source_stat_info)
+    SECTION_TABLE.pack_into(content, HEADER.size, *section_table)
+
+    return bytes(content)
+
+
+def compile_level_file(level_file_path: str | FilePath, bundle_file_path: str | FilePath | None = None) -> FilePath:
+    """
+    Compile a level file into a bundle. The bundle is written atomically, so running games never see a partial one.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+        bundle_file_path (str | FilePath | None, optional): Path to write the bundle to. None for the default one next
+            to the level file. Default: None
+
+    Returns:
+        FilePath: Path to the written bundle.
+
+    Raises:
+        ValueError: The level contains a value the bundle can't store.
+    """
+
+    # the compiler is only used offline, so the level loading code is imported here
+    from tempfile import NamedTemporaryFile
+
+    from mystics_and_manuscripts.level.cache import read_level_file, parse_level_content
+
+    content, key = read_level_file(level_file_path)
+    stat = os.stat(level_file_path)
+
+    bundle = compile_level(parse_level_content(level_file_path, content, key), (stat.st_mtime_ns, stat.st_size))
+
+    if bundle_file_path is None:
+        bundle_file_path = get_bundle_file_path(level_file_path)
+
+    bundle_file_path = FilePath(bundle_file_path)
+
+    with NamedTemporaryFile("wb", dir=bundle_file_path.parent, suffix=".tmp", delete=False) as f:
+        f.write(bundle)
+
+    os.replace(f.name, bundle_file_path)
+    return bundle_file_path
+
+
+class LevelBundle:
+    def __init__(self, bundle_file_path: str | FilePath):
+        """
+        Compiled level, memory-mapped read-only. The tables are viewed in place, without copying, so opening a bundle
+        takes the same time for any size of the level, and processes using the same bundle share its memory. Level
+        objects are decoded one at a time, when they're needed.
+
+        Args:
+            bundle_file_path (str | FilePath): Path to the bundle file.
+
+        Raises:
+            ValueError: The file isn't a bundle of this format version (or byte order).
+        """
+
+        self.file_path = FilePath(bundle_file_path)
+
+        with open(self.file_path, "rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            # (mtime in nanoseconds, size) of the level file the bundle was compiled from
+            self.source_stat_info = self.__read_header()
+        except ValueError:
+            self.__mmap.close()
+            raise
+
+        section_table = SECTION_TABLE.unpack_from(self.__mmap, HEADER.size)
+        view = memoryview(self.__mmap)
+
+        self.__sections = {}
+
+        for index, name in enumerate(SECTION_NAMES):
+            offset, length = section_table[index * 2], section_table[index * 2 + 1]
+            section = view[offset:offset + length]
+
+            if name in UNSIGNED_SECTION_NAMES:
+                section = section.cast("I")
+            elif name not in BYTE_SECTION_NAMES:
+                section = section.cast("i")
+
+            self.__sections[name] = section
+
+        self.__widths = {name: len(fields) for name, fields in TABLE_FIELDS.items()}
+
+        # prose stays compressed in the mapping, it's decoded when it's used
+        self.texts = TextStore(*(
+            self.__sections[name] for name in ("text_data", "text_offsets", "text_block_starts", "text_block_offsets")
+        ))
+
+        level = self.__decode_row(self.__sections["level"], 0, LEVEL_FIELDS)
+
+        self.name = level["name"]
+        self.introduction = level["introduction"]
+
+        # item names in the order their bits are registered in
+        self.item_names = [intern(self.get_string(index)) for index in self.__sections["items"]]
+
+    def __read_header(self) -> tuple[int, int]:
+        if len(self.__mmap) < HEADER.size + SECTION_TABLE.size:
+            raise ValueError(f"{self.file_path} is not a level bundle")
+
+        magic, version, byte_order_mark, mtime, size = HEADER.unpack_from(self.__mmap)
+
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{self.file_path} is not a level bundle")
+
+        if version != BUNDLE_FORMAT_VERSION or byte_order_mark != BYTE_ORDER_MARK:
+            raise ValueError(f"{self.file_path} was compiled for another format version or byte order, recompile it")
+
+        return mtime, size
+
+    def close(self) -> None:
+        """
+        Unmap the bundle. Objects decoded before stay valid, but their stored texts can't be decoded anymore.
+        """
+
+        for section in self.__sections.values():
+            section.release()
+
+        self.__mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def get_string(self, index: int) -> str:
+        """
+        Decode a string of the string table.
+
+        Args:
+            index (int): Index of the string.
+
+        Returns:
+            str: The string.
+        """
+
+        offsets = self.__sections["string_offsets"]
+        return str(self.__sections["string_data"][offsets[index]:offsets[index + 1]], "utf-8")
+
+    def __get_integers(self, offset: int) -> memoryview:
+        integers = self.__sections["integers"]
+        return integers[offset + 1:offset + 1 + integers[offset]]
+
+    def __decode(self, value: int, kind: str):
+        if value == NONE:
+            return None
+
+        if kind == "int":
+            return value
+
+        if kind == "bool":
+            return value == 1
+
+        if kind == "string":
+            return self.get_string(value)
+
+        if kind == "text":
+            if value % 2 == 0:
+                return value // 2
+
+            # the texts of a list are added one after another, so their indexes are a range
+            indexes = self.__get_integers(value // 2)
+            return range(indexes[0], indexes[0] + len(indexes)) if len(indexes) > 0 else range(0)
+
+        if kind == "ints":
+            return self.__get_integers(value).tolist()
+
+        return [self.item_names[index] for index in self.__get_integers(value)]
+
+    def __decode_row(self, table: memoryview, position: int, fields: tuple) -> dict:
+        start = position * len(fields)
+        row = table[start:start + len(fields)]
+
+        return {key: self.__decode(row[column], kind) for column, (key, kind, _) in enumerate(fields)}
+
+    def get_count(self, name: str) -> int:
+        """
+        Return the number of objects in a table.
+
+        Args:
+            name (str): Name of the table, "places", "paths", "actions" or "achievements".
+
+        Returns:
+            int: Number of objects.
+        """
+
+        return len(self.__sections[name]) // self.__widths[name]
+
+    def get_dict(self, name: str, position: int) -> dict:
+        """
+        Decode one object of a table into the dictionary it was compiled from.
+
+        Args:
+            name (str): Name of the table, "places", "paths", "actions" or "achievements".
+            position (int): Position of the object in the table (and the level file).
+
+        Returns:
+            dict: Object data, missing values are None and prose is an index (or a range of indexes) in
+                "texts".
+        """
+
+        return self.__decode_row(self.__sections[name], position, TABLE_FIELDS[name])
+
+    def get_function_names(self) -> list[str]:
+        """
+        Return names of hook and action functions the level refers to.
+
+        Returns:
+            list[str]: Names in the order they're referenced.
+        """
+
+        return [self.get_string(index) for index in self.__sections["functions"]]
+
+    def get_starting_places(self) -> list[int]:
+        """
+        Return positions of the starting places.
+
+        Returns:
+            list[int]: Positions in the "places" table.
+        """
+
+        return self.__sections["starting_places"].tolist()
+
+    def __find_node(self, place_id: int) -> int | None:
+        node_ids = self.__sections["node_ids"]
+        node = bisect_left(node_ids, place_id)
+
+        return node if node < len(node_ids) and node_ids[node] == place_id else None
+
+    def find_place(self, place_id: int) -> int | None:
+        """
+        Find the first place with an ID.
+
+        Args:
+            place_id (int): ID of the place.
+
+        Returns:
+            int | None: Position of the place in the "places" table, None if there's no such place.
+        """
+
+        node = self.__find_node(place_id)
+
+        if node is None or self.__sections["node_places"][node] == NONE:
+            return None
+
+        return self.__sections["node_places"][node]
+
+    def get_adjacent(self, name: str, place_id: int) -> list[int]:
+        """
+        Return positions of the paths that can be taken from a place, or of the actions available in it.
+
+        Args:
+            name (str): "paths" or "actions".
+            place_id (int): ID of the place.
+
+        Returns:
+            list[int]: Positions in the table, in the order the objects are defined in.
+        """
+
+        node = self.__find_node(place_id)
+
+        if node is None:
+            return []
+
+        offsets = self.__sections[f"node_{name}"]
+        return self.__sections[f"adjacent_{name}"][offsets[node]:offsets[node + 1]].tolist()
+
+    def get_manifest_dict(self) -> dict:
+        """
+        Return the top-level information of the level (see MANIFEST_KEYS).
+
+        Returns:
+            dict: Name, introduction and achievements.
+        """
+
+        achievements = [self.get_dict("achievements", position) for position in range(self.get_count("achievements"))]
+        introduction = resolve_text(self.introduction, self.texts)
+
+        return {"name": self.name, "introduction": introduction, "achievements": achievements}
+
+
+def open_bundle(level_path: str | FilePath) -> LevelBundle | None:
+    """
+    Open the bundle of a level. A bundle that's older than its level file, or was compiled for another format version
+    or byte order, is ignored with a warning, so the level is loaded from its level file.
+
+    Args:
+        level_path (str | FilePath): Path to a level yaml file or directly to a bundle.
+
+    Returns:
+        LevelBundle | None: The bundle or None if the level isn't compiled (or the bundle is stale).
+
+    Raises:
+        ValueError: The path points directly to a file that isn't a bundle of this format version (or byte order).
+    """
+
+    if is_bundle_file_path(level_path):
+        return LevelBundle(level_path)
+
+    bundle_file_path = get_bundle_file_path(level_path)
+
+    if not bundle_file_path.exists():
+        return None
+
+    try:
+        bundle = LevelBundle(bundle_file_path)
+    except ValueError as error:
+        warnings.warn(f"{error}; loading {level_path} instead")
+        return None
+
+    stat = os.stat(level_path)
+
+    if bundle.source_stat_info != (stat.st_mtime_ns, stat.st_size):
+        warnings.warn(f"{bundle_file_path} is older than {level_path} and is ignored, compile the level again")
+        bundle.close()
+        return None
+
+    return bundle
@@ -0,0 +1,231 @@
+import os
+import pickle
+import struct
+from datetime import date, datetime, timedelta, timezone
+from hashlib import blake2b
+from pathlib import Path as FilePath
+
+# name of the folder (next to the level file) holding cached level data, inspired by "__pycache__"
+CACHE_FOLDER_NAME = "__levelcache__"
+
+# bump this number whenever the cached data changes its shape, old cache files will be rebuilt
+CACHE_FORMAT_VERSION = 2
+
+# cache files start with a raw header, compared before anything is unpickled: magic bytes, format version, mtime and
+# size of the level file, and hashes of its content and absolute path
+CACHE_MAGIC = b"MMLC"
+CACHE_HEADER = struct.Struct("=4sIqq16s16s")
+
+# the only classes cached level data may contain (yaml timestamps), other yaml values don't need a class
+# note: anyone able to write to the cache folder could otherwise run code while a level loads
+CACHE_CLASSES = {(cls.__module__, cls.__qualname__): cls for cls in (date, datetime, timedelta, timezone)}
+
+
+# top-level keys of the level dictionary needed to list a level without loading it
+MANIFEST_KEYS = ("name", "introduction", "achievements")
+
+
+def parse_yaml(content: bytes):
+    """
+    Parse yaml with the fast C loader (libyaml), or the pure-Python one if PyYAML was installed without libyaml.
+
+    Args:
+        content (bytes): Yaml document.
+
+    Returns:
+        Parsed data.
+    """
+
+    # PyYAML is only imported when a cache is missing or stale, which speeds up the start of the game
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(content, Loader=loader)
+
+
+class CacheUnpickler(pickle.Unpickler):
+    """
+    Unpickler of cached level data, only the classes in CACHE_CLASSES can be loaded.
+    """
+
+    def find_class(self, module_name: str, name: str):
+        cls = CACHE_CLASSES.get((module_name, name))
+
+        if cls is None:
+            raise pickle.UnpicklingError(f"{module_name}.{name} is not allowed in a level cache")
+
+        return cls
+
+
+def get_cache_file_path(level_file_path: str | FilePath, kind: str = "level") -> FilePath:
+    """
+    Return the path of the cache file belonging to a level file.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+        kind (str, optional): Kind of the cached data, e.g. "level" or "manifest". Default: "level"
+
+    Returns:
+        FilePath: Path to the cache file.
+    """
+
+    level_file_path = FilePath(level_file_path)
+    return level_file_path.parent / CACHE_FOLDER_NAME / f"{level_file_path.name}.{kind}.pickle"
+
+
+def create_cache_key(level_file_path: str | FilePath, content: bytes, stat: os.stat_result) -> bytes:
+    """
+    Create a key identifying one exact version of a level file.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+        content (bytes): Raw content of the level file.
+        stat (os.stat_result): Stat info of the level file.
+
+    Returns:
+        bytes: Key, the header of the cache file (see CACHE_HEADER).
+    """
+
+    content_hash = blake2b(content, digest_size=16).digest()
+    path_hash = blake2b(os.fsencode(os.path.abspath(level_file_path)), digest_size=16).digest()
+
+    return CACHE_HEADER.pack(
+        CACHE_MAGIC, CACHE_FORMAT_VERSION, stat.st_mtime_ns, stat.st_size, content_hash, path_hash
+    )
+
+
+def read_cache(cache_file_path: FilePath, key: bytes):
+    """
+    Read cached data if the cache file exists and matches the key.
+
+    Args:
+        cache_file_path (FilePath): Path to the cache file.
+        key (bytes): Expected cache key.
+
+    Returns:
+        Cached data or None if the cache is missing or stale.
+    """
+
+    try:
+        with open(cache_file_path, "rb") as f:
+            # the key is compared as raw bytes, so a stale (or foreign) cache is never unpickled
+            if f.read(CACHE_HEADER.size) != key:
+                return None
+
+            return CacheUnpickler(f).load()
+    except Exception:
+        # a missing or damaged cache file can raise almost anything, it is simply rebuilt
+        return None
+
+
+def write_cache(cache_file_path: FilePath, key: bytes, data) -> None:
+    """
+    Atomically write data to a cache file. Failing to write the cache is not an error.
+
+    Args:
+        cache_file_path (FilePath): Path to the cache file.
+        key (bytes): Key of the cached data.
+        data: Data to cache.
+    """
+
+    # only needed when the cache is written, so it's imported here to speed up the start of the game
+    from tempfile import NamedTemporaryFile
+
+    temp_file_path = None
+
+    try:
+        cache_file_path.parent.mkdir(exist_ok=True)
+
+        # write into a temporary file first and swap it in, so no process can ever read a partial file
+        with NamedTemporaryFile("wb", dir=cache_file_path.parent, suffix=".tmp", delete=False) as f:
+            temp_file_path = f.name
+            f.write(key)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_file_path, cache_file_path)
+    except OSError:
+        # e.g. a read-only levels folder, the level still loads, just without the speed-up
+        if temp_file_path is not None and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+
+
+def read_level_file(level_file_path: str | FilePath) -> tuple[bytes, bytes]:
+    """
+    Read the raw content of a level file and create its cache key.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+
+    Returns:
+        tuple: Raw content at index 0 and the cache key at index 1.
+    """
+
+    with open(level_file_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        content = f.read()
+
+    return content, create_cache_key(level_file_path, content, stat)
+
+
+def parse_level_content(level_file_path: str | FilePath, content: bytes, key: tuple) -> dict:
+    """
+    Return the level dictionary of a level file's content, using the binary cache when it's up-to-date.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+        content (bytes): Raw content of the level file.
+        key (bytes): Cache key of the content.
+
+    Returns:
+        dict: Parsed level data.
+    """
+
+    cache_file_path = get_cache_file_path(level_file_path)
+    level_dict = read_cache(cache_file_path, key)
+
+    # the cache is missing or stale, rebuild it
+    if level_dict is None:
+        level_dict = parse_yaml(content)
+        write_cache(cache_file_path, key, level_dict)
+
+    return level_dict
+
+
+def load_level_dict(level_file_path: str | FilePath) -> dict:
+    """
+    Load the level dictionary from a level file, using the binary cache when it's up-to-date.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+
+    Returns:
+        dict: Parsed level data.
+    """
+
+    content, key = read_level_file(level_file_path)
+    return parse_level_content(level_file_path, content, key)
+
+
+def load_manifest_dict(level_file_path: str | FilePath) -> dict:
+    """
+    Load only the top-level information of a level (see MANIFEST_KEYS). It has its own small cache file, so listing
+    levels doesn't need to read their places, paths and actions.
+
+    Args:
+        level_file_path (str | FilePath): Path to the level yaml file.
+
+    Returns:
+        dict: Level dictionary limited to the manifest keys.
+    """
+
+    content, key = read_level_file(level_file_path)
+    cache_file_path = get_cache_file_path(level_file_path, "manifest")
+
+    manifest_dict = read_cache(cache_file_path, key)
+
+    if manifest_dict is None:
+        level_dict = parse_level_content(level_file_path, content, key)
+        manifest_dict = {key_name: level_dict.get(key_name) for key_name in MANIFEST_KEYS}
+        write_cache(cache_file_path, key, manifest_dict)
+
+    return manifest_dict
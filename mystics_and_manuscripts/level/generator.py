@@ -0,0 +1,391 @@
+import json
+import os
+from pathlib import Path as FilePath
+from random import Random
+
+# words the generated descriptions are made of
+WORDS = (
+    "ancient", "dusty", "narrow", "corridor", "torch", "shadow", "tapestry", "stone", "cold", "window", "tower",
+    "candle", "echo", "door", "stairs", "portrait", "silent", "knight", "banner", "floor", "ceiling", "crack",
+)
+
+# words the item names are made of, an adjective and a noun
+ITEM_ADJECTIVES = ("rusty", "golden", "silver", "broken", "old", "heavy", "tiny", "glowing")
+ITEM_NOUNS = ("key", "lantern", "rope", "dagger", "map", "coin", "ring", "scroll", "shield", "amulet")
+
+# every this many places one ends the game (and the last place always ends it with a win)
+ENDING_INTERVAL = 100
+
+# share of places with a first-time description
+FIRST_TIME_DESCRIPTION_SHARE = 0.2
+
+# share of item-gated paths forbidding the item instead of requiring it
+FORBIDDEN_ITEM_SHARE = 0.2
+
+# number of places a multi-destination path connects (at most)
+MAX_PATH_DESTINATIONS = 4
+
+# number of places an action is available in
+ACTION_PLACE_COUNT = 10
+
+# size of the write buffer, the level is written piece by piece
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def create_sentence(rng: Random, words: int) -> str:
+    """
+    Create a random sentence of the generated prose.
+
+    Args:
+        rng (Random): Random number generator.
+        words (int): Number of words.
+
+    Returns:
+        str: The sentence.
+    """
+
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def quote(value: str) -> str:
+    """
+    Quote a string for the level file. JSON strings are valid double-quoted yaml scalars, so no yaml library is needed.
+
+    Args:
+        value (str): String to quote.
+
+    Returns:
+        str: The quoted string.
+    """
+
+    return json.dumps(value, ensure_ascii=False)
+
+
+class LevelGenerator:
+    def __init__(self, place_count: int, branching_factor: float = 3.0, one_way_share: float = 0.05,
+                 multi_destination_share: float = 0.05, item_gating_share: float = 0.1, action_count: int = 1,
+                 achievement_count: int = 5, description_sentences: int = 3, seed: int = 0):
+        """
+        Generator of random levels of any size, for scale and stress testing. A corridor leads through all places from
+        the start (place 0) to a winning last place, so every place is reachable, ending places are dead ends next to
+        it. Random paths connect the places on top of it, some of them one-way, leading to several places or gated by
+        items. Every item can be picked up in a place of the corridor.
+
+        The level is written piece by piece while it's generated, nothing but the settings is kept in memory, so
+        levels with millions of places can be generated.
+
+        Args:
+            place_count (int): Number of places.
+            branching_factor (float, optional): Average number of paths leading from a place. The corridor alone makes
+                about 2. Default: 3.0
+            one_way_share (float, optional): Share of the random paths that are one-way. Default: 0.05
+            multi_destination_share (float, optional): Share of the random paths connecting more than two places, the
+                player is taken to one of them at random. Levels with fewer than 3 places have none. Default: 0.05
+            item_gating_share (float, optional): Share of the random paths that require (or forbid) an item.
+                Default: 0.1
+            action_count (int, optional): Number of actions, their functions are defined by the level script.
+                Default: 1
+            achievement_count (int, optional): Number of achievements, unlocked in places spread over the level.
+                Default: 5
+            description_sentences (int, optional): Average number of sentences of a place description, path
+                descriptions are about half as long. Default: 3
+            seed (int, optional): Seed of the random number generator, the same settings generate the same level.
+                Default: 0
+
+        Raises:
+            ValueError: A setting is out of its range.
+        """
+
+        if place_count < 2:
+            raise ValueError("A generated level needs at least 2 places")
+
+        for name, share in (("one-way", one_way_share), ("multi-destination", multi_destination_share),
+                            ("item gating", item_gating_share)):
+            if not 0 <= share <= 1:
+                raise ValueError(f"The {name} share must be between 0 and 1, not {share}")
+
+        if branching_factor < 0 or action_count < 0 or achievement_count < 0 or description_sentences < 1:
+            raise ValueError("The branching factor and the numbers of actions and achievements can't be negative, and "
+                             "descriptions need at least one sentence")
+
+        self.place_count = place_count
+        self.branching_factor = branching_factor
+        self.one_way_share = one_way_share
+        self.multi_destination_share = multi_destination_share
+        self.item_gating_share = item_gating_share
+        self.action_count = action_count
+        self.achievement_count = min(achievement_count, place_count)
+        self.description_sentences = description_sentences
+        self.seed = seed
+
+        # item names are unique combinations of the words, one item for about every 20 places
+        self.item_count = min(len(ITEM_ADJECTIVES) * len(ITEM_NOUNS), max(1, place_count // 20))
+
+        # two-way paths lead from both of their places, the corridor is counted in
+        self.random_path_count = max(0, round(place_count * branching_factor / 2) - (place_count - 1))
+
+    @property
+    def path_count(self) -> int:
+        """int: Number of paths, the corridor and the random ones."""
+
+        return self.place_count - 1 + self.random_path_count
+
+    @staticmethod
+    def get_item_name(item_index: int) -> str:
+        """
+        Return the name of an item.
+
+        Args:
+            item_index (int): Index of the item.
+
+        Returns:
+            str: Name of the item, e.g. "Rusty key".
+        """
+
+        adjective = ITEM_ADJECTIVES[item_index % len(ITEM_ADJECTIVES)]
+        noun = ITEM_NOUNS[item_index // len(ITEM_ADJECTIVES)]
+
+        return f"{adjective} {noun}".capitalize()
+
+    def is_ending_place(self, place_id: int) -> bool:
+        """
+        Check if a place ends the game.
+
+        Args:
+            place_id (int): ID of the place.
+
+        Returns:
+            bool: True for the last place and every ENDING_INTERVAL-th one.
+        """
+
+        return place_id == self.place_count - 1 or place_id % ENDING_INTERVAL == ENDING_INTERVAL - 1
+
+    def get_item_place_id(self, item_index: int) -> int:
+        """
+        Return the ID of the place where an item can be picked up. Items are spread evenly along the corridor, outside
+        of the ending places.
+
+        Args:
+            item_index (int): Index of the item.
+
+        Returns:
+            int: ID of the place.
+        """
+
+        place_id = 1 + item_index * (self.place_count - 2) // self.item_count
+
+        # the place before an ending one never ends the game
+        return place_id - 1 if self.is_ending_place(place_id) else place_id
+
+    def get_achievement_place_id(self, achievement_id: int) -> int:
+        """
+        Return the ID of the place unlocking an achievement. Achievements are spread evenly over the places.
+
+        Args:
+            achievement_id (int): ID of the achievement.
+
+        Returns:
+            int: ID of the place.
+        """
+
+        return (achievement_id * 2 + 1) * self.place_count // (self.achievement_count * 2)
+
+    def create_description(self, rng: Random, sentences: int) -> str:
+        """
+        Create a random description.
+
+        Args:
+            rng (Random): Random number generator.
+            sentences (int): Average number of sentences.
+
+        Returns:
+            str: The description.
+        """
+
+        sentence_count = rng.randint(max(1, sentences - 1), sentences + 1)
+        return " ".join(create_sentence(rng, rng.randint(8, 16)) for _ in range(sentence_count))
+
+    def write_places(self, file, rng: Random) -> None:
+        """
+        Write the places.
+
+        Args:
+            file: Text file to write to.
+            rng (Random): Random number generator.
+        """
+
+        # places holding items and unlocking achievements, they're looked up for every place
+        item_indexes = {}  # place ID -> list of item indexes
+
+        for item_index in range(self.item_count):
+            item_indexes.setdefault(self.get_item_place_id(item_index), []).append(item_index)
+
+        achievement_ids = {
+            self.get_achievement_place_id(achievement_id): achievement_id
+            for achievement_id in range(self.achievement_count)
+        }
+
+        file.write("places:\n")
+
+        for place_id in range(self.place_count):
+            lines = [
+                f"  - id: {place_id}\n",
+                f"    name: {quote(f'Room {place_id}')}\n",
+                f"    description: {quote(self.create_description(rng, self.description_sentences))}\n",
+            ]
+
+            if place_id == 0:
+                lines.append("    start: true\n")
+            elif place_id == self.place_count - 1:
+                lines.append("    end: win\n")
+            elif self.is_ending_place(place_id):
+                lines.append(f"    end: {rng.choice(['win', 'loss', 'draw'])}\n")
+
+            if rng.random() < FIRST_TIME_DESCRIPTION_SHARE:
+                lines.append(f"    first-time-description: {quote(create_sentence(rng, 10))}\n")
+
+            if place_id in item_indexes:
+                items = ", ".join(quote(self.get_item_name(item_index)) for item_index in item_indexes[place_id])
+                lines.append(f"    items: [ {items} ]\n")
+
+            if place_id in achievement_ids:
+                lines.append(f"    achievement-id: {achievement_ids[place_id]}\n")
+
+            file.write("".join(lines))
+
+    def write_paths(self, file, rng: Random) -> None:
+        """
+        Write the paths, the corridor first. The corridor leads into ending places and around them.
+
+        Args:
+            file: Text file to write to.
+            rng (Random): Random number generator.
+        """
+
+        path_sentences = max(1, self.description_sentences // 2)
+
+        file.write("\npaths:\n")
+
+        for place_id in range(self.place_count - 1):
+            if self.is_ending_place(place_id):
+                continue
+
+            next_place_ids = [place_id + 1]
+
+            if self.is_ending_place(place_id + 1) and place_id + 2 < self.place_count:
+                next_place_ids.append(place_id + 2)
+
+            for next_place_id in next_place_ids:
+                file.write(
+                    f"  - places: [ {place_id}, {next_place_id} ]\n"
+                    f"    name: {quote(f'Go to room {next_place_id}')}\n"
+                    f"    description: {quote(self.create_description(rng, path_sentences))}\n"
+                )
+
+        for _ in range(self.random_path_count):
+            # the share is drawn for small levels too, so that they keep the rest of their random choices
+            if rng.random() < self.multi_destination_share and self.place_count > 2:
+                destination_count = rng.randint(3, min(MAX_PATH_DESTINATIONS, self.place_count))
+                name = "Take the crossroads"
+            else:
+                destination_count = 2
+                name = None
+
+            place_ids = rng.sample(range(self.place_count), destination_count)
+
+            lines = [
+                f"  - places: [ {', '.join(map(str, place_ids))} ]\n",
+                f"    name: {quote(name if name is not None else f'Take the stairs to room {place_ids[1]}')}\n",
+                f"    description: {quote(self.create_description(rng, path_sentences))}\n",
+            ]
+
+            if rng.random() < self.one_way_share:
+                lines.append(f"    one-way: true\n    one-way-start: [ {place_ids[0]} ]\n")
+
+            if rng.random() < self.item_gating_share:
+                key = "forbidden-items" if rng.random() < FORBIDDEN_ITEM_SHARE else "required-items"
+                lines.append(f"    {key}: [ {quote(self.get_item_name(rng.randrange(self.item_count)))} ]\n")
+                lines.append("    items-hint: true\n")
+
+            file.write("".join(lines))
+
+    def write_level_file(self, file) -> None:
+        """
+        Write the level.
+
+        Args:
+            file: Text file to write to.
+        """
+
+        rng = Random(self.seed)
+
+        file.write(f"name: {quote(f'Generated level ({self.place_count} places, seed {self.seed})')}\n")
+        file.write(f"introduction: {quote(create_sentence(rng, 20))}\n\n")
+
+        self.write_places(file, rng)
+        self.write_paths(file, rng)
+
+        if self.action_count > 0:
+            file.write("\nactions:\n")
+
+            for action_index in range(self.action_count):
+                place_ids = rng.sample(range(self.place_count), min(self.place_count, ACTION_PLACE_COUNT))
+                file.write(
+                    f"  - name: {quote(f'Search the room ({action_index})')}\n"
+                    f"    places: [ {', '.join(map(str, place_ids))} ]\n"
+                    f"    function: action_{action_index}\n"
+                )
+
+        if self.achievement_count > 0:
+            file.write("\nachievements:\n")
+
+            for achievement_id in range(self.achievement_count):
+                file.write(
+                    f"  - id: {achievement_id}\n"
+                    f"    name: {quote(f'Achievement {achievement_id}')}\n"
+                    f"    description: {quote(create_sentence(rng, 6))}\n"
+                )
+
+    def create_script(self) -> str:
+        """
+        Create the level script, defining the functions of the actions.
+
+        Returns:
+            str: Source code of the script.
+        """
+
+        functions = [
+            f"def action_{action_index}(game):\n"
+            f"    return {quote(f'You search the room ({action_index}), but there is nothing more to find.')}\n"
+            for action_index in range(self.action_count)
+        ]
+
+        return "\n\n".join(["# generated by \"python -m mystics_and_manuscripts.level generate\"\n", *functions])
+
+    def write(self, folder_path: str | FilePath, write_script: bool = True) -> FilePath:
+        """
+        Write the level file (and the script) into a folder. The level file is written atomically.
+
+        Args:
+            folder_path (str | FilePath): Folder of the level, created if it doesn't exist.
+            write_script (bool, optional): True to write the level script as well. Levels with actions need it.
+                Default: True
+
+        Returns:
+            FilePath: Path to the level file.
+        """
+
+        folder_path = FilePath(folder_path)
+        folder_path.mkdir(parents=True, exist_ok=True)
+
+        level_file_path = folder_path / "level.yaml"
+        temporary_file_path = level_file_path.with_suffix(".tmp")
+
+        with open(temporary_file_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as file:
+            self.write_level_file(file)
+
+        if write_script:
+            (folder_path / "level.py").write_text(self.create_script(), encoding="utf-8")
+
+        os.replace(temporary_file_path, level_file_path)
+        return level_file_path
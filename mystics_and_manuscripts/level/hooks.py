@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from types import ModuleType
+
+# name of the hook called when a play-through starts
+ON_START_HOOK = "on_start"
+
+
+def hook(name_or_function: str | Callable | None = None):
+    """
+    Register a level script function as a hook, under its own name or a custom one. Use as "@hook" or
+    "@hook("custom-name")". Undecorated functions of the script can be used as hooks as well, under their names.
+
+    Args:
+        name_or_function (str | Callable | None, optional): Name of the hook, or the decorated function when used
+            without arguments. Default: None
+
+    Returns:
+        The decorated function, or a decorator when a name is given.
+    """
+
+    def register(function: Callable, name: str | None = None) -> Callable:
+        function.hook_name = name if name is not None else function.__name__
+        return function
+
+    if callable(name_or_function):
+        return register(name_or_function)
+
+    return lambda function: register(function, name_or_function)
+
+
+class HookTable:
+    def __init__(self, level_script: ModuleType | None = None):
+        """
+        Hook and action functions of a level script, resolved once by their names. Names stored in the level (e.g.
+        "call-after") are looked up on every call, so changing them at runtime keeps working.
+
+        Args:
+            level_script (ModuleType | None, optional): The level script module, None for levels without one.
+                Default: None
+        """
+
+        self.functions = {}  # name -> function
+
+        if level_script is None:
+            return
+
+        registered = {}
+
+        for name, value in vars(level_script).items():
+            if not callable(value):
+                continue
+
+            # functions registered by the decorator take precedence over functions found by their name
+            if hasattr(value, "hook_name"):
+                registered[value.hook_name] = value
+            elif getattr(value, "__module__", None) == level_script.__name__:
+                self.functions[name] = value
+
+        self.functions.update(registered)
+
+    def get(self, name: str | None) -> Callable | None:
+        """
+        Return the function registered under a name.
+
+        Args:
+            name (str | None): Name of the hook or action function.
+
+        Returns:
+            Callable | None: The function or None if there's none (or no name).
+        """
+
+        return self.functions.get(name) if name is not None else None
+
+    def find_missing(self, level) -> list[str]:
+        """
+        Return names of hook and action functions the level was loaded with, but the script doesn't define.
+
+        Args:
+            level (Level): Level to check.
+
+        Returns:
+            list[str]: Missing names in the order they're referenced.
+        """
+
+        return [name for name in level.get_function_names() if name not in self.functions]
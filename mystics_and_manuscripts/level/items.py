@@ -0,0 +1,150 @@
+from sys import intern
+
+
+class ItemRegistry:
+    def __init__(self):
+        """
+        Interned item names of a level, each one is given its own bit so that sets of items can be stored as integers.
+        """
+
+        self.bits = {}  # item name -> bit (a power of two)
+
+    def get_bit(self, item: str) -> int:
+        """
+        Return the bit of an item, register the item first if it's new.
+
+        Args:
+            item (str): Name of the item.
+
+        Returns:
+            int: Bit of the item.
+        """
+
+        bit = self.bits.get(item)
+
+        if bit is None:
+            bit = 1 << len(self.bits)
+            self.bits[intern(item)] = bit
+
+        return bit
+
+    def get_mask(self, items) -> int:
+        """
+        Turn item names into a bit mask.
+
+        Args:
+            items: Names of the items.
+
+        Returns:
+            int: Bit mask with the bits of all the items set.
+        """
+
+        mask = 0
+
+        for item in items:
+            mask |= self.get_bit(item)
+
+        return mask
+
+    def filter_items(self, items, mask: int) -> list[str]:
+        """
+        Return the items whose bits are set in a mask, in their original order.
+
+        Args:
+            items: Names of the items.
+            mask (int): Bit mask to filter by.
+
+        Returns:
+            list[str]: Names of the items in the mask.
+        """
+
+        return [item for item in items if self.get_bit(item) & mask]
+
+
+class Inventory:
+    def __init__(self, registry: ItemRegistry, items=()):
+        """
+        Items held by the player, stored as a bit mask. It behaves like a list of item names (in the order they were
+        acquired) for level scripts, but every item can only be held once.
+
+        Args:
+            registry (ItemRegistry): Registry of the level's items.
+            items (optional): Items to start with. Default: ()
+        """
+
+        self.registry = registry
+        self.mask = 0
+        self.__items = []  # names in the order they were acquired
+
+        self.extend(items)
+
+    def __contains__(self, item) -> bool:
+        bit = self.registry.bits.get(item)
+        return bit is not None and self.mask & bit != 0
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __getitem__(self, index):
+        return self.__items[index]
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(self.__items)
+
+    def append(self, item: str) -> None:
+        """
+        Add an item, unless it's already held.
+
+        Args:
+            item (str): Name of the item.
+        """
+
+        bit = self.registry.get_bit(item)
+
+        if self.mask & bit:
+            return
+
+        self.mask |= bit
+        self.__items.append(item)
+
+    def extend(self, items) -> None:
+        """
+        Add multiple items.
+
+        Args:
+            items: Names of the items.
+        """
+
+        for item in items:
+            self.append(item)
+
+    def remove(self, item: str) -> None:
+        """
+        Remove an item.
+
+        Args:
+            item (str): Name of the item.
+
+        Raises:
+            ValueError: The item isn't held.
+        """
+
+        if item not in self:
+            raise ValueError(f"{item!r} is not in the inventory")
+
+        self.mask &= ~self.registry.get_bit(item)
+        self.__items.remove(item)
+
+    def clear(self) -> None:
+        """
+        Remove all items.
+        """
+
+        self.mask = 0
+        self.__items.clear()
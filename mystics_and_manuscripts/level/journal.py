@@ -0,0 +1,458 @@
+import copy
+from types import MemberDescriptorType
+
+# marks an attribute that didn't exist before it was changed
+MISSING = object()
+
+# class -> names of its slots, including the inherited ones, as they're stored (i.e. with private names mangled)
+_slot_names = {}
+
+
+def get_slot_names(cls: type) -> tuple[str, ...]:
+    """
+    Return the names of the slots of a class.
+
+    Args:
+        cls (type): The class.
+
+    Returns:
+        tuple[str, ...]: Names of the slots declared by the class and its bases.
+    """
+
+    names = _slot_names.get(cls)
+
+    if names is None:
+        names = tuple(
+            name for klass in cls.__mro__ for name, value in vars(klass).items()
+            if isinstance(value, MemberDescriptorType)
+        )
+        _slot_names[cls] = names
+
+    return names
+
+
+class Journal:
+    def __init__(self):
+        """
+        Record of the original values of everything changed in a level since it was loaded (or last reset), and of
+        the values at the last mark, so that the changes made after the mark can be taken apart.
+        """
+
+        # (id of the changed object, attribute name or None for list contents) -> (object, attribute, original value)
+        self.originals = {}
+
+        # the same for the changes since the last mark (see "take_marked_changes"), with the values at the mark
+        self.marked = {}
+
+        # functions called with the changed object and attribute name after every change (and every undone change)
+        self.listeners = []
+
+    def __len__(self) -> int:
+        return len(self.originals)
+
+    def record_attribute(self, target, attribute: str) -> None:
+        """
+        Remember the original value of an attribute (and its value at the mark) before it gets changed for the first
+        time.
+
+        Args:
+            target: Object whose attribute is about to change.
+            attribute (str): Name of the attribute.
+        """
+
+        key = (id(target), attribute)
+
+        if key not in self.marked:
+            value = getattr(target, attribute, MISSING)
+            self.marked[key] = (target, attribute, value)
+
+            if key not in self.originals:
+                self.originals[key] = (target, attribute, value)
+
+    def record_list(self, target: list) -> None:
+        """
+        Remember the original content of a list (and its content at the mark) before it gets changed for the first
+        time.
+
+        Args:
+            target (list): List that is about to change.
+        """
+
+        key = (id(target), None)
+
+        if key not in self.marked:
+            content = list(target)
+            self.marked[key] = (target, None, content)
+
+            if key not in self.originals:
+                self.originals[key] = (target, None, content)
+
+    def notify(self, target, attribute: str | None) -> None:
+        """
+        Let the listeners know that an object changed.
+
+        Args:
+            target: Changed object.
+            attribute (str | None): Name of the changed attribute.
+        """
+
+        for listener in self.listeners:
+            listener(target, attribute)
+
+    def reset(self) -> None:
+        """
+        Restore every changed object to its original state. Only the changed objects are touched.
+        """
+
+        originals = list(self.originals.values())
+        self.originals.clear()
+        self.marked.clear()
+
+        for target, attribute, original in originals:
+            # the object methods are used directly, so that restoring the values doesn't record them again
+            if attribute is None:
+                target.restore(original)
+                continue
+
+            if original is MISSING:
+                object.__delattr__(target, attribute)
+            else:
+                object.__setattr__(target, attribute, original)
+
+            self.notify(target, attribute)
+
+    def set_value(self, target, attribute: str | None, value) -> None:
+        """
+        Change an attribute of an object, or the content of a list, and record the change.
+
+        Args:
+            target: The object, or the list.
+            attribute (str | None): Name of the attribute, None to replace the content of the list.
+            value: The new value or content, MISSING to delete the attribute. Plain lists are copied, so states
+                never share them.
+        """
+
+        if attribute is None:
+            self.record_list(target)
+            target.restore(value)
+            return
+
+        self.record_attribute(target, attribute)
+
+        if value is MISSING:
+            object.__delattr__(target, attribute)
+        else:
+            object.__setattr__(target, attribute, list(value) if type(value) is list else value)
+
+        self.notify(target, attribute)
+
+    def mark(self) -> None:
+        """
+        Set a new mark, forgetting the changes made since the last one.
+        """
+
+        self.marked = {}
+
+    def take_marked_changes(self) -> list[tuple]:
+        """
+        Return the changes since the last mark and set a new mark. Nothing is marked before the first call (or after a
+        reset), so the first call returns all the changes.
+
+        Returns:
+            list[tuple]: Changes as (object, attribute or None for list contents, value at the mark, current value).
+                Lists are copied.
+        """
+
+        changes = []
+
+        for target, attribute, before in self.marked.values():
+            if attribute is None:
+                changes.append((target, None, before, list(target)))
+                continue
+
+            after = getattr(target, attribute, MISSING)
+
+            # changed and changed back
+            if after is before:
+                continue
+
+            changes.append((target, attribute, before, list(after) if type(after) is list else after))
+
+        self.mark()
+
+        return changes
+
+    def undo_marked_changes(self) -> None:
+        """
+        Undo the changes since the last mark. Only the changed objects are touched.
+        """
+
+        for target, attribute, before in list(self.marked.values()):
+            self.set_value(target, attribute, before)
+
+        self.mark()
+
+
+class ChangeSet:
+    __slots__ = ("changes", "parent", "depth")
+
+    def __init__(self, changes: list[tuple], parent: "ChangeSet | None" = None):
+        """
+        Changes of a level made on top of another change set, or on top of the loaded level. Change sets form a tree,
+        e.g. the changes of a play-through before it was forked are the parent of the changes of both forks.
+
+        Args:
+            changes (list[tuple]): Changes from "Journal.take_marked_changes".
+            parent (ChangeSet | None, optional): Change set the changes were made on top of, None for the loaded level.
+                Default: None
+        """
+
+        self.changes = changes
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+
+    def undo(self, journal: Journal) -> None:
+        """
+        Bring the level from the state of this change set to the state of its parent.
+
+        Args:
+            journal (Journal): Journal of the level, records the undone changes.
+        """
+
+        for target, attribute, before, _ in self.changes:
+            journal.set_value(target, attribute, before)
+
+    def redo(self, journal: Journal) -> None:
+        """
+        Bring the level from the state of the parent to the state of this change set.
+
+        Args:
+            journal (Journal): Journal of the level, records the changes.
+        """
+
+        for target, attribute, _, after in self.changes:
+            journal.set_value(target, attribute, after)
+
+
+class TrackedList(list):
+    """
+    List reporting its changes to a journal.
+    """
+
+    # the journal, and the object and attribute name the list is stored in, used when notifying the journal's listeners
+    __slots__ = ("_journal", "_owner", "_attribute")
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+
+        self._journal = None
+        self._owner = None
+        self._attribute = None
+
+    def __reduce__(self):
+        # the content is passed to the constructor, so restoring a pickled list isn't recorded or reported as a change
+        slot_state = {name: getattr(self, name) for name in get_slot_names(type(self))}
+        return type(self), (list(self),), (None, slot_state)
+
+    def __deepcopy__(self, memo):
+        # a tracked list is a part of its level, like the level objects (see "TrackedObject.__deepcopy__")
+        if self._journal is not None:
+            return self
+
+        copied_list = type(self)(copy.deepcopy(list(self), memo))
+        memo[id(self)] = copied_list
+
+        return copied_list
+
+    def track(self, journal: Journal, owner=None, attribute: str | None = None) -> None:
+        """
+        Start reporting changes to a journal.
+
+        Args:
+            journal (Journal): Journal to report to.
+            owner (optional): Object the list is stored in. Default: None
+            attribute (str | None, optional): Name of the attribute the list is stored in. Default: None
+        """
+
+        self._journal = journal
+        self._owner = owner
+        self._attribute = attribute
+
+    def _record(self):
+        if self._journal is not None:
+            self._journal.record_list(self)
+
+    def _changed(self, added=(), removed=(), reordered: bool = False):
+        """
+        Called after every change with the appended and removed items. Changes that can't be described by appending
+        and removing items are reported as reordered.
+        """
+
+        if self._journal is not None:
+            self._journal.notify(self._owner, self._attribute)
+
+    def restore(self, original: list) -> None:
+        """
+        Replace the content of the list without recording it.
+
+        Args:
+            original (list): Content to restore.
+        """
+
+        current = list(self)
+        list.__setitem__(self, slice(None), original)
+
+        # the most common change is appending items, so restoring means just removing them
+        if current[:len(original)] == original:
+            self._changed(removed=current[len(original):])
+        else:
+            self._changed(reordered=True)
+
+    def append(self, item):
+        self._record()
+        super().append(item)
+        self._changed(added=(item,))
+
+    def extend(self, items):
+        self._record()
+        items = list(items)
+        super().extend(items)
+        self._changed(added=items)
+
+    def insert(self, index, item):
+        self._record()
+        super().insert(index, item)
+        self._changed(reordered=True)
+
+    def pop(self, index=-1):
+        self._record()
+        item = super().pop(index)
+        self._changed(removed=(item,))
+        return item
+
+    def remove(self, item):
+        self._record()
+        item = self[self.index(item)]
+        super().remove(item)
+        self._changed(removed=(item,))
+
+    def clear(self):
+        self._record()
+        super().clear()
+        self._changed(reordered=True)
+
+    def sort(self, *args, **kwargs):
+        self._record()
+        super().sort(*args, **kwargs)
+        self._changed(reordered=True)
+
+    def reverse(self):
+        self._record()
+        super().reverse()
+        self._changed(reordered=True)
+
+    def __setitem__(self, index, value):
+        self._record()
+        super().__setitem__(index, value)
+        self._changed(reordered=True)
+
+    def __delitem__(self, index):
+        self._record()
+
+        if isinstance(index, slice):
+            super().__delitem__(index)
+            self._changed(reordered=True)
+            return
+
+        item = self[index]
+        super().__delitem__(index)
+        self._changed(removed=(item,))
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, times):
+        self._record()
+        super().__imul__(times)
+        self._changed(reordered=True)
+        return self
+
+
+class ObservedList(TrackedList):
+    """
+    Tracked list passing the details of its changes to a callback, so that indexes over it can be updated in place.
+    """
+
+    __slots__ = ("on_change",)
+
+    def __init__(self, iterable=(), on_change=None):
+        super().__init__(iterable)
+
+        # function called with the list, added items, removed items and the reordered flag
+        self.on_change = on_change
+
+    def _changed(self, added=(), removed=(), reordered: bool = False):
+        if self.on_change is not None:
+            self.on_change(self, added, removed, reordered)
+
+
+class TrackedObject:
+    """
+    Base for level objects, reporting changes of their attributes to a journal. Level objects store their attributes in
+    "__slots__" rather than a "__dict__", as big levels have hundreds of thousands of them.
+    """
+
+    __slots__ = ("_journal",)
+
+    def __new__(cls, *args, **kwargs):
+        level_object = super().__new__(cls)
+
+        # set here rather than in "__init__", so subclasses don't need to call it and unpickled objects have it too
+        object.__setattr__(level_object, "_journal", None)
+
+        return level_object
+
+    def __setstate__(self, state):
+        # restoring a pickled object isn't a change, so the attributes are set without recording them
+        dict_state, slot_state = state if isinstance(state, tuple) else (state, None)
+
+        for name, value in [*(dict_state or {}).items(), *(slot_state or {}).items()]:
+            object.__setattr__(self, name, value)
+
+    def __deepcopy__(self, memo):
+        # level objects belong to their level, so deep copies of values referring to them (e.g. script globals copied
+        # for a fork) refer to the same objects
+        return self
+
+    def __setattr__(self, name, value):
+        journal = self._journal
+
+        # properties are skipped, the attribute they set underneath gets recorded instead
+        if journal is None or isinstance(getattr(type(self), name, None), property):
+            object.__setattr__(self, name, value)
+            return
+
+        journal.record_attribute(self, name)
+        object.__setattr__(self, name, value)
+        journal.notify(self, name)
+
+    def attach_journal(self, journal: Journal) -> None:
+        """
+        Start reporting changes to a journal. Lists stored in the attributes are tracked as well.
+
+        Args:
+            journal (Journal): Journal to report to.
+        """
+
+        object.__setattr__(self, "_journal", journal)
+
+        for name in [*get_slot_names(type(self)), *getattr(self, "__dict__", ())]:
+            value = getattr(self, name, None)
+
+            if isinstance(value, TrackedList):
+                value.track(journal, self, name)
+            elif type(value) is list:
+                tracked_list = TrackedList(value)
+                tracked_list.track(journal, self, name)
+                object.__setattr__(self, name, tracked_list)
@@ -0,0 +1,25 @@
+from pathlib import Path as FilePath
+
+from mystics_and_manuscripts.level.achievement import Achievement
+from mystics_and_manuscripts.utils import mirror_or_empty
+
+
+class LevelManifest:
+    def __init__(self, manifest: dict, path_to_level: str):
+        """
+        Lightweight description of a level, enough to list it in menus without building the whole level.
+
+        Args:
+            manifest (dict): Top-level data of the level (name, introduction and achievements).
+            path_to_level (str): Path to the level's file.
+        """
+
+        self.name = manifest["name"]
+        self.introduction = manifest.get("introduction")
+        self.achievements = mirror_or_empty(manifest, "achievements", Achievement)
+
+        self.level_file_path = FilePath(path_to_level)
+        self.folder_path = self.level_file_path.parent
+
+        # note: adding a file/sub-folder to a pathlib "Path" is done using a slash
+        self.achievements_file_path = self.folder_path / "achievements.json"
@@ -1,37 +1,68 @@
 from random import choice
 
 from mystics_and_manuscripts.level.achievement import Achievement
-from mystics_and_manuscripts.utils import value_or_default
+from mystics_and_manuscripts.level.journal import TrackedObject
+from mystics_and_manuscripts.level.texts import TextStore, keep_text, resolve_text
+from mystics_and_manuscripts.utils import intern_text, value_or_default
 
 
-class Path:
-    def __init__(self, path: dict):
+class Path(TrackedObject):
+    __slots__ = (
+        "places", "name", "__description", "__first_time_description", "one_way", "one_way_start", "disable_go_back",
+        "required_items", "forbidden_items", "items_hint", "achievement_id", "visited", "_text_store",
+    )
+
+    def __init__(self, path: dict, text_store: TextStore | None = None):
         """
         A class mirror of the path dictionary.
 
         Args:
             path (dict): Path data used in this object.
+            text_store (TextStore | None, optional): Store to keep the descriptions in, they're decoded when they're
+                used. Descriptions of a compiled level (see "level.bundle") are indexes in its store already. None to
+                keep them as they are. Default: None
         """
 
-        self.places = path["places"]
+        # descriptions set later (e.g. by scripts) are kept as they are
+        self._text_store = text_store
+
+        # the connections and item requirements don't change in play, so they're stored as tuples and a frozenset,
+        # scripts replace them instead
+        self.places = tuple(path["places"])
 
-        self.name = value_or_default(path, "name", "Unnamed path")
-        self.__description = path.get("description")
-        self.first_time_description = path.get("first-time-description")
+        self.name = intern_text(value_or_default(path, "name", "Unnamed path"))
+        self.__description = keep_text(path.get("description"), text_store)
+        self.__first_time_description = keep_text(path.get("first-time-description"), text_store)
 
         self.one_way = value_or_default(path, "one-way", False)
-        self.one_way_start = path.get("one-way-start")
+        self.one_way_start = frozenset(path["one-way-start"]) if path.get("one-way-start") is not None else None
 
         self.disable_go_back = value_or_default(path, "disable-go-back", False)
 
-        self.required_items = value_or_default(path, "required-items", [])
-        self.forbidden_items = value_or_default(path, "forbidden-items", [])
+        self.required_items = intern_text(value_or_default(path, "required-items", []))
+        self.forbidden_items = intern_text(value_or_default(path, "forbidden-items", []))
         self.items_hint = value_or_default(path, "items-hint", False)
 
         self.achievement_id = path.get("achievement-id")
 
         self.visited = False
 
+    def get_start_place_ids(self) -> list[int]:
+        """
+        Return IDs of places this path can be taken from.
+
+        Returns:
+            list[int]: IDs of all connected places, or only the starting places of a one-way path.
+        """
+
+        place_ids = list(dict.fromkeys(self.places))
+
+        if not self.one_way:
+            return place_ids
+
+        one_way_start = self.one_way_start if self.one_way_start is not None else []
+        return [place_id for place_id in place_ids if place_id in one_way_start]
+
     @property
     def description(self):
         """str: Chosen description depending on context."""
@@ -41,25 +72,41 @@ class Path:
             return "You walk along a path."
 
         # check for a first-time description
-        if not self.visited and self.first_time_description is not None:
-            return self.first_time_description
+        if not self.visited:
+            first_time_description = self.first_time_description
+
+            if first_time_description is not None:
+                return first_time_description
+
+        # descriptions in a text store are decoded now
+        description = resolve_text(self.__description, self._text_store)
 
         # account for multiple descriptions
-        if isinstance(self.__description, list):
-            return choice(self.__description)
+        if isinstance(description, (list, tuple)):
+            return choice(description)
 
-        return self.__description
+        return description
 
     @description.setter
     def description(self, value: str | list | None):
         self.__description = value
 
+    @property
+    def first_time_description(self) -> str | None:
+        """str | None: Description used instead of the usual one until the path is visited."""
+
+        return resolve_text(self.__first_time_description, self._text_store)
+
+    @first_time_description.setter
+    def first_time_description(self, value: str | None):
+        self.__first_time_description = value
+
     # this is a neat trick to allow for dict type casting
     # (https://stackoverflow.com/a/35282286/16343968)
     def __iter__(self):
         yield "places", self.places
         yield "name", self.name
-        yield "description", self.__description
+        yield "description", resolve_text(self.__description, self._text_store)
         yield "first-time-description", self.first_time_description
         yield "one-way", self.one_way
         yield "one-way-start", self.one_way_start
@@ -1,33 +1,48 @@
 from random import choice
+from sys import intern
 
 from mystics_and_manuscripts.level.achievement import Achievement
-from mystics_and_manuscripts.utils import value_or_default
+from mystics_and_manuscripts.level.journal import TrackedObject
+from mystics_and_manuscripts.level.texts import TextStore, keep_text, resolve_text
+from mystics_and_manuscripts.utils import intern_text, value_or_default
 
 
-class Place:
-    def __init__(self, place: dict):
+class Place(TrackedObject):
+    __slots__ = (
+        "id", "name", "__description", "__first_time_description", "start", "end", "items", "achievement_id",
+        "call_before", "call_after", "visited", "_text_store",
+    )
+
+    def __init__(self, place: dict, text_store: TextStore | None = None):
         """
         A class mirror of the place dictionary.
 
         Args:
             place (dict): Place data used in this object.
+            text_store (TextStore | None, optional): Store to keep the descriptions in, they're decoded when they're
+                used. Descriptions of a compiled level (see "level.bundle") are indexes in its store already. None to
+                keep them as they are. Default: None
         """
 
+        # descriptions set later (e.g. by scripts) are kept as they are
+        self._text_store = text_store
+
         self.id = place["id"]
 
-        self.name = place["name"]
-        self.__description = place["description"]  # accessed by a getter and thus private
-        self.first_time_description = place.get("first-time-description")
+        # strings are interned and lists of descriptions stored as tuples, the items stay a list for scripts to change
+        self.name = intern_text(place["name"])
+        self.__description = keep_text(place["description"], text_store)  # accessed by a getter and thus private
+        self.__first_time_description = keep_text(place.get("first-time-description"), text_store)
 
         self.start = value_or_default(place, "start", False)
-        self.end = place.get("end")
+        self.end = intern_text(place.get("end"))
 
-        self.items = value_or_default(place, "items", [])
+        self.items = [intern(item) for item in value_or_default(place, "items", [])]
 
         self.achievement_id = place.get("achievement-id")
 
-        self.call_before = place.get("call-before")
-        self.call_after = place.get("call-after")
+        self.call_before = intern_text(place.get("call-before"))
+        self.call_after = intern_text(place.get("call-after"))
 
         self.visited = False
 
@@ -36,26 +51,42 @@ class Place:
         """str: Chosen description depending on context."""
 
         # check for a first-time description
-        if not self.visited and self.first_time_description is not None:
-            return self.first_time_description
+        if not self.visited:
+            first_time_description = self.first_time_description
+
+            if first_time_description is not None:
+                return first_time_description
+
+        # descriptions in a text store are decoded now
+        description = resolve_text(self.__description, self._text_store)
 
         # account for multiple descriptions
-        if isinstance(self.__description, list):
-            return choice(self.__description)
+        if isinstance(description, (list, tuple)):
+            return choice(description)
 
         # default variation
-        return self.__description
+        return description
 
     @description.setter
     def description(self, value: str | list | None):
         self.__description = value
 
+    @property
+    def first_time_description(self) -> str | None:
+        """str | None: Description used instead of the usual one until the place is visited."""
+
+        return resolve_text(self.__first_time_description, self._text_store)
+
+    @first_time_description.setter
+    def first_time_description(self, value: str | None):
+        self.__first_time_description = value
+
     # this is a neat trick to allow for dict type casting
     # (https://stackoverflow.com/a/35282286/16343968)
     def __iter__(self):
         yield "id", self.id
         yield "name", self.name
-        yield "description", self.__description
+        yield "description", resolve_text(self.__description, self._text_store)
         yield "first-time-description", self.first_time_description
         yield "start", self.start
         yield "end", self.end
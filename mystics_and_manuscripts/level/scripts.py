@@ -0,0 +1,99 @@
+import copy
+import os
+from importlib.machinery import SourceFileLoader
+from pathlib import Path as FilePath
+from types import CodeType, FunctionType, ModuleType
+
+# compiled level scripts, path to the script -> ((mtime, size), code object)
+_compiled_scripts = {}
+
+
+def get_script_code(script_path: str | FilePath, module_name: str) -> CodeType:
+    """
+    Return the compiled code of a level script. The code is kept in memory and in the "__pycache__" folder next to the
+    script (as for imported modules), so each script is compiled only once.
+
+    Args:
+        script_path (str | FilePath): Path to the level script.
+        module_name (str): Name of the script module, e.g. "levels.castle.level".
+
+    Returns:
+        CodeType: Code of the script module.
+    """
+
+    script_path = str(script_path)
+
+    stat = os.stat(script_path)
+    stat_info = (stat.st_mtime_ns, stat.st_size)
+
+    compiled_stat_info, code = _compiled_scripts.get(script_path, (None, None))
+
+    if compiled_stat_info != stat_info:
+        # the loader reads the bytecode from "__pycache__" when it's up to date, and writes it there otherwise
+        code = SourceFileLoader(module_name, script_path).get_code(module_name)
+        _compiled_scripts[script_path] = (stat_info, code)
+
+    return code
+
+
+def create_script_module(script_path: str | FilePath, module_name: str) -> ModuleType:
+    """
+    Run a level script in a new module. Every play-through gets its own module, so the script's globals aren't shared
+    between play-throughs (or games running at the same time).
+
+    Args:
+        script_path (str | FilePath): Path to the level script.
+        module_name (str): Name of the script module, e.g. "levels.castle.level".
+
+    Returns:
+        ModuleType: The new module.
+    """
+
+    module = ModuleType(module_name)
+    module.__file__ = str(script_path)
+    module.__package__ = module_name.rpartition(".")[0]
+
+    exec(get_script_code(script_path, module_name), module.__dict__)
+    return module
+
+
+def copy_script_module(module: ModuleType) -> ModuleType:
+    """
+    Copy a level script module without running the script again. The copy starts with deep copies of the current
+    values of the globals (e.g. the ones listed in "saved_globals"), so changing them in place doesn't change the
+    original. The functions defined by the script are copied to use the copy's globals. Imported modules, classes and
+    the level objects the globals refer to are shared.
+
+    Args:
+        module (ModuleType): Module from "create_script_module".
+
+    Returns:
+        ModuleType: The copy.
+    """
+
+    module_copy = ModuleType(module.__name__)
+    namespace = module_copy.__dict__
+
+    # one memo for all the globals, so the copies refer to each other as the originals do
+    memo = {}
+
+    for name, value in module.__dict__.items():
+        if name == "__builtins__" or isinstance(value, (FunctionType, ModuleType, type)):
+            namespace[name] = value
+        else:
+            namespace[name] = copy.deepcopy(value, memo)
+
+    for name, value in list(namespace.items()):
+        if not isinstance(value, FunctionType) or value.__globals__ is not module.__dict__:
+            continue
+
+        function = FunctionType(value.__code__, namespace, value.__name__, value.__defaults__, value.__closure__)
+        function.__kwdefaults__ = value.__kwdefaults__
+        function.__qualname__ = value.__qualname__
+        function.__doc__ = value.__doc__
+        function.__annotations__ = value.__annotations__
+        function.__dict__.update(value.__dict__)  # e.g. the name registered by the "hook" decorator
+
+        namespace[name] = function
+
+    return module_copy
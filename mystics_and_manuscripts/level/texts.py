@@ -0,0 +1,222 @@
+import os
+import zlib
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+from mystics_and_manuscripts.utils import intern_text
+
+# environment variable choosing how levels loaded from yaml store their prose, "plain" or "compressed"
+TEXT_STORAGE_ENVIRONMENT_VARIABLE = "MM_TEXT_STORAGE"
+
+TEXT_STORAGES = ("plain", "compressed")
+DEFAULT_TEXT_STORAGE = "plain"
+
+# texts are compressed together in blocks of about this size, short texts barely compress on their own
+BLOCK_SIZE = 8 * 1024
+COMPRESSION_LEVEL = 9
+
+# numbers of decoded texts and decompressed blocks every store keeps, the most recently used ones
+DECODED_TEXT_CACHE_SIZE = 256
+DECOMPRESSED_BLOCK_CACHE_SIZE = 8
+
+
+def get_text_storage(text_storage: str | None = None) -> str:
+    """
+    Return the text storage to use.
+
+    Args:
+        text_storage (str | None, optional): Name of the storage, None for the one set by the MM_TEXT_STORAGE
+            environment variable (or the default one). Default: None
+
+    Returns:
+        str: Name of the storage.
+
+    Raises:
+        ValueError: The storage doesn't exist.
+    """
+
+    if text_storage is None:
+        text_storage = os.environ.get(TEXT_STORAGE_ENVIRONMENT_VARIABLE, DEFAULT_TEXT_STORAGE)
+
+    if text_storage not in TEXT_STORAGES:
+        raise ValueError(f"Unknown text storage {text_storage!r}, choose from: {', '.join(TEXT_STORAGES)}")
+
+    return text_storage
+
+
+def keep_text(value, text_store: "TextStore | None"):
+    """
+    Prepare a text to be kept by a level object: add it to a text store, or intern it if there's no store.
+
+    Args:
+        value: String, list of strings or any other value.
+        text_store (TextStore | None): Store to add the text to, None to keep the text as it is.
+
+    Returns:
+        The index (or range of indexes) of the text in the store, or the interned text (see "intern_text"). Other
+        values, including indexes of texts that are in the store already, are returned unchanged.
+    """
+
+    return text_store.add(value) if text_store is not None else intern_text(value)
+
+
+def resolve_text(value, text_store: "TextStore | None"):
+    """
+    Return the text a value refers to, if it's stored in a text store.
+
+    Args:
+        value: Index of a text in the store, range of indexes of a list of texts, or a value stored as it is (a
+            string, a list of strings or None).
+        text_store (TextStore | None): Store the indexes refer to.
+
+    Returns:
+        The decoded text (a tuple of texts for a range), or the value unchanged.
+    """
+
+    if type(value) is int:
+        return text_store.get_text(value)
+
+    if type(value) is range:
+        return tuple(text_store.get_text(index) for index in value)
+
+    return value
+
+
+class TextStore:
+    def __init__(self, data: bytes | memoryview = b"", offsets=None, block_starts=None, block_offsets=None):
+        """
+        Texts compressed with zlib in blocks of about BLOCK_SIZE bytes, with an offset index, so any of them can be
+        decoded by decompressing only its block. The data and the index can be views of a memory-mapped file (see
+        "level.bundle"). Decoded texts and decompressed blocks are kept in small LRU caches.
+
+        Args:
+            data (bytes | memoryview, optional): Compressed blocks one after another. Default: b""
+            offsets (optional): Start of every text in the uncompressed texts and the end of the last one, an array or
+                a memoryview. Default: None for an empty store
+            block_starts (optional): Start of every block in the uncompressed texts. Default: None for an empty store
+            block_offsets (optional): Start of every block in the data and the end of the last one. Default: None for
+                an empty store
+        """
+
+        self.data = data
+        self.offsets = offsets if offsets is not None else array("I", [0])
+        self.block_starts = block_starts if block_starts is not None else array("I")
+        self.block_offsets = block_offsets if block_offsets is not None else array("I", [0])
+
+        self.__pending_texts = []  # texts added but not compressed yet
+
+        self.__create_caches()
+
+    def __create_caches(self) -> None:
+        # note: every store gets its own caches, so dropping a level drops its decoded texts
+        self.get_text = lru_cache(maxsize=DECODED_TEXT_CACHE_SIZE)(self.__decode)
+        self.__get_block = lru_cache(maxsize=DECOMPRESSED_BLOCK_CACHE_SIZE)(self.__decompress_block)
+
+    def __getstate__(self) -> dict:
+        # the caches wrap bound methods, which can't be pickled, they're created again when the store is unpickled,
+        # sections of a memory-mapped bundle are copied
+        return {
+            "data": bytes(self.data),
+            "offsets": array("I", self.offsets),
+            "block_starts": array("I", self.block_starts),
+            "block_offsets": array("I", self.block_offsets),
+            "pending_texts": self.__pending_texts,
+        }
+
+    def __setstate__(self, state: dict):
+        self.data = state["data"]
+        self.offsets = state["offsets"]
+        self.block_starts = state["block_starts"]
+        self.block_offsets = state["block_offsets"]
+        self.__pending_texts = state["pending_texts"]
+
+        self.__create_caches()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1 + len(self.__pending_texts)
+
+    def __decompress_block(self, block: int) -> bytes:
+        return zlib.decompress(self.data[self.block_offsets[block]:self.block_offsets[block + 1]])
+
+    def __decode(self, index: int) -> str:
+        if index >= len(self.offsets) - 1:
+            return self.__pending_texts[index - len(self.offsets) + 1]
+
+        start, end = self.offsets[index], self.offsets[index + 1]
+
+        if start == end:
+            return ""
+
+        # texts never span two blocks
+        block = bisect_right(self.block_starts, start) - 1
+        block_start = self.block_starts[block]
+
+        return self.__get_block(block)[start - block_start:end - block_start].decode()
+
+    def add(self, value):
+        """
+        Add a text (or a list of texts) to the store. It's compressed by "compress".
+
+        Args:
+            value: String, list/tuple of strings, or any other value, which isn't added.
+
+        Returns:
+            Index of the added text, range of indexes of the added list (see "resolve_text"), other values unchanged.
+        """
+
+        if isinstance(value, str):
+            self.__pending_texts.append(value)
+            return len(self) - 1
+
+        if isinstance(value, (list, tuple)) and all(isinstance(text, str) for text in value):
+            start = len(self)
+            self.__pending_texts.extend(value)
+
+            return range(start, len(self))
+
+        return value
+
+    def compress(self) -> None:
+        """
+        Compress the added texts. Only a store without compressed texts can be compressed, so all texts are added
+        first.
+
+        Raises:
+            ValueError: The store already holds compressed texts.
+        """
+
+        if len(self.offsets) > 1:
+            raise ValueError("The text store is already compressed")
+
+        data = bytearray()
+        offsets = array("I", [0])
+        block_starts = array("I")
+        block_offsets = array("I", [0])
+
+        block = bytearray()
+
+        for text in self.__pending_texts:
+            # a block starts with the first text after the previous block was compressed, empty texts included
+            if len(block_starts) == len(block_offsets) - 1:
+                block_starts.append(offsets[-1])
+
+            block.extend(text.encode())
+            offsets.append(block_starts[-1] + len(block))
+
+            if len(block) >= BLOCK_SIZE:
+                data.extend(zlib.compress(block, COMPRESSION_LEVEL))
+                block_offsets.append(len(data))
+                block = bytearray()
+
+        if len(block) > 0:
+            data.extend(zlib.compress(block, COMPRESSION_LEVEL))
+            block_offsets.append(len(data))
+
+        self.data = bytes(data)
+        self.offsets = offsets
+        self.block_starts = block_starts
+        self.block_offsets = block_offsets
+        self.__pending_texts = []
+
+        self.get_text.cache_clear()
@@ -1,45 +1,87 @@
-from colorama import just_fix_windows_console
+import os
+from argparse import ArgumentParser
 
-from mystics_and_manuscripts.game import Game
-from mystics_and_manuscripts.level import load_all_levels
+from mystics_and_manuscripts.level import LevelLibrary
+from mystics_and_manuscripts.tracing import start_tracing
+from mystics_and_manuscripts.ui.output.backends import RENDER_BACKENDS, create_render_backend
 from mystics_and_manuscripts.ui.output.display_manager import DisplayManager
 from mystics_and_manuscripts.ui.output.scene import Scene
-from mystics_and_manuscripts.ui.output.sections.level_achievements import create_achievements_scene
 from mystics_and_manuscripts.ui.output.sections.level_menu import LevelMenu
 from mystics_and_manuscripts.ui.input import choose_option, Option
 
+# note: modules that aren't needed for the level menu (the game, achievements, recordings) are imported when they're
+# first used, so that the menu appears sooner
 
-# fix colored text on Windows
-just_fix_windows_console()
+parser = ArgumentParser(prog="python -m mystics_and_manuscripts.main", description="Play Mystics & Manuscripts.")
+parser.add_argument("--renderer", choices=list(RENDER_BACKENDS),
+                    help="how scenes are shown (default: the MM_RENDERER environment variable or \"ansi\")")
+parser.add_argument("--record", metavar="FOLDER", default=None,
+                    help="save a recording of every play-through to this folder (replay them with "
+                         "\"python -m mystics_and_manuscripts.recording replay FOLDER\")")
+parser.add_argument("--trace", metavar="FILE", default=None,
+                    help="write how long every phase of the game took as a trace-event JSON file, for chrome://tracing "
+                         "or Perfetto (or set the MM_TRACE environment variable)")
+args = parser.parse_args()
 
-display_manager = DisplayManager()
+if args.trace is not None:
+    start_tracing(args.trace)
+
+# fix colored text (and the escape sequences clearing the screen) on Windows
+if os.name == "nt":
+    from colorama import just_fix_windows_console
+
+    just_fix_windows_console()
+
+display_manager = DisplayManager(create_render_backend(args.renderer))
+level_library = LevelLibrary()
+
+menu = None
+menu_manifests = None  # manifests the menu was created from
 
 while True:
-    # load all levels found in the "levels" folder
-    # this has to be done each time as the level data can be modified at play-through
-    levels = load_all_levels()
+    # list all levels found in the "levels" folder
+    # only their manifests are needed for the menu, a level is fully loaded once it's picked
+    manifests = level_library.get_manifests()
 
     menu_scene = Scene()
 
-    # print the menu
-    menu = LevelMenu(levels)
+    # print the menu, it's only created again when the levels changed (unchanged manifests are the same objects)
+    if manifests != menu_manifests:
+        menu = LevelMenu(manifests)
+        menu_manifests = manifests
+
     menu_scene.add_sections(menu)
     display_manager.new_scene(menu_scene)
 
     # let the user pick a level
-    options = [Option(i, level.name, level) for i, level in enumerate(levels)] + \
+    options = [Option(i, manifest.name, manifest) for i, manifest in enumerate(manifests)] + \
               [Option("a", "Open achievements", "a"), Option("e", "Exit game", "e")]
     option = choose_option(options)
 
     # show achievements scene
     if option.value == "a":
-        display_manager.new_scene(create_achievements_scene(levels))
+        from mystics_and_manuscripts.ui.output.sections.level_achievements import create_achievements_scene
+
+        display_manager.new_scene(create_achievements_scene(manifests))
         display_manager.stop()
         continue
 
     if option.value == "e":
         exit(0)
 
+    # load the level in its original state, as the level data can be modified at play-through
+    level = level_library.get_level(option.value.level_file_path)
+
+    from mystics_and_manuscripts.game import Game
+
     # create and start a new play-through
-    game_instance = Game(option.value)
+    recorder = None
+
+    if args.record is not None:
+        from mystics_and_manuscripts.recording import Recorder, create_recording_file_path
+
+        recorder = Recorder(level)
+        recorder.file_path = create_recording_file_path(args.record, level, recorder.recording.seed)
+
+    game_instance = Game(level, recorder=recorder, display_manager=display_manager)
     game_instance.start()
@@ -0,0 +1,55 @@
+from mystics_and_manuscripts.level import Place, Path, Achievement
+from mystics_and_manuscripts.level.action import Action
+from mystics_and_manuscripts.ui.output.scene import Scene
+
+
+class Observation:
+    def __init__(self, place: Place, description: str, achievement: Achievement | None, ending: str | None,
+                 acquired_items: list[str], hints: list[str], paths: list[Path], actions: list[Action],
+                 scene: Scene | None = None):
+        """
+        Everything the player learns when entering a place, produced by one game step.
+
+        Args:
+            place (Place): Current place.
+            description (str): Description of the place shown to the player.
+            achievement (Achievement | None): Newly unlocked achievement or None.
+            ending (str | None): "win", "loss" or "draw" if the game ended here, None otherwise.
+            acquired_items (list[str]): Items newly added to the inventory.
+            hints (list[str]): Hints for paths invalidated by items.
+            paths (list[Path]): Paths the player can choose from.
+            actions (list[Action]): Actions the player can choose from.
+            scene (Scene | None, optional): Rendered scene, None for headless steps. Default: None
+        """
+
+        self.place = place
+        self.description = description
+        self.achievement = achievement
+        self.ending = ending
+        self.acquired_items = acquired_items
+        self.hints = hints
+        self.paths = paths
+        self.actions = actions
+        self.scene = scene
+
+    @property
+    def options(self) -> list[Path | Action]:
+        """list[Path | Action]: Options in the order they're shown in the menu, paths first."""
+
+        return self.paths + self.actions
+
+    def get_option(self, option_index: int) -> tuple[Path | None, Action | None]:
+        """
+        Return the option at an index of the menu.
+
+        Args:
+            option_index (int): Index of the option.
+
+        Returns:
+            tuple: A chosen path at index 0 and a chosen action at index 1. One of them will always be None.
+        """
+
+        if option_index < len(self.paths):
+            return self.paths[option_index], None
+
+        return None, self.actions[option_index - len(self.paths)]
@@ -0,0 +1,315 @@
+import atexit
+import json
+import os
+import warnings
+from abc import ABC, abstractmethod
+from pathlib import Path as FilePath
+from tempfile import NamedTemporaryFile
+from time import monotonic
+
+from mystics_and_manuscripts.tracing import IO_CATEGORY, trace
+
+# seconds between writes of newly unlocked achievements during a play-through (see "get_flush_interval")
+DEFAULT_FLUSH_INTERVAL = 30.0
+FLUSH_INTERVAL_ENVIRONMENT_VARIABLE = "MM_FLUSH_INTERVAL"
+
+# progress backends: "json" keeps an achievements.json file next to each level, "sqlite" one database for all levels
+PROGRESS_BACKENDS = ("json", "sqlite")
+
+# progress settings, can be changed by environment variables or by "configure_progress"
+_settings = {
+    "backend": os.environ.get("MM_PROGRESS_BACKEND", "json"),
+    "profile": os.environ.get("MM_PROFILE", "default"),
+    "database_path": os.environ.get("MM_PROGRESS_DATABASE", "progress.db"),
+    "flush_interval": None,  # None for the one set by the environment variable (see "get_flush_interval")
+}
+
+
+class AchievementsStore(ABC):
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        In-memory copy of a level's unlocked achievements. Unlocks are saved in batches. Subclasses decide where the
+        achievements are saved.
+
+        Args:
+            flush_interval (float, optional): Minimal number of seconds between two saves. Default: 30.0
+        """
+
+        self.flush_interval = flush_interval
+
+        self.unlocked = {}  # IDs of unlocked achievements (a dict to keep the order), values are unused
+        self.unsaved = []  # IDs unlocked since the last save
+
+        self.last_flush = monotonic()
+
+    @abstractmethod
+    def load_saved(self) -> list[int]:
+        """
+        Load the saved achievement IDs.
+
+        Returns:
+            list[int]: Saved achievement IDs.
+        """
+
+    @abstractmethod
+    def save_unsaved(self) -> None:
+        """
+        Save the unsaved achievement IDs.
+        """
+
+    def merge_saved(self) -> None:
+        """
+        Add saved achievements to the unlocked ones, in case another play-through saved some.
+        """
+
+        for achievement_id in self.load_saved():
+            if achievement_id not in self.unlocked:
+                self.unlocked[achievement_id] = None
+
+    def is_unlocked(self, achievement_id: int) -> bool:
+        """
+        Check if an achievement is unlocked.
+
+        Args:
+            achievement_id (int): ID of the achievement.
+
+        Returns:
+            bool: True if unlocked, False otherwise.
+        """
+
+        return achievement_id in self.unlocked
+
+    def get_unlocked(self) -> list[int]:
+        """
+        Return the IDs of all unlocked achievements.
+
+        Returns:
+            list[int]: Unlocked achievement IDs in the order they were unlocked.
+        """
+
+        return list(self.unlocked)
+
+    def unlock(self, achievement_id: int) -> bool:
+        """
+        Unlock an achievement. It is saved by the next flush.
+
+        Args:
+            achievement_id (int): ID of the achievement.
+
+        Returns:
+            bool: True if the achievement was newly unlocked, False if it was unlocked before.
+        """
+
+        if achievement_id in self.unlocked:
+            return False
+
+        self.unlocked[achievement_id] = None
+        self.unsaved.append(achievement_id)
+
+        if monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+        return True
+
+    def flush(self) -> None:
+        """
+        Save the unsaved unlocks.
+        """
+
+        self.last_flush = monotonic()
+
+        if len(self.unsaved) == 0:
+            return
+
+        with trace("save achievements", IO_CATEGORY):
+            self.save_unsaved()
+
+        self.unsaved.clear()
+
+
+class FileAchievementsStore(AchievementsStore):
+    def __init__(self, achievements_file_path: FilePath, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Achievements store saving to an achievements file (a JSON list of unlocked IDs).
+
+        Args:
+            achievements_file_path (FilePath): Path to the file with unlocked achievement IDs.
+            flush_interval (float, optional): Minimal number of seconds between two writes. Default: 30.0
+        """
+
+        super().__init__(flush_interval)
+
+        self.achievements_file_path = FilePath(achievements_file_path)
+        self.merge_saved()
+
+    def load_saved(self) -> list[int]:
+        if not self.achievements_file_path.is_file():
+            return []
+
+        with open(self.achievements_file_path, "r") as f:
+            return json.load(f)
+
+    def save_unsaved(self) -> None:
+        # the whole file is rewritten, so achievements written by other play-throughs have to be kept
+        self.merge_saved()
+
+        # the file is replaced atomically, so it's never read half-written
+        with NamedTemporaryFile("w", dir=self.achievements_file_path.parent, suffix=".tmp", delete=False) as f:
+            json.dump(list(self.unlocked), f)
+
+        os.replace(f.name, self.achievements_file_path)
+
+
+class MemoryAchievementsStore(AchievementsStore):
+    def __init__(self):
+        """
+        Achievements store that doesn't save anywhere, used by simulated play-throughs.
+        """
+
+        super().__init__(flush_interval=float("inf"))
+
+    def load_saved(self) -> list[int]:
+        return []
+
+    def save_unsaved(self) -> None:
+        pass
+
+
+# loaded achievement stores, key of the level -> store
+_stores = {}
+
+
+def configure_progress(backend: str | None = None, profile: str | None = None,
+                       database_path: str | None = None, flush_interval: float | None = None) -> None:
+    """
+    Change where the progress is saved. Stores loaded so far are flushed and dropped.
+
+    Args:
+        backend (str | None, optional): One of PROGRESS_BACKENDS. None to keep the current one. Default: None
+        profile (str | None, optional): Name of the player profile (sqlite backend only). None to keep the current one.
+            Default: None
+        database_path (str | None, optional): Path to the progress database (sqlite backend only). None to keep the
+            current one. Default: None
+        flush_interval (float | None, optional): Minimal number of seconds between two saves of a level's
+            achievements, 0 to save every unlock right away. None to keep the current one. Default: None
+
+    Raises:
+        ValueError: Unknown backend or a negative flush interval.
+    """
+
+    if backend is not None and backend not in PROGRESS_BACKENDS:
+        raise ValueError(f"Unknown progress backend {backend!r}, expected one of: {', '.join(PROGRESS_BACKENDS)}")
+
+    if flush_interval is not None and flush_interval < 0:
+        raise ValueError(f"The flush interval can't be negative, not {flush_interval}")
+
+    flush_all_stores()
+    _stores.clear()
+
+    for key, value in (("backend", backend), ("profile", profile), ("database_path", database_path),
+                       ("flush_interval", flush_interval)):
+        if value is not None:
+            _settings[key] = value
+
+
+def get_flush_interval() -> float:
+    """
+    Return the flush interval set by "configure_progress", or by the MM_FLUSH_INTERVAL environment variable. A value of
+    the variable that isn't a non-negative number is ignored with a warning.
+
+    Returns:
+        float: Minimal number of seconds between two saves of a level's achievements.
+    """
+
+    if _settings["flush_interval"] is not None:
+        return _settings["flush_interval"]
+
+    value = os.environ.get(FLUSH_INTERVAL_ENVIRONMENT_VARIABLE)
+
+    if value is None:
+        return DEFAULT_FLUSH_INTERVAL
+
+    try:
+        flush_interval = float(value)
+    except ValueError:
+        flush_interval = None
+
+    # note: "not >=" rejects NaN as well
+    if flush_interval is None or not flush_interval >= 0:
+        warnings.warn(
+            f"Ignoring {FLUSH_INTERVAL_ENVIRONMENT_VARIABLE}={value!r}, expected a non-negative number of seconds, "
+            f"using {DEFAULT_FLUSH_INTERVAL}"
+        )
+        return DEFAULT_FLUSH_INTERVAL
+
+    return flush_interval
+
+
+def get_progress_database():
+    """
+    Return the progress database of the current profile.
+
+    Returns:
+        ProgressDatabase: Opened progress database.
+    """
+
+    # sqlite3 is only imported when the database backend is used
+    from mystics_and_manuscripts.progress.database import open_progress_database
+
+    return open_progress_database(_settings["database_path"], _settings["profile"])
+
+
+def get_achievements_store(level) -> AchievementsStore:
+    """
+    Return the achievements store of a level. Saved achievements are only loaded the first time. The store saves
+    new unlocks at most once per the flush interval set by the MM_FLUSH_INTERVAL environment variable or
+    "configure_progress".
+
+    Args:
+        level (Level | LevelManifest): Level to get the store of.
+
+    Returns:
+        AchievementsStore: Store with the level's unlocked achievements.
+    """
+
+    store = _stores.get(level.achievements_file_path)
+
+    if store is None:
+        if _settings["backend"] == "sqlite":
+            store = get_progress_database().get_achievements_store(level, get_flush_interval())
+        else:
+            store = FileAchievementsStore(level.achievements_file_path, get_flush_interval())
+
+        _stores[level.achievements_file_path] = store
+
+    return store
+
+
+def get_unlocked_achievements(levels: list) -> list[set[int]]:
+    """
+    Return the unlocked achievement IDs of multiple levels. The sqlite backend gets them in a single query.
+
+    Args:
+        levels (list[Level | LevelManifest]): Levels to get the unlocked achievements of.
+
+    Returns:
+        list[set[int]]: Unlocked achievement IDs of each level.
+    """
+
+    if _settings["backend"] != "sqlite":
+        return [set(get_achievements_store(level).get_unlocked()) for level in levels]
+
+    # unsaved unlocks of this process have to be in the database before it's queried
+    flush_all_stores()
+
+    return get_progress_database().get_unlocked_by_levels(levels)
+
+
+@atexit.register
+def flush_all_stores() -> None:
+    """
+    Save unsaved unlocks of all loaded stores. Called automatically at exit.
+    """
+
+    for store in _stores.values():
+        store.flush()
@@ -0,0 +1,266 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from time import time
+
+from mystics_and_manuscripts.progress import AchievementsStore, DEFAULT_FLUSH_INTERVAL
+
+# profile that receives the achievements migrated from old achievements.json files
+DEFAULT_PROFILE = "default"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS unlocked_achievements (
+    profile_id INTEGER NOT NULL REFERENCES profiles (id),
+    level TEXT NOT NULL,
+    achievement_id INTEGER NOT NULL,
+    unlocked_at REAL NOT NULL,
+    PRIMARY KEY (profile_id, level, achievement_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS migrated_levels (
+    level TEXT PRIMARY KEY
+);
+"""
+
+
+class ProgressDatabase:
+    def __init__(self, database_path: str, profile: str = DEFAULT_PROFILE):
+        """
+        SQLite database with unlocked achievements of all levels and profiles. It runs in WAL mode, so multiple
+        play-throughs (even in separate processes) can use it at the same time.
+
+        Args:
+            database_path (str): Path to the database file.
+            profile (str, optional): Name of the player profile. Default: "default"
+        """
+
+        # autocommit mode, transactions are started explicitly by "transaction"
+        self.connection = sqlite3.connect(database_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        self.profile = profile
+        self.profile_id = self.get_profile_id(profile)
+
+        # levels whose achievements.json files are already in the database
+        self.migrated_levels = {row[0] for row in self.connection.execute("SELECT level FROM migrated_levels")}
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the statements in the "with" block in a single transaction.
+        """
+
+        self.connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+        self.connection.execute("COMMIT")
+
+    def get_profile_id(self, profile: str) -> int:
+        """
+        Return the ID of a profile, create the profile if it doesn't exist.
+
+        Args:
+            profile (str): Name of the profile.
+
+        Returns:
+            int: ID of the profile.
+        """
+
+        self.connection.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (profile,))
+        return self.connection.execute("SELECT id FROM profiles WHERE name = ?", (profile,)).fetchone()[0]
+
+    def get_profiles(self) -> list[str]:
+        """
+        Return the names of all profiles.
+
+        Returns:
+            list[str]: Profile names.
+        """
+
+        return [row[0] for row in self.connection.execute("SELECT name FROM profiles ORDER BY id")]
+
+    @staticmethod
+    def get_level_key(level) -> str:
+        """
+        Return the key identifying a level in the database.
+
+        Args:
+            level (Level | LevelManifest): Level to get the key of.
+
+        Returns:
+            str: Name of the level's folder.
+        """
+
+        return level.folder_path.name
+
+    def migrate_achievements_file(self, level) -> None:
+        """
+        Move the achievements from a level's achievements.json file into the default profile (only done once).
+
+        Args:
+            level (Level | LevelManifest): Level to migrate.
+        """
+
+        level_key = ProgressDatabase.get_level_key(level)
+
+        if level_key in self.migrated_levels:
+            return
+
+        achievement_ids = []
+
+        if level.achievements_file_path.is_file():
+            with open(level.achievements_file_path, "r") as f:
+                achievement_ids = json.load(f)
+
+        default_profile_id = self.get_profile_id(DEFAULT_PROFILE)
+        now = time()
+
+        with self.transaction() as connection:
+            # another process could have migrated the level in the meantime
+            cursor = connection.execute("INSERT OR IGNORE INTO migrated_levels (level) VALUES (?)", (level_key,))
+
+            if cursor.rowcount == 1:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO unlocked_achievements VALUES (?, ?, ?, ?)",
+                    [(default_profile_id, level_key, achievement_id, now) for achievement_id in achievement_ids]
+                )
+
+        self.migrated_levels.add(level_key)
+
+    def get_unlocked(self, level_key: str) -> list[int]:
+        """
+        Return the unlocked achievement IDs of a level.
+
+        Args:
+            level_key (str): Key of the level.
+
+        Returns:
+            list[int]: Unlocked achievement IDs in the order they were unlocked.
+        """
+
+        rows = self.connection.execute(
+            "SELECT achievement_id FROM unlocked_achievements WHERE profile_id = ? AND level = ? ORDER BY unlocked_at",
+            (self.profile_id, level_key)
+        )
+
+        return [row[0] for row in rows]
+
+    def add_unlocked(self, level_key: str, achievement_ids: list[int]) -> None:
+        """
+        Save unlocked achievements of a level in a single transaction.
+
+        Args:
+            level_key (str): Key of the level.
+            achievement_ids (list[int]): IDs of the unlocked achievements.
+        """
+
+        now = time()
+
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO unlocked_achievements VALUES (?, ?, ?, ?)",
+                [(self.profile_id, level_key, achievement_id, now) for achievement_id in achievement_ids]
+            )
+
+    def get_unlocked_by_levels(self, levels: list) -> list[set[int]]:
+        """
+        Return the unlocked achievement IDs of multiple levels using one query.
+
+        Args:
+            levels (list[Level | LevelManifest]): Levels to get the unlocked achievements of.
+
+        Returns:
+            list[set[int]]: Unlocked achievement IDs of each level.
+        """
+
+        for level in levels:
+            self.migrate_achievements_file(level)
+
+        unlocked_by_level_key = {}
+
+        # uses the primary key index, as the profile is its first column
+        rows = self.connection.execute(
+            "SELECT level, achievement_id FROM unlocked_achievements WHERE profile_id = ?", (self.profile_id,)
+        )
+
+        for level_key, achievement_id in rows:
+            unlocked_by_level_key.setdefault(level_key, set()).add(achievement_id)
+
+        return [unlocked_by_level_key.get(ProgressDatabase.get_level_key(level), set()) for level in levels]
+
+    def get_achievements_store(self, level, flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> "DatabaseAchievementsStore":
+        """
+        Return a new achievements store of a level saving into this database.
+
+        Args:
+            level (Level | LevelManifest): Level to create the store for.
+            flush_interval (float, optional): Minimal number of seconds between two saves. Default: 30.0
+
+        Returns:
+            DatabaseAchievementsStore: Achievements store of the level.
+        """
+
+        self.migrate_achievements_file(level)
+        return DatabaseAchievementsStore(self, ProgressDatabase.get_level_key(level), flush_interval)
+
+
+class DatabaseAchievementsStore(AchievementsStore):
+    def __init__(self, database: ProgressDatabase, level_key: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Achievements store saving to the progress database.
+
+        Args:
+            database (ProgressDatabase): Database to save to.
+            level_key (str): Key of the level in the database.
+            flush_interval (float, optional): Minimal number of seconds between two saves. Default: 30.0
+        """
+
+        super().__init__(flush_interval)
+
+        self.database = database
+        self.level_key = level_key
+        self.merge_saved()
+
+    def load_saved(self) -> list[int]:
+        return self.database.get_unlocked(self.level_key)
+
+    def save_unsaved(self) -> None:
+        self.database.add_unlocked(self.level_key, self.unsaved)
+        self.merge_saved()
+
+
+# opened databases, (database path, profile) -> database
+_databases = {}
+
+
+def open_progress_database(database_path: str, profile: str = DEFAULT_PROFILE) -> ProgressDatabase:
+    """
+    Return the progress database for a profile, the connection is only opened the first time.
+
+    Args:
+        database_path (str): Path to the database file.
+        profile (str, optional): Name of the player profile. Default: "default"
+
+    Returns:
+        ProgressDatabase: Opened progress database.
+    """
+
+    database = _databases.get((database_path, profile))
+
+    if database is None:
+        database = ProgressDatabase(database_path, profile)
+        _databases[(database_path, profile)] = database
+
+    return database
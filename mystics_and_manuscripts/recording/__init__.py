@@ -0,0 +1,244 @@
+import json
+import os
+import random
+import zlib
+from pathlib import Path as FilePath
+from tempfile import NamedTemporaryFile
+from time import strftime
+
+from mystics_and_manuscripts.level import Level, Path
+from mystics_and_manuscripts.level.action import Action
+from mystics_and_manuscripts.observation import Observation
+
+# bump when the recording format changes, older recordings are rejected
+RECORDING_FORMAT_VERSION = 1
+RECORDING_EXTENSION = ".mmrec"
+
+# event of the player pressing ENTER to continue, all other events are indexes of chosen options
+ACKNOWLEDGEMENT = -1
+
+
+class Recording:
+    def __init__(self, level_path: str, seed: int):
+        """
+        Everything needed to replay a play-through and check that it turns out the same.
+
+        Args:
+            level_path (str): Path to the level file.
+            seed (int): Seed of the "random" module at the start of the play-through.
+        """
+
+        self.level_path = str(level_path)
+        self.seed = seed
+
+        self.events = []  # indexes of chosen options and ACKNOWLEDGEMENTs, in order
+        self.places = []  # ID of the place of every observation
+        self.items = {}  # observation index -> items acquired by it (only observations with new items)
+        self.ending = None  # "win", "loss", "draw" or None if the play-through wasn't finished
+
+    @property
+    def choices(self) -> list[int]:
+        """list[int]: Indexes of the chosen options, in order."""
+
+        return [event for event in self.events if event != ACKNOWLEDGEMENT]
+
+    @property
+    def acknowledgement_count(self) -> int:
+        """int: Number of times the player pressed ENTER to continue."""
+
+        return self.events.count(ACKNOWLEDGEMENT)
+
+    def to_dict(self) -> dict:
+        """
+        Return the recording as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Recording data.
+        """
+
+        return {
+            "version": RECORDING_FORMAT_VERSION,
+            "level": self.level_path,
+            "seed": self.seed,
+            "events": self.events,
+            "places": self.places,
+            "items": [[observation_index, items] for observation_index, items in self.items.items()],
+            "ending": self.ending,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "Recording":
+        """
+        Create a recording from its dictionary.
+
+        Args:
+            data (dict): Recording data (see "to_dict").
+
+        Returns:
+            Recording: Recording object.
+
+        Raises:
+            ValueError: The recording has an unsupported format version.
+        """
+
+        if data.get("version") != RECORDING_FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording format version {data.get('version')!r}")
+
+        recording = Recording(data["level"], data["seed"])
+        recording.events = data["events"]
+        recording.places = data["places"]
+        recording.items = {observation_index: items for observation_index, items in data["items"]}
+        recording.ending = data["ending"]
+
+        return recording
+
+    def save(self, file_path: str | FilePath) -> None:
+        """
+        Save the recording as zlib-compressed JSON.
+
+        Args:
+            file_path (str | FilePath): Path to the recording file.
+        """
+
+        file_path = FilePath(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = json.dumps(self.to_dict(), separators=(",", ":")).encode()
+
+        # the file is replaced atomically, so it's never read half-written
+        with NamedTemporaryFile("wb", dir=file_path.parent, suffix=".tmp", delete=False) as f:
+            f.write(zlib.compress(data, 9))
+
+        os.replace(f.name, file_path)
+
+
+def load_recording(file_path: str | FilePath) -> Recording:
+    """
+    Load a recording from its file.
+
+    Args:
+        file_path (str | FilePath): Path to the recording file.
+
+    Returns:
+        Recording: Loaded recording.
+    """
+
+    with open(file_path, "rb") as f:
+        return Recording.from_dict(json.loads(zlib.decompress(f.read())))
+
+
+def find_recording_files(paths: list[str]) -> list[FilePath]:
+    """
+    Find recording files, folders are searched recursively.
+
+    Args:
+        paths (list[str]): Paths to recording files or folders with them.
+
+    Returns:
+        list[FilePath]: Paths to the recording files.
+    """
+
+    file_paths = []
+
+    for path in map(FilePath, paths):
+        if path.is_dir():
+            file_paths.extend(sorted(path.rglob(f"*{RECORDING_EXTENSION}")))
+        else:
+            file_paths.append(path)
+
+    return file_paths
+
+
+def create_recording_file_path(folder_path: str | FilePath, level: Level, seed: int) -> FilePath:
+    """
+    Create a unique path for a new recording of a level.
+
+    Args:
+        folder_path (str | FilePath): Folder with recordings.
+        level (Level): Recorded level.
+        seed (int): Seed of the play-through.
+
+    Returns:
+        FilePath: Path to the recording file.
+    """
+
+    return FilePath(folder_path) / f"{level.folder_path.name}-{strftime('%Y%m%d-%H%M%S')}-{seed:08x}{RECORDING_EXTENSION}"
+
+
+class Recorder:
+    def __init__(self, level: Level, file_path: str | FilePath | None = None, seed: int | None = None):
+        """
+        Records a play-through of a game. The game calls the recorder, see the "recorder" argument of Game.
+
+        Args:
+            level (Level): Played level.
+            file_path (str | FilePath | None, optional): Where to save the recording when the play-through finishes.
+                None to keep it only in memory. Default: None
+            seed (int | None, optional): Seed of the play-through. None for a random one. Default: None
+        """
+
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), "big")
+
+        self.recording = Recording(level.level_file_path.as_posix(), seed)
+        self.file_path = file_path
+
+        self.last_options = []  # options of the last observation, to turn chosen options into indexes
+
+    def begin(self) -> None:
+        """
+        Seed the "random" module, called before anything random happens in the play-through.
+        """
+
+        random.seed(self.recording.seed)
+
+    def record_observation(self, observation: Observation) -> None:
+        """
+        Record what the player saw.
+
+        Args:
+            observation (Observation): The observation.
+        """
+
+        if len(observation.acquired_items) > 0:
+            self.recording.items[len(self.recording.places)] = list(observation.acquired_items)
+
+        self.recording.places.append(observation.place.id)
+        self.recording.ending = observation.ending
+
+        self.last_options = observation.options
+
+    def record_choice(self, path: Path | None, action: Action | None) -> None:
+        """
+        Record the option chosen after the last observation.
+
+        Args:
+            path (Path | None): Chosen path or None if an action was chosen.
+            action (Action | None): Chosen action or None if a path was chosen.
+        """
+
+        chosen_option = path if path is not None else action
+
+        # options are compared by identity, two paths can have equal attributes
+        option_index = next(i for i, option in enumerate(self.last_options) if option is chosen_option)
+        self.recording.events.append(option_index)
+
+    def record_acknowledgement(self) -> None:
+        """
+        Record the player pressing ENTER to continue.
+        """
+
+        self.recording.events.append(ACKNOWLEDGEMENT)
+
+    def finish(self) -> Recording:
+        """
+        Finish the recording and save it if it has a file path.
+
+        Returns:
+            Recording: The finished recording.
+        """
+
+        if self.file_path is not None:
+            self.recording.save(self.file_path)
+
+        return self.recording
@@ -0,0 +1,52 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+from mystics_and_manuscripts.level import load_levels
+from mystics_and_manuscripts.recording import Recorder, create_recording_file_path, find_recording_files
+from mystics_and_manuscripts.recording.replay import replay_files
+from mystics_and_manuscripts.simulation import create_headless_game, play_through
+from mystics_and_manuscripts.simulation.policies import POLICIES, create_policy
+
+parser = ArgumentParser(prog="python -m mystics_and_manuscripts.recording", description="Record and replay play-throughs.")
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+replay_parser = subparsers.add_parser("replay", help="replay recordings and report any divergence")
+replay_parser.add_argument("paths", nargs="+", help="recording files or folders with them")
+replay_parser.add_argument("--level", default=None, help="replay on this level file instead of the recorded one")
+replay_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+record_parser = subparsers.add_parser("record", help="record simulated play-throughs, e.g. as a regression suite")
+record_parser.add_argument("level", help="path to the level file, e.g. levels/castle/level.yaml")
+record_parser.add_argument("output", help="folder to save the recordings to")
+record_parser.add_argument("-n", "--runs", type=int, default=100, help="number of play-throughs (default: 100)")
+record_parser.add_argument("-p", "--policy", choices=POLICIES, default="random", help="how options are chosen (default: random)")
+record_parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first play-through (default: 0)")
+record_parser.add_argument("--max-steps", type=int, default=1000, help="step limit of a play-through (default: 1000)")
+
+args = parser.parse_args()
+
+if args.command == "replay":
+    report = replay_files(find_recording_files(args.paths), args.level)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.to_text())
+
+    # a non-zero exit code lets scripts detect divergences
+    sys.exit(1 if len(report.divergences) > 0 else 0)
+
+level = load_levels([args.level])[0]
+policy = create_policy(args.policy)
+
+for seed in range(args.seed, args.seed + args.runs):
+    game = create_headless_game(level)
+    game.recorder = Recorder(level, create_recording_file_path(args.output, level, seed), seed)
+
+    policy.reset(seed)
+    play_through(game, policy, args.max_steps)
+
+    game.recorder.finish()
+
+print(f"Recorded {args.runs} play-throughs to {args.output}")
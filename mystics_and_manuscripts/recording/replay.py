@@ -0,0 +1,196 @@
+from pathlib import Path as FilePath
+from time import perf_counter
+
+from mystics_and_manuscripts.level import Level, load_levels
+from mystics_and_manuscripts.recording import Recording, Recorder, load_recording
+from mystics_and_manuscripts.simulation import create_headless_game
+
+
+class ReplayResult:
+    def __init__(self, file_path: FilePath | None, steps: int, divergence: str | None = None):
+        """
+        Result of replaying a recording.
+
+        Args:
+            file_path (FilePath | None): Path to the recording file, None for recordings kept in memory.
+            steps (int): Number of replayed choices.
+            divergence (str | None, optional): Description of the first difference from the recording, None if the
+                replay matched it. Default: None
+        """
+
+        self.file_path = file_path
+        self.steps = steps
+        self.divergence = divergence
+
+
+def replay(recording: Recording, level: Level, file_path: FilePath | None = None) -> ReplayResult:
+    """
+    Re-run a recorded play-through without rendering or input waits and compare the places, items and ending with the
+    recorded ones.
+
+    Args:
+        recording (Recording): Recording to replay.
+        level (Level): Recorded level (reset before the replay).
+        file_path (FilePath | None, optional): Path to the recording file, only used in the result. Default: None
+
+    Returns:
+        ReplayResult: Result of the replay.
+    """
+
+    # the replay is recorded too, the first difference is found by comparing both recordings
+    game = create_headless_game(level)
+    game.recorder = Recorder(level, seed=recording.seed)
+    replayed = game.recorder.recording
+
+    choices = recording.choices
+
+    game.begin()
+
+    for step in range(len(choices) + 1):
+        observation = game.observe()
+        observation_index = len(replayed.places) - 1
+
+        if observation_index >= len(recording.places):
+            return ReplayResult(file_path, step, f"step {step}: the recording ends before place {observation.place.id}")
+
+        expected_place_id = recording.places[observation_index]
+
+        if observation.place.id != expected_place_id:
+            return ReplayResult(
+                file_path, step, f"step {step}: entered place {observation.place.id} instead of {expected_place_id}"
+            )
+
+        expected_items = recording.items.get(observation_index, [])
+
+        if observation.acquired_items != expected_items:
+            return ReplayResult(
+                file_path, step, f"step {step}: acquired items {observation.acquired_items} instead of {expected_items}"
+            )
+
+        if observation.ending is not None or step == len(choices):
+            break
+
+        option_index = choices[step]
+
+        if option_index >= len(observation.options):
+            return ReplayResult(
+                file_path, step, f"step {step}: option {option_index} doesn't exist, there are {len(observation.options)}"
+            )
+
+        path, action = observation.get_option(option_index)
+        game.apply(path, action)
+
+    steps = len(replayed.choices)
+
+    if len(replayed.places) != len(recording.places):
+        return ReplayResult(
+            file_path, steps, f"step {steps}: {len(replayed.places)} places entered instead of {len(recording.places)}"
+        )
+
+    if replayed.ending != recording.ending:
+        return ReplayResult(file_path, steps, f"step {steps}: ending {replayed.ending} instead of {recording.ending}")
+
+    return ReplayResult(file_path, steps)
+
+
+class ReplayReport:
+    def __init__(self):
+        """
+        Aggregated results of replayed recordings.
+        """
+
+        self.replays = 0
+        self.steps = 0
+        self.divergences = []  # ReplayResults of replays that didn't match their recording
+        self.duration = 0.0  # seconds
+
+    def add_result(self, result: ReplayResult) -> None:
+        """
+        Count a replay result.
+
+        Args:
+            result (ReplayResult): Result to add.
+        """
+
+        self.replays += 1
+        self.steps += result.steps
+
+        if result.divergence is not None:
+            self.divergences.append(result)
+
+    @property
+    def throughput(self) -> float:
+        """float: Replays per second."""
+
+        return self.replays / self.duration if self.duration > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "replays": self.replays,
+            "steps": self.steps,
+            "divergences": [
+                {"file": str(result.file_path), "step": result.steps, "divergence": result.divergence}
+                for result in self.divergences
+            ],
+            "duration": self.duration,
+            "throughput": self.throughput,
+        }
+
+    def to_text(self) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        lines = [
+            f"{self.replays} replays ({self.steps} steps) in {self.duration:.2f} s ({self.throughput:.0f} replays/s)",
+            f"Divergences: {len(self.divergences) if len(self.divergences) > 0 else 'none'}",
+        ]
+
+        for result in self.divergences:
+            lines.append(f"  {result.file_path}: {result.divergence}")
+
+        return "\n".join(lines)
+
+
+def replay_files(file_paths: list[FilePath], level_path: str | None = None) -> ReplayReport:
+    """
+    Replay recording files and report all divergences, e.g. to check a level or engine change against recorded
+    play-throughs. Every level is only loaded once.
+
+    Args:
+        file_paths (list[FilePath]): Paths to the recording files.
+        level_path (str | None, optional): Level to replay the recordings on. None for the recorded levels.
+            Default: None
+
+    Returns:
+        ReplayReport: Aggregated results.
+    """
+
+    start_time = perf_counter()
+    report = ReplayReport()
+
+    levels = {}  # path to the level file -> level
+
+    for file_path in file_paths:
+        recording = load_recording(file_path)
+        recording_level_path = level_path if level_path is not None else recording.level_path
+
+        if recording_level_path not in levels:
+            levels[recording_level_path] = load_levels([recording_level_path])[0]
+
+        level = levels[recording_level_path]
+
+        report.add_result(replay(recording, level, file_path))
+
+    report.duration = perf_counter() - start_time
+    return report
@@ -0,0 +1,189 @@
+import io
+import os
+import pickle
+import zlib
+from pathlib import Path as FilePath
+from tempfile import NamedTemporaryFile
+
+from mystics_and_manuscripts.game import Game
+from mystics_and_manuscripts.level import Achievement, Level, Path, Place
+from mystics_and_manuscripts.level.action import Action
+from mystics_and_manuscripts.level.journal import Journal, TrackedList, TrackedObject
+
+# bump when the save format changes, older saves are rejected
+SAVE_FORMAT_VERSION = 1
+SAVE_EXTENSION = ".mmsave"
+
+# the only classes a save may contain (lists, dicts, tuples, strings and numbers don't need a class): level objects
+# created by scripts and data types the saved script globals may hold
+# note: saves can be shared, any other class (or function) could run code while the save is loaded
+SAVE_CLASSES = {
+    (cls.__module__, cls.__qualname__): cls
+    for cls in (Place, Path, Action, Achievement, set, frozenset, bytearray, complex, range, slice)
+}
+
+
+class SavePickler(pickle.Pickler):
+    def __init__(self, file, level: Level):
+        """
+        Pickler writing objects the level was loaded with as references, so only objects created by scripts are saved
+        whole.
+
+        Args:
+            file: Binary file to write to.
+            level (Level): Saved level.
+        """
+
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.level = level
+
+    def persistent_id(self, obj):
+        if isinstance(obj, TrackedObject):
+            return self.level.get_object_reference(obj)
+
+        # objects created by scripts report to the level's journal as well
+        if isinstance(obj, Journal):
+            return "journal"
+
+        return None
+
+    def reducer_override(self, obj):
+        # tracked lists are saved as plain lists, without their journal
+        if isinstance(obj, TrackedList):
+            return list, (list(obj),)
+
+        return NotImplemented
+
+
+class SaveUnpickler(pickle.Unpickler):
+    def __init__(self, file, level: Level):
+        """
+        Unpickler turning references written by SavePickler back into the level's objects. Only the classes in
+        SAVE_CLASSES can be loaded, so loading a save never runs code from it.
+
+        Args:
+            file: Binary file to read from.
+            level (Level): Level the game was saved in.
+        """
+
+        super().__init__(file)
+        self.level = level
+
+        # numbers of the objects references can point to, by the name of their list
+        self.object_counts = {"level": 1, **level.get_loaded_object_counts()}
+
+    def persistent_load(self, pid):
+        if pid == "journal":
+            return self.level.journal
+
+        # references come from the file, so they're checked before the level resolves them
+        if type(pid) is not tuple or len(pid) != 2 or type(pid[0]) is not str or type(pid[1]) is not int \
+                or not 0 <= pid[1] < self.object_counts.get(pid[0], 0):
+            raise pickle.UnpicklingError(f"Invalid reference to a level object: {pid!r}")
+
+        return self.level.get_referenced_object(pid)
+
+    def find_class(self, module_name: str, name: str):
+        cls = SAVE_CLASSES.get((module_name, name))
+
+        if cls is None:
+            raise pickle.UnpicklingError(f"Saves can't contain {module_name}.{name}")
+
+        return cls
+
+
+def create_save_header(level: Level) -> dict:
+    """
+    Create the header identifying the format and the level of a save.
+
+    Args:
+        level (Level): Saved level.
+
+    Returns:
+        dict: Format version, level name and numbers of the objects the level was loaded with.
+    """
+
+    return {
+        "version": SAVE_FORMAT_VERSION,
+        "level": level.name,
+        "loaded_objects": level.get_loaded_object_counts(),
+    }
+
+
+def save_game(game: Game, file_path: str | FilePath) -> None:
+    """
+    Save a play-through. Only the differences from the loaded level are saved (and the registered script globals), so
+    the size of the file doesn't depend on the size of the level.
+
+    Args:
+        game (Game): Game to save.
+        file_path (str | FilePath): Path to the save file.
+    """
+
+    # the level has to hold the game's play-through, not one of its forks
+    game.check_out()
+
+    level = game.level
+    lists, attributes = level.get_changes()
+
+    header = create_save_header(level)
+    state = {
+        "lists": lists,
+        "attributes": attributes,
+        "place": game.current_place,
+        "last_path": game.last_path,
+        "inventory": list(game.inventory),
+        "globals": game.get_saved_globals(),
+    }
+
+    # the header is a separate plain pickle, so it can be checked before any references are resolved
+    buffer = io.BytesIO()
+    pickle.dump(header, buffer, pickle.HIGHEST_PROTOCOL)
+    SavePickler(buffer, level).dump(state)
+
+    file_path = FilePath(file_path)
+
+    # the file is replaced atomically, so a crash while saving never destroys the previous save
+    with NamedTemporaryFile("wb", dir=file_path.parent, suffix=".tmp", delete=False) as f:
+        f.write(zlib.compress(buffer.getvalue()))
+
+    os.replace(f.name, file_path)
+
+
+def load_game(game: Game, file_path: str | FilePath) -> None:
+    """
+    Restore a saved play-through into a game of the same level. The level is reset first. Continue the play-through
+    with "observe" (or "play" without calling "begin").
+
+    Args:
+        game (Game): Game to restore the play-through into.
+        file_path (str | FilePath): Path to the save file.
+
+    Raises:
+        ValueError: The save has an unsupported format or belongs to another level (version).
+        pickle.UnpicklingError: The save contains objects that saves can't contain.
+    """
+
+    level = game.level
+
+    with open(file_path, "rb") as f:
+        buffer = io.BytesIO(zlib.decompress(f.read()))
+
+    header = SaveUnpickler(buffer, level).load()
+
+    if header.get("version") != SAVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported save format version {header.get('version')!r}")
+
+    # references to level objects are positions, they are only valid for the same version of the level
+    if header != create_save_header(level):
+        raise ValueError(f"The save {file_path} doesn't belong to this version of the level {level.name!r}")
+
+    state = SaveUnpickler(buffer, level).load()
+
+    game.check_out()
+    level.apply_changes((state["lists"], state["attributes"]))
+
+    game.current_place = state["place"]
+    game.last_path = state["last_path"]
+    game.inventory = state["inventory"]
+    game.set_saved_globals(state["globals"])
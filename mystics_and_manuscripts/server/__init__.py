@@ -0,0 +1,314 @@
+import asyncio
+import re
+import traceback
+
+from mystics_and_manuscripts.game import Game
+from mystics_and_manuscripts.level import LevelLibrary, get_all_level_paths
+from mystics_and_manuscripts.progress import MemoryAchievementsStore
+from mystics_and_manuscripts.ui.input import Option, find_option
+from mystics_and_manuscripts.ui.output.backends import CLEAR_SEQUENCE, RenderBackend
+from mystics_and_manuscripts.ui.output.display_manager import DisplayManager
+from mystics_and_manuscripts.ui.output.scene import Scene
+from mystics_and_manuscripts.ui.output.sections.level_menu import LevelMenu
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4000
+
+# seconds a session may wait for its player before it's closed
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# longest accepted line of input in bytes, longer lines close the session
+MAX_LINE_LENGTH = 1024
+
+# a session stops producing output while more bytes than this wait to be sent to a slow client
+WRITE_BUFFER_HIGH_WATER_MARK = 64 * 1024
+
+# connections waiting to be accepted, many players may connect at once
+CONNECTION_BACKLOG = 1024
+
+# prompt of the level menu
+MENU_PROMPT = "I choose "
+
+# telnet commands sent by telnet clients: IAC followed by an option negotiation (with its option) or another command
+TELNET_COMMAND_PATTERN = re.compile(rb"\xff[\xfb-\xfe].|\xff[\xf0-\xfa\xff]", re.DOTALL)
+
+
+class SessionClosed(Exception):
+    """
+    Raised when a session ends while waiting for its player: the client disconnected, sent an invalid line or was idle
+    for too long.
+    """
+
+
+class SessionBackend(RenderBackend):
+    def __init__(self, session: "Session"):
+        """
+        Backend sending the frames of a session to its client, clearing the client's terminal with ANSI escape
+        sequences.
+
+        Args:
+            session (Session): The session.
+        """
+
+        self.session = session
+
+    def render(self, text: str) -> None:
+        self.session.write(CLEAR_SEQUENCE + text)
+
+    def write_line(self, text: str) -> None:
+        self.session.write(text + "\n")
+
+
+class Session:
+    def __init__(self, server: "GameServer", reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Connection of one player, telnet-style: the output is text with ANSI escape sequences and every answer is a
+        line. The session has its own display manager, its output is buffered until the player is asked for an answer.
+
+        Args:
+            server (GameServer): Server hosting the session.
+            reader (asyncio.StreamReader): Stream of the player's input.
+            writer (asyncio.StreamWriter): Stream of the output to the player.
+        """
+
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+
+        self.display_manager = DisplayManager(SessionBackend(self))
+        self.game = None
+
+        self.__output = []  # text waiting to be sent, joined into one write
+
+        # stop producing output while the client doesn't keep up, see "flush"
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER_MARK)
+
+    def write(self, text: str) -> None:
+        """
+        Add text to the output. It's sent by the next "flush".
+
+        Args:
+            text (str): The text, lines end with "\\n".
+        """
+
+        self.__output.append(text)
+
+    async def flush(self) -> None:
+        """
+        Send the buffered output. Waits while the client's connection holds too much unsent output.
+
+        Raises:
+            SessionClosed: The client didn't read the output within the idle timeout.
+        """
+
+        if len(self.__output) == 0:
+            return
+
+        # terminals expect telnet line breaks
+        self.writer.write("".join(self.__output).replace("\n", "\r\n").encode())
+        self.__output.clear()
+
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.server.idle_timeout)
+        except asyncio.TimeoutError:
+            raise SessionClosed("not reading")
+
+    async def read_line(self, prompt: str) -> str:
+        """
+        Show a prompt and wait for the player's answer.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            str: The answer without the line break.
+
+        Raises:
+            SessionClosed: The client disconnected, sent a line over MAX_LINE_LENGTH bytes or didn't answer within the
+                idle timeout.
+        """
+
+        self.write(prompt)
+        await self.flush()
+
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.server.idle_timeout)
+        except asyncio.TimeoutError:
+            self.write("\nClosing the session after being idle for too long.\n")
+            await self.flush()
+
+            raise SessionClosed("idle")
+        except (ValueError, ConnectionError):
+            # ValueError: the line is over the reader's limit
+            raise SessionClosed("invalid input")
+
+        if line == b"":
+            raise SessionClosed("disconnected")
+
+        return TELNET_COMMAND_PATTERN.sub(b"", line).decode(errors="replace").strip()
+
+    async def choose_level(self):
+        """
+        Show the level menu and let the player choose a level.
+
+        Returns:
+            The path to the chosen level file, or None to exit.
+        """
+
+        menu_scene = Scene()
+        menu_scene.add_sections(self.server.menu)
+
+        options = [Option(i, manifest.name, manifest.level_file_path) for i, manifest in
+                   enumerate(self.server.manifests)] + [Option("e", "Exit game", None)]
+
+        self.display_manager.new_scene(menu_scene)
+
+        while True:
+            option = find_option(options, await self.read_line(MENU_PROMPT))
+
+            if option is not None:
+                return option.value
+
+            self.display_manager.write_line("Your answer isn't one of the options.")
+
+    async def play(self, level_path: str) -> None:
+        """
+        Play a level until an ending is reached.
+
+        Args:
+            level_path (str): Path to the level file.
+        """
+
+        self.game = self.server.create_game(level_path, self.display_manager)
+
+        # the game asks for answers by yielding prompts (see Game.run), every step runs without interruption
+        play_through = self.game.run()
+        answer = None
+
+        try:
+            while True:
+                try:
+                    prompt = play_through.send(answer)
+                except StopIteration:
+                    break
+
+                answer = await self.read_line(prompt)
+        finally:
+            play_through.close()
+
+            self.game.check_in()
+            self.game = None
+
+    async def run(self) -> None:
+        """
+        Serve the player until they exit or the session is closed.
+        """
+
+        try:
+            while True:
+                level_path = await self.choose_level()
+
+                if level_path is None:
+                    break
+
+                await self.play(level_path)
+        except (SessionClosed, ConnectionError):
+            pass
+        except Exception:
+            # an error of a level script ends only this session
+            traceback.print_exc()
+        finally:
+            self.writer.close()
+
+
+class GameServer:
+    def __init__(self, level_paths: list[str] | None = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_sessions: int | None = None):
+        """
+        Server hosting play-throughs of many players at once in one asyncio event loop. Levels are loaded once and
+        shared by all sessions playing them: a game takes the level over for its steps (see Game.check_out), so
+        switching between sessions only costs their changes of the level. Achievements unlocked on the server aren't
+        saved.
+
+        Args:
+            level_paths (list[str] | None, optional): Paths to the level files. None for all levels in the "levels"
+                folder. Default: None
+            idle_timeout (float, optional): Seconds a session may wait for its player before it's closed.
+                Default: 600.0
+            max_sessions (int | None, optional): Maximal number of sessions at once, new connections over the limit
+                are refused. None for no limit. Default: None
+        """
+
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+
+        # note: the levels are loaded before the server starts, loading blocks the event loop
+        library = LevelLibrary(max_loaded_levels=None)
+
+        self.manifests = library.get_manifests(level_paths if level_paths is not None else get_all_level_paths())
+        self.levels = {
+            manifest.level_file_path: library.get_level(manifest.level_file_path) for manifest in self.manifests
+        }
+
+        # the level menu is shared by all sessions, so its text is only rendered once
+        self.menu = LevelMenu(self.manifests, show_achievements=False)
+
+        self.sessions = set()
+        self.started_sessions = 0
+
+    def create_game(self, level_path: str, display_manager: DisplayManager) -> Game:
+        """
+        Create a new play-through of a level. The game playing the level until now keeps its changes in its snapshot.
+
+        Args:
+            level_path (str): Path to the level file.
+            display_manager (DisplayManager): Display manager of the session.
+
+        Returns:
+            Game: The new game, starting from the loaded state of the level.
+        """
+
+        level = self.levels[level_path]
+
+        if level.owner is not None:
+            level.owner.check_in()
+
+        return Game(level, MemoryAchievementsStore(), display_manager=display_manager)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve a new connection.
+
+        Args:
+            reader (asyncio.StreamReader): Stream of the player's input.
+            writer (asyncio.StreamWriter): Stream of the output to the player.
+        """
+
+        if self.max_sessions is not None and len(self.sessions) >= self.max_sessions:
+            writer.write(b"The server is full, try again later.\r\n")
+            writer.close()
+            return
+
+        session = Session(self, reader, writer)
+
+        self.sessions.add(session)
+        self.started_sessions += 1
+
+        try:
+            await session.run()
+        finally:
+            self.sessions.discard(session)
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """
+        Start accepting connections.
+
+        Args:
+            host (str, optional): Address to listen on. Default: "127.0.0.1"
+            port (int, optional): Port to listen on, 0 for any free one. Default: 4000
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_LENGTH, backlog=CONNECTION_BACKLOG)
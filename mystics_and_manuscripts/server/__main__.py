@@ -0,0 +1,73 @@
+import asyncio
+import json
+from argparse import ArgumentParser
+
+from mystics_and_manuscripts.server import DEFAULT_HOST, DEFAULT_IDLE_TIMEOUT, DEFAULT_PORT, GameServer
+from mystics_and_manuscripts.server.load import LoadReport
+
+parser = ArgumentParser(
+    prog="python -m mystics_and_manuscripts.server",
+    description="Host play-throughs of many players over TCP (connect with telnet or netcat)."
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+serve_parser = subparsers.add_parser("serve", help="start the server")
+serve_parser.add_argument("levels", nargs="*", help="paths to the level files, all levels if none are given")
+serve_parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+serve_parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT,
+                          help=f"port to listen on, 0 for any free one (default: {DEFAULT_PORT})")
+serve_parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                          help=f"seconds before an idle session is closed (default: {DEFAULT_IDLE_TIMEOUT:.0f})")
+serve_parser.add_argument("--max-sessions", type=int, default=None,
+                          help="refuse connections over this number of sessions (default: no limit)")
+
+load_parser = subparsers.add_parser(
+    "load", help="measure the server with many simulated players: step latency and sessions per core"
+)
+load_parser.add_argument("-c", "--sessions", type=int, default=100,
+                         help="number of simulated players at once (default: 100)")
+load_parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds of the measurement (default: 10)")
+load_parser.add_argument("-t", "--think-time", type=float, default=0.0,
+                         help="average seconds a player thinks before answering (default: 0)")
+load_parser.add_argument("-l", "--level", type=int, default=0, help="index of the level in the menu (default: 0)")
+load_parser.add_argument("--connect", metavar="HOST:PORT", default=None,
+                         help="measure a running server instead of starting one (its CPU time isn't measured)")
+load_parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the random options (default: 0)")
+load_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+args = parser.parse_args()
+
+if args.command == "serve":
+    server = GameServer(args.levels if len(args.levels) > 0 else None, args.idle_timeout, args.max_sessions)
+
+    async def serve() -> None:
+        listening_server = await server.start(args.host, args.port)
+        host, port = listening_server.sockets[0].getsockname()[:2]
+
+        # note: the load benchmark waits for this line
+        print(f"Listening on {host}:{port}", flush=True)
+
+        async with listening_server:
+            await listening_server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"Stopped after {server.started_sessions} sessions")
+else:
+    host, port = None, None
+
+    if args.connect is not None:
+        host, _, port = args.connect.rpartition(":")
+
+        if not port.isdigit():
+            parser.error("--connect needs HOST:PORT")
+
+        port = int(port)
+
+    report = LoadReport(args.sessions, args.duration, args.think_time, args.level, host, port, args.seed)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.to_text())
@@ -0,0 +1,313 @@
+import asyncio
+import os
+import re
+import sys
+from random import Random
+from time import perf_counter
+
+from mystics_and_manuscripts.game import CHOOSE_PROMPT
+from mystics_and_manuscripts.ui.output.backends import CLEAR_SEQUENCE
+from mystics_and_manuscripts.ui.output.display_manager import PRESS_ENTER_PROMPT
+
+# answers of the simulated players end with telnet line breaks
+LINE_BREAK = b"\r\n"
+
+# the server ends its output with one of the prompts when it waits for an answer
+PROMPTS = (CHOOSE_PROMPT.encode(), PRESS_ENTER_PROMPT.encode())
+
+# options in the level menu and the option menu of a place look like "3. Name"
+OPTION_PATTERN = re.compile(rb"^(\d+)\. ", re.MULTILINE)
+
+# the level menu is the only menu with this option
+EXIT_OPTION = b"e. Exit game"
+
+# the server prints this line (with its address) once it accepts connections
+LISTENING_PATTERN = re.compile(rb"Listening on (\S+):(\d+)")
+
+# clock ticks of the CPU times in /proc/<pid>/stat
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def get_percentile(sorted_values: list[float], percentile: float) -> float:
+    """
+    Return a percentile of sorted values (the nearest-rank method).
+
+    Args:
+        sorted_values (list[float]): Values in ascending order, at least one.
+        percentile (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The value.
+    """
+
+    index = max(0, min(len(sorted_values) - 1, round(len(sorted_values) * percentile / 100) - 1))
+    return sorted_values[index]
+
+
+def get_process_cpu_time(pid: int) -> float | None:
+    """
+    Return the CPU time a process used so far. Only works on Linux.
+
+    Args:
+        pid (int): ID of the process.
+
+    Returns:
+        float | None: User and system seconds, None if they can't be read.
+    """
+
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # the process name in parentheses may contain spaces, the fields after it are split by spaces
+            fields = f.read().rpartition(")")[2].split()
+    except OSError:
+        return None
+
+    # utime and stime are the 14th and 15th field, counted from the pid
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+class LoadClient:
+    def __init__(self, report: "LoadReport", seed: int):
+        """
+        Simulated player: plays a level over and over, choosing random options, and measures how long the server
+        takes to answer.
+
+        Args:
+            report (LoadReport): Report collecting the measurements.
+            seed (int): Seed of the random options.
+        """
+
+        self.report = report
+        self.rng = Random(seed)
+
+        self.reader = None
+        self.writer = None
+
+    async def read_until_prompt(self) -> bytes:
+        """
+        Read the server's output until it waits for an answer.
+
+        Returns:
+            bytes: The output.
+
+        Raises:
+            ConnectionError: The server closed the connection.
+        """
+
+        output = b""
+
+        while not output.endswith(PROMPTS):
+            chunk = await self.reader.read(65536)
+
+            if chunk == b"":
+                raise ConnectionError("The server closed the connection")
+
+            output += chunk
+
+        return output
+
+    def choose_answer(self, output: bytes) -> bytes:
+        """
+        Choose an answer to the server's output.
+
+        Args:
+            output (bytes): Output ending with a prompt.
+
+        Returns:
+            bytes: The answer without the line break.
+        """
+
+        if output.endswith(PROMPTS[1]):
+            return b""
+
+        # only the last frame is relevant, earlier ones were cleared
+        frame = output.rpartition(CLEAR_SEQUENCE.encode())[2]
+
+        if EXIT_OPTION in frame:
+            return str(self.report.level_index).encode()
+
+        return self.rng.choice(OPTION_PATTERN.findall(frame))
+
+    async def run(self, deadline: float) -> None:
+        """
+        Play until the deadline.
+
+        Args:
+            deadline (float): End of the measurement (perf_counter).
+        """
+
+        self.reader, self.writer = await asyncio.open_connection(self.report.host, self.report.port)
+
+        try:
+            output = await self.read_until_prompt()
+
+            while perf_counter() < deadline:
+                if self.report.think_time > 0:
+                    await asyncio.sleep(self.rng.uniform(0, 2 * self.report.think_time))
+
+                answer = self.choose_answer(output)
+
+                start_time = perf_counter()
+                self.writer.write(answer + LINE_BREAK)
+                output = await self.read_until_prompt()
+
+                self.report.add_step(perf_counter() - start_time, EXIT_OPTION in output)
+        finally:
+            self.writer.close()
+
+
+class LoadReport:
+    def __init__(self, sessions: int = 100, duration: float = 10.0, think_time: float = 0.0, level_index: int = 0,
+                 host: str | None = None, port: int | None = None, seed: int = 0):
+        """
+        Load benchmark of the server: many simulated players at once, each choosing random options. Unless a server
+        address is given, a server is started for the measurement, so its CPU time can be measured as well (on Linux).
+
+        Args:
+            sessions (int, optional): Number of simulated players at once. Default: 100
+            duration (float, optional): Seconds of the measurement. Default: 10.0
+            think_time (float, optional): Average seconds a player thinks before answering. Default: 0.0
+            level_index (int, optional): Index of the played level in the level menu. Default: 0
+            host (str | None, optional): Address of a running server, None to start one. Default: None
+            port (int | None, optional): Port of the running server. Default: None
+            seed (int, optional): Seed of the random options. Default: 0
+        """
+
+        self.sessions = sessions
+        self.duration = duration
+        self.think_time = think_time
+        self.level_index = level_index
+        self.host = host
+        self.port = port
+        self.seed = seed
+
+        self.latencies = []  # seconds from sending an answer to receiving the next prompt
+        self.play_throughs = 0
+        self.server_cpu_time = None  # seconds, None if the server wasn't started by the benchmark (or isn't on Linux)
+
+        asyncio.run(self.__measure())
+
+        self.latencies.sort()
+
+    def add_step(self, latency: float, finished: bool) -> None:
+        """
+        Count an answer of a simulated player.
+
+        Args:
+            latency (float): Seconds until the server asked for the next answer.
+            finished (bool): True if the answer ended a play-through.
+        """
+
+        self.latencies.append(latency)
+
+        if finished:
+            self.play_throughs += 1
+
+    async def __measure(self) -> None:
+        server_process = None
+
+        if self.host is None:
+            server_process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "mystics_and_manuscripts.server", "serve", "--port", "0",
+                stdout=asyncio.subprocess.PIPE
+            )
+
+            match = LISTENING_PATTERN.search(await server_process.stdout.readline())
+
+            if match is None:
+                raise RuntimeError("The server didn't start")
+
+            self.host, self.port = match.group(1).decode(), int(match.group(2))
+
+        try:
+            start_cpu_time = get_process_cpu_time(server_process.pid) if server_process is not None else None
+
+            deadline = perf_counter() + self.duration
+            clients = [LoadClient(self, self.seed + index) for index in range(self.sessions)]
+
+            await asyncio.gather(*(client.run(deadline) for client in clients))
+
+            if start_cpu_time is not None:
+                self.server_cpu_time = get_process_cpu_time(server_process.pid) - start_cpu_time
+        finally:
+            if server_process is not None:
+                server_process.terminate()
+                await server_process.wait()
+
+    @property
+    def server_cpu_usage(self) -> float | None:
+        """float | None: Share of one CPU core the server used, None if unknown."""
+
+        return self.server_cpu_time / self.duration if self.server_cpu_time is not None else None
+
+    @property
+    def sessions_per_core(self) -> float | None:
+        """float | None: Sessions a fully used core could host at the measured pace, None if unknown."""
+
+        usage = self.server_cpu_usage
+        return self.sessions / usage if usage is not None and usage > 0 else None
+
+    def get_latency_percentiles(self) -> dict[str, float]:
+        """
+        Return the step latency percentiles.
+
+        Returns:
+            dict[str, float]: "p50", "p90", "p99" and "max" -> seconds, empty if no step was measured.
+        """
+
+        if len(self.latencies) == 0:
+            return {}
+
+        percentiles = {f"p{percentile}": get_percentile(self.latencies, percentile) for percentile in (50, 90, 99)}
+        percentiles["max"] = self.latencies[-1]
+
+        return percentiles
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        return {
+            "sessions": self.sessions,
+            "duration": self.duration,
+            "think_time": self.think_time,
+            "steps": len(self.latencies),
+            "steps_per_second": len(self.latencies) / self.duration,
+            "play_throughs": self.play_throughs,
+            "latency": self.get_latency_percentiles(),
+            "server_cpu_time": self.server_cpu_time,
+            "sessions_per_core": self.sessions_per_core,
+        }
+
+    def to_text(self) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        lines = [
+            f"{self.sessions} sessions for {self.duration:.0f} s (think time {self.think_time} s): "
+            f"{len(self.latencies)} steps ({len(self.latencies) / self.duration:.0f}/s), "
+            f"{self.play_throughs} finished play-throughs",
+        ]
+
+        percentiles = self.get_latency_percentiles()
+
+        if len(percentiles) > 0:
+            lines.append("Step latency: " + ", ".join(
+                f"{name} {seconds * 1000:.2f} ms" for name, seconds in percentiles.items()
+            ))
+
+        if self.server_cpu_time is not None:
+            lines.append(f"Server CPU: {self.server_cpu_time:.2f} s ({self.server_cpu_usage * 100:.0f}% of a core)")
+
+        if self.sessions_per_core is not None:
+            lines.append(f"Sessions per core at this pace: {self.sessions_per_core:.0f}")
+
+        return "\n".join(lines)
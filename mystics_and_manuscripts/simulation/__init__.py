@@ -0,0 +1,286 @@
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from mystics_and_manuscripts.game import Game
+from mystics_and_manuscripts.level import Level, load_levels
+from mystics_and_manuscripts.progress import MemoryAchievementsStore
+from mystics_and_manuscripts.simulation.policies import Policy, create_policy
+
+# outcomes of play-throughs that didn't reach an ending
+STUCK = "stuck"  # no options left
+UNFINISHED = "unfinished"  # the step limit was reached or the policy stopped playing
+
+
+class PlayThroughResult:
+    def __init__(self, outcome: str, place_id: int, steps: int):
+        """
+        Result of a single simulated play-through.
+
+        Args:
+            outcome (str): The ending ("win", "loss" or "draw"), STUCK or UNFINISHED.
+            place_id (int): ID of the last place.
+            steps (int): Number of chosen options.
+        """
+
+        self.outcome = outcome
+        self.place_id = place_id
+        self.steps = steps
+
+
+def create_headless_game(level: Level) -> Game:
+    """
+    Create a game for a simulated play-through. The level is restored to its original state (the game gets a fresh
+    level script module anyway) and unlocked achievements aren't saved.
+
+    Args:
+        level (Level): Level to play.
+
+    Returns:
+        Game: New game.
+    """
+
+    level.reset()
+
+    return Game(level, MemoryAchievementsStore())
+
+
+def play_through(game: Game, policy: Policy, max_steps: int = 1000) -> PlayThroughResult:
+    """
+    Play a level without any rendering or input.
+
+    Args:
+        game (Game): Game to play.
+        policy (Policy): Policy choosing the options.
+        max_steps (int, optional): Maximal number of chosen options. Default: 1000
+
+    Returns:
+        PlayThroughResult: How the play-through ended.
+    """
+
+    game.begin()
+    steps = 0
+
+    while True:
+        observation = game.observe()
+
+        if observation.ending is not None:
+            return PlayThroughResult(observation.ending, observation.place.id, steps)
+
+        if len(observation.paths) + len(observation.actions) == 0:
+            return PlayThroughResult(STUCK, observation.place.id, steps)
+
+        option_index = policy.choose(observation) if steps < max_steps else None
+
+        if option_index is None:
+            return PlayThroughResult(UNFINISHED, observation.place.id, steps)
+
+        path, action = observation.get_option(option_index)
+        game.apply(path, action)
+
+        steps += 1
+
+
+class SimulationReport:
+    def __init__(self):
+        """
+        Aggregated results of simulated play-throughs.
+        """
+
+        self.runs = 0
+        self.outcomes = Counter()  # outcome -> number of play-throughs
+        self.end_places = Counter()  # ID of the last place -> number of play-throughs
+        self.step_counts = Counter()  # number of steps -> number of play-throughs
+        self.duration = 0.0  # seconds
+
+    def add_result(self, result: PlayThroughResult) -> None:
+        """
+        Count a play-through result.
+
+        Args:
+            result (PlayThroughResult): Result to add.
+        """
+
+        self.runs += 1
+        self.outcomes[result.outcome] += 1
+        self.end_places[result.place_id] += 1
+        self.step_counts[result.steps] += 1
+
+    def merge(self, other: "SimulationReport") -> None:
+        """
+        Add the results of another report.
+
+        Args:
+            other (SimulationReport): Report to add.
+        """
+
+        self.runs += other.runs
+        self.outcomes.update(other.outcomes)
+        self.end_places.update(other.end_places)
+        self.step_counts.update(other.step_counts)
+
+    @property
+    def throughput(self) -> float:
+        """float: Play-throughs per second."""
+
+        return self.runs / self.duration if self.duration > 0 else 0.0
+
+    def get_step_percentile(self, percentile: float) -> int:
+        """
+        Return a percentile of the step counts.
+
+        Args:
+            percentile (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Number of steps.
+        """
+
+        threshold = self.runs * percentile / 100
+        counted = 0
+
+        for steps in sorted(self.step_counts):
+            counted += self.step_counts[steps]
+
+            if counted >= threshold:
+                return steps
+
+        return 0
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Report data.
+        """
+
+        total_steps = sum(steps * count for steps, count in self.step_counts.items())
+
+        return {
+            "runs": self.runs,
+            "outcomes": dict(self.outcomes.most_common()),
+            "end_places": {str(place_id): count for place_id, count in self.end_places.most_common()},
+            "steps": {
+                "mean": total_steps / self.runs if self.runs > 0 else 0.0,
+                "min": min(self.step_counts, default=0),
+                "p50": self.get_step_percentile(50),
+                "p90": self.get_step_percentile(90),
+                "p99": self.get_step_percentile(99),
+                "max": max(self.step_counts, default=0),
+            },
+            "duration": self.duration,
+            "throughput": self.throughput,
+        }
+
+    def to_text(self) -> str:
+        """
+        Return a human-readable summary of the report.
+
+        Returns:
+            str: Summary of the report.
+        """
+
+        report = self.to_dict()
+        lines = [f"{self.runs} play-throughs in {self.duration:.2f} s ({self.throughput:.0f} play-throughs/s)", "", "Outcomes:"]
+
+        for outcome, count in report["outcomes"].items():
+            lines.append(f"  {outcome}: {count} ({count / self.runs:.2%})")
+
+        lines.append("")
+        lines.append("Last places:")
+
+        for place_id, count in report["end_places"].items():
+            lines.append(f"  {place_id}: {count} ({count / self.runs:.2%})")
+
+        steps = report["steps"]
+        lines.append("")
+        lines.append(
+            f"Steps: mean {steps['mean']:.1f}, min {steps['min']}, p50 {steps['p50']}, p90 {steps['p90']}, "
+            f"p99 {steps['p99']}, max {steps['max']}"
+        )
+
+        return "\n".join(lines)
+
+
+def simulate_chunk(level_path: str, policy_name: str, choices: list[int] | None, first_seed: int, runs: int,
+                   max_steps: int) -> SimulationReport:
+    """
+    Simulate play-throughs with consecutive seeds. Runs in the worker processes.
+
+    Args:
+        level_path (str): Path to the level file.
+        policy_name (str): Name of the policy.
+        choices (list[int] | None): Choices of the scripted policy.
+        first_seed (int): Seed of the first play-through.
+        runs (int): Number of play-throughs.
+        max_steps (int): Maximal number of steps of a play-through.
+
+    Returns:
+        SimulationReport: Results of the play-throughs (without the duration).
+    """
+
+    # the level is loaded once per process, every play-through resets it
+    level = load_levels([level_path])[0]
+    policy = create_policy(policy_name, choices)
+    report = SimulationReport()
+
+    for seed in range(first_seed, first_seed + runs):
+        game = create_headless_game(level)
+
+        # the engine picks descriptions and destinations with the "random" module
+        random.seed(seed)
+        policy.reset(seed)
+
+        report.add_result(play_through(game, policy, max_steps))
+
+    return report
+
+
+def simulate(level_path: str, runs: int, policy_name: str = "random", choices: list[int] | None = None,
+             workers: int | None = None, seed: int = 0, max_steps: int = 1000) -> SimulationReport:
+    """
+    Simulate many play-throughs of a level across worker processes. Play-through i uses the seed "seed + i", so results
+    don't depend on the number of workers.
+
+    Args:
+        level_path (str): Path to the level file.
+        runs (int): Number of play-throughs.
+        policy_name (str, optional): Name of the policy (see POLICIES). Default: "random"
+        choices (list[int] | None, optional): Choices of the scripted policy. Default: None
+        workers (int | None, optional): Number of worker processes, 1 to run in this process. None for one per CPU.
+            Default: None
+        seed (int, optional): Seed of the first play-through. Default: 0
+        max_steps (int, optional): Maximal number of steps of a play-through. Default: 1000
+
+    Returns:
+        SimulationReport: Aggregated results.
+    """
+
+    start_time = perf_counter()
+    report = SimulationReport()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        report.merge(simulate_chunk(level_path, policy_name, choices, seed, runs, max_steps))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            # several chunks per worker even out differences in play-through lengths
+            chunk_count = max(1, min(runs, workers * 8))
+            chunk_sizes = [runs // chunk_count + (1 if i < runs % chunk_count else 0) for i in range(chunk_count)]
+            chunk_seeds = [seed + sum(chunk_sizes[:i]) for i in range(chunk_count)]
+
+            futures = [
+                executor.submit(simulate_chunk, level_path, policy_name, choices, chunk_seed, chunk_size, max_steps)
+                for chunk_seed, chunk_size in zip(chunk_seeds, chunk_sizes)
+            ]
+
+            for future in futures:
+                report.merge(future.result())
+
+    report.duration = perf_counter() - start_time
+    return report
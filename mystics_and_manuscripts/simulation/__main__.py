@@ -0,0 +1,28 @@
+import json
+from argparse import ArgumentParser
+
+from mystics_and_manuscripts.simulation import simulate
+from mystics_and_manuscripts.simulation.policies import POLICIES
+
+parser = ArgumentParser(
+    prog="python -m mystics_and_manuscripts.simulation",
+    description="Simulate play-throughs of a level without rendering or input."
+)
+parser.add_argument("level", help="path to the level file, e.g. levels/castle/level.yaml")
+parser.add_argument("-n", "--runs", type=int, default=1000, help="number of play-throughs (default: 1000)")
+parser.add_argument("-p", "--policy", choices=POLICIES, default="random", help="how options are chosen (default: random)")
+parser.add_argument("-c", "--choices", default="", help="comma-separated option indexes for the scripted policy")
+parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first play-through (default: 0)")
+parser.add_argument("--max-steps", type=int, default=1000, help="step limit of a play-through (default: 1000)")
+parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+args = parser.parse_args()
+choices = [int(choice) for choice in args.choices.split(",") if choice.strip() != ""]
+
+report = simulate(args.level, args.runs, args.policy, choices, args.workers, args.seed, args.max_steps)
+
+if args.json:
+    print(json.dumps(report.to_dict(), indent=2))
+else:
+    print(report.to_text())
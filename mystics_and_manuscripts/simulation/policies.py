@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+from random import Random
+
+from mystics_and_manuscripts.observation import Observation
+
+
+class Policy(ABC):
+    """
+    Strategy choosing options in simulated play-throughs.
+    """
+
+    def reset(self, seed: int) -> None:
+        """
+        Prepare for a new play-through.
+
+        Args:
+            seed (int): Seed of the play-through.
+        """
+
+    @abstractmethod
+    def choose(self, observation: Observation) -> int | None:
+        """
+        Choose one of the options.
+
+        Args:
+            observation (Observation): What the player sees, including the options.
+
+        Returns:
+            int | None: Index of the chosen option (same as the number the player would enter) or None to stop playing.
+        """
+
+
+class RandomPolicy(Policy):
+    def __init__(self):
+        """
+        Policy choosing options uniformly at random.
+        """
+
+        self.random = Random()
+
+    def reset(self, seed: int) -> None:
+        self.random.seed(seed)
+
+    def choose(self, observation: Observation) -> int | None:
+        return self.random.randrange(len(observation.paths) + len(observation.actions))
+
+
+class FirstOptionPolicy(Policy):
+    """
+    Policy always choosing the first option.
+    """
+
+    def choose(self, observation: Observation) -> int | None:
+        return 0
+
+
+class ScriptedPolicy(Policy):
+    def __init__(self, choices: list[int]):
+        """
+        Policy choosing predefined options, it stops playing when it runs out of them.
+
+        Args:
+            choices (list[int]): Indexes of the options to choose, in order.
+
+        Raises:
+            ValueError: A choice isn't one of the options offered when it's made (raised by "choose").
+        """
+
+        self.choices = choices
+        self.next_choice = 0
+
+    def reset(self, seed: int) -> None:
+        self.next_choice = 0
+
+    def choose(self, observation: Observation) -> int | None:
+        if self.next_choice >= len(self.choices):
+            return None
+
+        choice = self.choices[self.next_choice]
+
+        if not 0 <= choice < len(observation.options):
+            raise ValueError(f"Scripted choice {self.next_choice} is option {choice}, but the place "
+                             f"{observation.place.id} has {len(observation.options)} options")
+
+        self.next_choice += 1
+        return choice
+
+
+# names of the policies that can be created by "create_policy"
+POLICIES = ("random", "first", "scripted")
+
+
+def create_policy(name: str, choices: list[int] | None = None) -> Policy:
+    """
+    Create a policy by its name.
+
+    Args:
+        name (str): One of POLICIES.
+        choices (list[int] | None, optional): Choices of the scripted policy. Default: None
+
+    Returns:
+        Policy: New policy.
+
+    Raises:
+        ValueError: Unknown policy name.
+    """
+
+    if name == "random":
+        return RandomPolicy()
+
+    if name == "first":
+        return FirstOptionPolicy()
+
+    if name == "scripted":
+        return ScriptedPolicy(choices if choices is not None else [])
+
+    raise ValueError(f"Unknown policy {name!r}, expected one of: {', '.join(POLICIES)}")
@@ -0,0 +1,209 @@
+import atexit
+import os
+from pathlib import Path as FilePath
+from time import perf_counter_ns
+
+# environment variable with the path of the trace file, tracing is enabled when it's set
+TRACE_ENVIRONMENT_VARIABLE = "MM_TRACE"
+
+# categories of the spans, trace viewers can filter and color them
+ENGINE_CATEGORY = "engine"
+HOOK_CATEGORY = "hook"
+IO_CATEGORY = "io"
+INPUT_CATEGORY = "input"
+
+# spans are shown on two tracks (threads in the trace), so the time spent waiting for the player stands apart
+ENGINE_TRACK = 1
+INPUT_TRACK = 2
+TRACK_NAMES = {ENGINE_TRACK: "engine", INPUT_TRACK: "player input"}
+
+
+class NullSpan:
+    """
+    Span returned while tracing is disabled, entering it does nothing.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exception_info) -> None:
+        pass
+
+
+# the only null span, it's shared by all call sites
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "detail", "start_time")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, detail: str | None):
+        """
+        Measured part of the game, added to the trace when it ends. Use as a context manager.
+
+        Args:
+            tracer (Tracer): Tracer collecting the span.
+            name (str): Name of the span, e.g. "observe".
+            category (str): One of the categories, e.g. ENGINE_CATEGORY.
+            detail (str | None): Detail added to the name, e.g. the name of a hook.
+        """
+
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.detail = detail
+        self.start_time = 0
+
+    def __enter__(self) -> "Span":
+        self.start_time = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.tracer.add_span(self.name, self.category, self.detail, self.start_time, perf_counter_ns())
+
+
+class Tracer:
+    def __init__(self, trace_file_path: str | FilePath):
+        """
+        Collector of spans, written as a Chrome trace-event file (JSON), which opens in chrome://tracing, Perfetto or
+        Speedscope.
+
+        Args:
+            trace_file_path (str | FilePath): Path to write the trace to.
+        """
+
+        self.trace_file_path = FilePath(trace_file_path)
+
+        self.events = []
+        self.start_time = perf_counter_ns()
+        self.input_wait_time = 0  # nanoseconds spent waiting for the player
+
+    def add_span(self, name: str, category: str, detail: str | None, start_time: int, end_time: int) -> None:
+        """
+        Add a finished span.
+
+        Args:
+            name (str): Name of the span.
+            category (str): Category of the span.
+            detail (str | None): Detail added to the name.
+            start_time (int): Start in nanoseconds (perf_counter_ns).
+            end_time (int): End in nanoseconds (perf_counter_ns).
+        """
+
+        if category == INPUT_CATEGORY:
+            self.input_wait_time += end_time - start_time
+
+        self.events.append({
+            "name": name if detail is None else f"{name} {detail}",
+            "cat": category,
+            "ph": "X",
+            # timestamps and durations are in microseconds
+            "ts": (start_time - self.start_time) / 1000,
+            "dur": (end_time - start_time) / 1000,
+            "pid": os.getpid(),
+            "tid": INPUT_TRACK if category == INPUT_CATEGORY else ENGINE_TRACK,
+        })
+
+    def to_dict(self) -> dict:
+        """
+        Return the trace in the trace-event format.
+
+        Returns:
+            dict: Trace data.
+        """
+
+        wall_time = perf_counter_ns() - self.start_time
+
+        track_names = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": track, "args": {"name": track_name}}
+            for track, track_name in TRACK_NAMES.items()
+        ]
+
+        return {
+            "traceEvents": track_names + self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "wall_time_ms": wall_time / 1e6,
+                "input_wait_ms": self.input_wait_time / 1e6,
+                "engine_time_ms": (wall_time - self.input_wait_time) / 1e6,
+            },
+        }
+
+    def write(self) -> None:
+        """
+        Write the trace file.
+        """
+
+        # the game imports this module on start, json is only needed once a trace is written
+        import json
+
+        with open(self.trace_file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+
+# tracer collecting the spans, None while tracing is disabled
+_tracer = None
+
+
+def start_tracing(trace_file_path: str | FilePath) -> Tracer:
+    """
+    Start collecting spans. The trace is written when tracing stops or the program exits.
+
+    Args:
+        trace_file_path (str | FilePath): Path to write the trace to.
+
+    Returns:
+        Tracer: The new tracer.
+    """
+
+    global _tracer
+
+    stop_tracing()
+
+    _tracer = Tracer(trace_file_path)
+    atexit.register(stop_tracing)
+
+    return _tracer
+
+
+def stop_tracing() -> None:
+    """
+    Stop collecting spans and write the trace, if tracing is enabled.
+    """
+
+    global _tracer
+
+    if _tracer is None:
+        return
+
+    tracer, _tracer = _tracer, None
+
+    atexit.unregister(stop_tracing)
+    tracer.write()
+
+
+def trace(name: str, category: str = ENGINE_CATEGORY, detail: str | None = None):
+    """
+    Measure a part of the game, use as "with trace("name"): ...". While tracing is disabled, a shared context manager
+    doing nothing is returned, so the cost is a function call.
+
+    Args:
+        name (str): Name of the span, e.g. "observe".
+        category (str, optional): One of the categories, INPUT_CATEGORY for waiting for the player. Default:
+            ENGINE_CATEGORY
+        detail (str | None, optional): Detail added to the name, e.g. the name of a hook. Default: None
+
+    Returns:
+        Span or NULL_SPAN.
+    """
+
+    if _tracer is None:
+        return NULL_SPAN
+
+    return Span(_tracer, name, category, detail)
+
+
+if os.environ.get(TRACE_ENVIRONMENT_VARIABLE):
+    start_tracing(os.environ[TRACE_ENVIRONMENT_VARIABLE])
@@ -1,3 +1,6 @@
+from mystics_and_manuscripts.tracing import INPUT_CATEGORY, trace
+
+
 class Option:
     def __init__(self, index: int | str, name: str, value):
         """
@@ -14,6 +17,21 @@ class Option:
         self.value = value
 
 
+def find_option(options: list[Option], user_input: str) -> Option | None:
+    """
+    Find the option the user chose.
+
+    Args:
+        options (list[Option]): Options the user can choose from.
+        user_input (str): The user's answer.
+
+    Returns:
+        Option | None: The first option with the answer as its index, None if there's none.
+    """
+
+    return next((option for option in options if option.index == user_input), None)
+
+
 def choose_option(options: list[Option]) -> Option:
     """
     Let the user choose from several options.
@@ -26,11 +44,12 @@ def choose_option(options: list[Option]) -> Option:
     """
 
     while True:
-        user_input = input("I choose ")
-
-        try:
-            # find first option that satisfies the user input
-            return [option for option in options if option.index == user_input][0]
-        except IndexError:
-            # when no options are satisfied, using [0] will throw an IndexError
-            print(f"Your answer isn't one of the options.")
+        with trace("choose option", INPUT_CATEGORY):
+            user_input = input("I choose ")
+
+        option = find_option(options, user_input)
+
+        if option is not None:
+            return option
+
+        print(f"Your answer isn't one of the options.")
@@ -0,0 +1,130 @@
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import TextIO
+
+# escape sequences moving the cursor home and clearing the screen and the scrollback
+CLEAR_SEQUENCE = "\033[H\033[2J\033[3J"
+
+# environment variable selecting the render backend when none is given explicitly
+RENDERER_ENVIRONMENT_VARIABLE = "MM_RENDERER"
+DEFAULT_RENDERER = "ansi"
+
+
+class RenderBackend(ABC):
+    @abstractmethod
+    def render(self, text: str) -> None:
+        """
+        Replace everything on the screen by a new frame.
+
+        Args:
+            text (str): Text of the frame.
+        """
+
+    @abstractmethod
+    def write_line(self, text: str) -> None:
+        """
+        Show a line of text below the current frame.
+
+        Args:
+            text (str): The text.
+        """
+
+
+class AnsiBackend(RenderBackend):
+    def __init__(self, stream: TextIO | None = None):
+        """
+        Backend clearing the terminal with ANSI escape sequences. Every frame is written at once.
+
+        Args:
+            stream (TextIO | None, optional): Stream to write to, None for the standard output. Default: None
+        """
+
+        self.stream = stream
+
+    def render(self, text: str) -> None:
+        # the standard output is looked up on every frame, so it can be redirected
+        stream = self.stream if self.stream is not None else sys.stdout
+
+        stream.write(CLEAR_SEQUENCE + text)
+        stream.flush()
+
+    def write_line(self, text: str) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+
+        stream.write(text + "\n")
+        stream.flush()
+
+
+class NullBackend(RenderBackend):
+    """
+    Backend that doesn't show anything, used by headless runs.
+    """
+
+    def render(self, text: str) -> None:
+        pass
+
+    def write_line(self, text: str) -> None:
+        pass
+
+
+class RecordingBackend(RenderBackend):
+    def __init__(self):
+        """
+        Backend keeping all frames in memory instead of showing them, used by tests.
+        """
+
+        self.frames = []
+        self.lines = []  # lines written below the frames
+
+    @property
+    def last_frame(self) -> str | None:
+        """str | None: The most recent frame, None if nothing was rendered yet."""
+
+        return self.frames[-1] if len(self.frames) > 0 else None
+
+    def render(self, text: str) -> None:
+        self.frames.append(text)
+
+    def write_line(self, text: str) -> None:
+        self.lines.append(text)
+
+    def clear(self) -> None:
+        """
+        Forget the recorded frames and lines.
+        """
+
+        self.frames.clear()
+        self.lines.clear()
+
+
+# name -> backend class
+RENDER_BACKENDS = {
+    "ansi": AnsiBackend,
+    "null": NullBackend,
+    "recording": RecordingBackend,
+}
+
+
+def create_render_backend(name: str | None = None) -> RenderBackend:
+    """
+    Create a render backend by its name.
+
+    Args:
+        name (str | None, optional): One of RENDER_BACKENDS. None to use the MM_RENDERER environment variable, or the
+            ANSI backend when it isn't set. Default: None
+
+    Returns:
+        RenderBackend: New backend.
+
+    Raises:
+        ValueError: Unknown backend.
+    """
+
+    if name is None:
+        name = os.environ.get(RENDERER_ENVIRONMENT_VARIABLE) or DEFAULT_RENDERER
+
+    if name not in RENDER_BACKENDS:
+        raise ValueError(f"Unknown renderer {name!r}, expected one of: {', '.join(RENDER_BACKENDS)}")
+
+    return RENDER_BACKENDS[name]()
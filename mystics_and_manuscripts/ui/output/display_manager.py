@@ -1,40 +1,83 @@
-import os
-
+from mystics_and_manuscripts.tracing import INPUT_CATEGORY, trace
+from mystics_and_manuscripts.ui.output.backends import RenderBackend, create_render_backend
 from mystics_and_manuscripts.ui.output.scene import Scene
-from mystics_and_manuscripts.utils import Singleton
+
+# prompt asking the player to continue
+PRESS_ENTER_PROMPT = "Press ENTER to continue..."
 
 
-class DisplayManager(metaclass=Singleton):
-    def __init__(self):
+class DisplayManager:
+    def __init__(self, backend: RenderBackend | None = None):
         """
-        Manager of all visuals.
+        Manager of all visuals of one player, the terminal's or a server session's. It reads the player's answers as
+        well.
+
+        Args:
+            backend (RenderBackend | None, optional): Backend showing the scenes. None to pick one by the MM_RENDERER
+                environment variable. Default: None
         """
 
         self.current_scene = Scene()
+        self.backend = backend if backend is not None else create_render_backend()
 
-    @staticmethod
-    def stop() -> None:
+    def stop(self) -> None:
         """
         Stop the execution of the code and wait for the player to press ENTER.
         """
 
-        input("Press ENTER to continue...")
+        self.read_line(PRESS_ENTER_PROMPT)
+
+    def read_line(self, prompt: str) -> str:
+        """
+        Show a prompt and wait for the player's answer.
+
+        Args:
+            prompt (str): The prompt, e.g. "I choose ".
+
+        Returns:
+            str: The answer without the line break.
+        """
+
+        with trace("wait for input", INPUT_CATEGORY, prompt.strip()):
+            return input(prompt)
+
+    def write_line(self, text: str) -> None:
+        """
+        Show a line of text below the current scene, e.g. an error message.
+
+        Args:
+            text (str): The text.
+        """
+
+        self.backend.write_line(text)
+
+    def set_backend(self, backend: RenderBackend) -> None:
+        """
+        Show the next scenes with a different backend.
+
+        Args:
+            backend (RenderBackend): New backend.
+        """
+
+        self.backend = backend
 
     def __update(self):
         """
         Update the text in the console.
         """
 
-        # clear console based on the operating system
-        os.system('cls' if os.name == 'nt' else 'clear')
+        with trace("compose scene"):
+            text = self.current_scene.to_text()
 
-        text = self.current_scene.to_text()
-        print(text, end="")
+        # drawing includes clearing the screen
+        with trace("draw"):
+            self.backend.render(text)
 
     def new_scene(self, scene: Scene):
         """
         Replace the current scene by a new one.
         """
 
-        self.current_scene = scene
-        self.__update()
+        with trace("new scene"):
+            self.current_scene = scene
+            self.__update()
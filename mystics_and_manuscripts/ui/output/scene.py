@@ -30,20 +30,22 @@ class Scene:
 
         first_section = self.sections[0]
 
-        text = first_section.to_text()
+        # the text is joined once at the end, concatenating it section by section would copy it over and over
+        fragments = [first_section.to_text()]
         bottom_padding = first_section.padding_bottom
 
         for section in self.sections[1:]:
             if section.padding_top < bottom_padding:
-                text += section.to_text(disable_top_padding=True)
+                fragments.append(section.to_text(disable_top_padding=True))
                 bottom_padding = section.padding_bottom
                 continue
 
-            # remove previous bottom padding
+            # remove previous bottom padding (the last fragment always ends with it)
             # note: the if condition is there because -0 index doesn't work and just deletes the whole text
-            text = text if bottom_padding == 0 else text[:-bottom_padding]
+            if bottom_padding != 0:
+                fragments[-1] = fragments[-1][:-bottom_padding]
 
-            text += section.to_text()
+            fragments.append(section.to_text())
             bottom_padding = section.padding_bottom
 
-        return text
+        return "".join(fragments)
@@ -1,4 +1,7 @@
 class Section:
+    # True for sections whose content and paddings never change, their text is only rendered once
+    cache_text = False
+
     def __init__(self, content: str, padding_top: int = 0, padding_bottom: int = 0):
         """
         Section/Paragraph of a text.
@@ -9,10 +12,13 @@ class Section:
             padding_bottom (int, optional): Number of empty lines below the content. Default: 0
         """
 
-        self.__content = content
+        # remove trailing new-lines from the end
+        self.__content = content.rstrip("\n")
         self.padding_top = padding_top
         self.padding_bottom = padding_bottom
 
+        self.__cached_texts = {}  # disable_top_padding -> text
+
     def to_text(self, disable_top_padding: bool = False) -> str:
         """
         Return a text representation of the section.
@@ -24,12 +30,17 @@ class Section:
             str: Content with top and bottom paddings.
         """
 
-        # remove trailing new-lines from the end
-        content = self.__content.rstrip("\n")
+        if self.cache_text and disable_top_padding in self.__cached_texts:
+            return self.__cached_texts[disable_top_padding]
 
         # the +1 after padding_bottom is just so that the next section's text is on another line
         # only after that can you add emtpy lines
         # otherwise, if you concat the text it's all going to be on one line and not as separate sections
-        return "\n" * (0 if disable_top_padding else self.padding_top) \
-            + content \
+        text = "\n" * (0 if disable_top_padding else self.padding_top) \
+            + self.__content \
             + "\n" * (self.padding_bottom + 1)
+
+        if self.cache_text:
+            self.__cached_texts[disable_top_padding] = text
+
+        return text
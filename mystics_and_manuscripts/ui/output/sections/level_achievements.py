@@ -1,18 +1,17 @@
-import json
-
 from colorama import Style
 
-from mystics_and_manuscripts.level import Level
+from mystics_and_manuscripts.level import Level, LevelManifest
+from mystics_and_manuscripts.progress import get_achievements_store, get_unlocked_achievements
 from mystics_and_manuscripts.ui.output.scene import Scene
 from mystics_and_manuscripts.ui.output.sections import Section
 
 
-def create_achievements_scene(levels: list[Level]) -> Scene:
+def create_achievements_scene(levels: list[LevelManifest | Level]) -> Scene:
     """
     Create a scene with all unlocked achievements.
 
     Args:
-        levels (list[Level]): Levels to get achievements from.
+        levels (list[LevelManifest | Level]): Levels to get achievements from.
 
     Returns:
         Scene: Scene with unlocked achievements.
@@ -20,35 +19,33 @@ def create_achievements_scene(levels: list[Level]) -> Scene:
 
     scene = Scene()
 
-    for level in levels:
-        scene.add_sections(LevelAchievements(level))
+    # get unlocked achievements of all levels at once (a single query with the sqlite progress backend)
+    unlocked_achievement_ids = get_unlocked_achievements(levels)
+
+    for level, level_unlocked_achievement_ids in zip(levels, unlocked_achievement_ids):
+        scene.add_sections(LevelAchievements(level, level_unlocked_achievement_ids))
 
     return scene
 
 
 class LevelAchievements(Section):
-    def __init__(self, level: Level):
+    def __init__(self, level: LevelManifest | Level, unlocked_achievement_ids: set[int] | None = None):
         """
         Section with all unlocked achievements from a level.
 
         Args:
-            level (Level): Level to get achievements from.
+            level (LevelManifest | Level): Level to get achievements from.
+            unlocked_achievement_ids (set[int] | None, optional): IDs of unlocked achievements. None to get them from
+                the level's achievements store (shared with play-throughs). Default: None
         """
 
-        # get all level achievements and the file with unlocked achievements
         achievements = level.achievements
-        achievements_file = level.achievements_file_path
-
-        # base assumption: achievements file doesn't exist
-        unlocked_achievements_ids = []
 
-        # load unlocked achievements
-        if achievements_file.is_file():
-            with open(achievements_file, "r") as f:
-                unlocked_achievements_ids = json.load(f)
+        if unlocked_achievement_ids is None:
+            unlocked_achievement_ids = set(get_achievements_store(level).get_unlocked())
 
         # turn achievement IDs into achievement objects
-        unlocked_achievements = [a for a in achievements if a.id in unlocked_achievements_ids]
+        unlocked_achievements = [a for a in achievements if a.id in unlocked_achievement_ids]
 
         # add name of the level and general info
         text = f"{Style.BRIGHT}{level.name}{Style.RESET_ALL} ({len(unlocked_achievements)}/{len(achievements)})"
@@ -1,20 +1,25 @@
-from mystics_and_manuscripts.level import Level
+from mystics_and_manuscripts.level import LevelManifest
 from mystics_and_manuscripts.ui.output.sections import Section
 
 
 class LevelMenu(Section):
-    def __init__(self, levels: list[Level]):
+    cache_text = True
+
+    def __init__(self, levels: list[LevelManifest], show_achievements: bool = True):
         """
             Print a selection menu for the levels.
 
             Args:
-                levels (list[Level]): List of levels.
+                levels (list[LevelManifest]): List of level manifests.
+                show_achievements (bool, optional): True to offer opening the achievements. Default: True
             """
 
         text = "\n".join([f"{i}. {level.name}" for i, level in enumerate(levels)])
 
         # add extra options
         text += "\ne. Exit game"
-        text += "\na. Open achievements"
+
+        if show_achievements:
+            text += "\na. Open achievements"
 
         super().__init__(text)
@@ -1,7 +1,14 @@
+from functools import lru_cache
+
 from mystics_and_manuscripts.ui.output.sections import Section
 
+# number of title sections kept by "get_title_section", the most recently used ones
+TITLE_SECTION_CACHE_SIZE = 1024
+
 
 class TitleSection(Section):
+    cache_text = True
+
     def __init__(self, content: str):
         """
         Section for quick title creation.
@@ -15,3 +22,18 @@ class TitleSection(Section):
 
         text = "-" * separator_length + "\n" + " " * 4 + content + "\n" + "-" * separator_length
         super().__init__(text)
+
+
+@lru_cache(maxsize=TITLE_SECTION_CACHE_SIZE)
+def get_title_section(content: str) -> TitleSection:
+    """
+    Return a title section, shared by all scenes with the same title, so its text is only rendered once.
+
+    Args:
+        content (str): Text to put in the title.
+
+    Returns:
+        TitleSection: The section.
+    """
+
+    return TitleSection(content)
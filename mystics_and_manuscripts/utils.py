@@ -1,3 +1,4 @@
+from sys import intern
 from typing import Type
 
 
@@ -17,6 +18,27 @@ def value_or_default(dictionary: dict, key, default):
     return dictionary.get(key) if dictionary.get(key) is not None else default
 
 
+def intern_text(value):
+    """
+    Intern a string, or every string of a list. Level files repeat many strings (item names, path names, ...), interned
+    ones are stored only once.
+
+    Args:
+        value: String, list of strings or any other value.
+
+    Returns:
+        The interned string, a tuple of the interned strings for lists, other values unchanged.
+    """
+
+    if isinstance(value, str):
+        return intern(value)
+
+    if isinstance(value, list):
+        return tuple(intern(item) if isinstance(item, str) else item for item in value)
+
+    return value
+
+
 def mirror_or_empty(dictionary: dict, key, mirror_class: Type) -> list:
     """
     Convert list items to their mirror if the list isn't None, return an empty list otherwise.
@@ -32,11 +54,3 @@ def mirror_or_empty(dictionary: dict, key, mirror_class: Type) -> list:
 
     return [mirror_class(item) for item in dictionary[key]] if dictionary.get(key) is not None else []
 
-
-class Singleton(type):
-    _instances = {}
-
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
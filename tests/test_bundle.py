@@ -0,0 +1,65 @@
+import shutil
+import struct
+from pathlib import Path as FilePath
+
+import pytest
+
+from mystics_and_manuscripts.level import LevelLibrary
+from mystics_and_manuscripts.level.bundle import (BUNDLE_FORMAT_VERSION, HEADER, LevelBundle, compile_level_file,
+                                                  open_bundle)
+
+CASTLE_FOLDER_PATH = FilePath(__file__).parent.parent / "levels" / "castle"
+
+
+@pytest.fixture
+def level_file_path(tmp_path):
+    for file_name in ("level.yaml", "level.py"):
+        shutil.copy2(CASTLE_FOLDER_PATH / file_name, tmp_path / file_name)
+
+    return tmp_path / "level.yaml"
+
+
+def set_bundle_format_version(bundle_file_path: FilePath, version: int) -> None:
+    content = bytearray(bundle_file_path.read_bytes())
+    struct.pack_into("=I", content, struct.calcsize("=4s"), version)
+
+    bundle_file_path.write_bytes(bytes(content))
+
+
+def test_current_bundle_is_opened(level_file_path):
+    compile_level_file(level_file_path)
+
+    with open_bundle(level_file_path) as bundle:
+        assert bundle.name == LevelLibrary().get_manifests([str(level_file_path)])[0].name
+
+
+def test_old_bundle_is_ignored(level_file_path):
+    bundle_file_path = compile_level_file(level_file_path)
+    set_bundle_format_version(bundle_file_path, BUNDLE_FORMAT_VERSION - 1)
+
+    with pytest.warns(UserWarning, match="another format version"):
+        assert open_bundle(level_file_path) is None
+
+
+def test_old_bundle_falls_back_to_level_file(level_file_path):
+    bundle_file_path = compile_level_file(level_file_path)
+    set_bundle_format_version(bundle_file_path, BUNDLE_FORMAT_VERSION - 1)
+
+    library = LevelLibrary()
+
+    with pytest.warns(UserWarning):
+        manifest = library.get_manifests([str(level_file_path)])[0]
+        level = library.get_level(str(level_file_path))
+
+    assert level.name == manifest.name
+    assert len(level.places) > 0
+
+
+def test_old_bundle_opened_directly_raises(level_file_path):
+    bundle_file_path = compile_level_file(level_file_path)
+    set_bundle_format_version(bundle_file_path, BUNDLE_FORMAT_VERSION - 1)
+
+    assert HEADER.unpack_from(bundle_file_path.read_bytes())[1] == BUNDLE_FORMAT_VERSION - 1
+
+    with pytest.raises(ValueError, match="another format version"):
+        LevelBundle(bundle_file_path)
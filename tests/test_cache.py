@@ -0,0 +1,55 @@
+import os
+import pickle
+import shutil
+from pathlib import Path as FilePath
+
+import pytest
+
+from mystics_and_manuscripts.level.cache import (CACHE_HEADER, get_cache_file_path, load_level_dict, parse_yaml,
+                                                 read_level_file)
+
+CASTLE_FOLDER_PATH = FilePath(__file__).parent.parent / "levels" / "castle"
+
+
+class CreatesFolder:
+    def __init__(self, folder_path: FilePath):
+        self.folder_path = folder_path
+
+    def __reduce__(self):
+        return os.mkdir, (str(self.folder_path),)
+
+
+@pytest.fixture
+def level_file_path(tmp_path):
+    shutil.copy2(CASTLE_FOLDER_PATH / "level.yaml", tmp_path / "level.yaml")
+    return tmp_path / "level.yaml"
+
+
+def test_cached_level_matches_yaml(level_file_path):
+    level_dict = parse_yaml(level_file_path.read_bytes())
+
+    assert load_level_dict(level_file_path) == level_dict
+    assert get_cache_file_path(level_file_path).exists()
+    assert load_level_dict(level_file_path) == level_dict
+
+
+def test_cache_running_code_is_rejected(level_file_path, tmp_path):
+    load_level_dict(level_file_path)
+
+    # a cache file with a valid header, the payload would create a folder when unpickled
+    _, key = read_level_file(level_file_path)
+    get_cache_file_path(level_file_path).write_bytes(key + pickle.dumps(CreatesFolder(tmp_path / "created")))
+
+    assert load_level_dict(level_file_path) == parse_yaml(level_file_path.read_bytes())
+    assert not (tmp_path / "created").exists()
+
+
+def test_cache_of_changed_level_is_ignored(level_file_path):
+    load_level_dict(level_file_path)
+
+    cache_file_path = get_cache_file_path(level_file_path)
+    cache_file_path.write_bytes(cache_file_path.read_bytes()[:CACHE_HEADER.size] + pickle.dumps({"name": "Stale"}))
+
+    level_file_path.write_bytes(level_file_path.read_bytes().replace(b"name:", b"name: ", 1))
+
+    assert load_level_dict(level_file_path)["name"] != "Stale"
@@ -0,0 +1,45 @@
+from pathlib import Path as FilePath
+
+import pytest
+
+from mystics_and_manuscripts.level import load_levels
+from mystics_and_manuscripts.simulation import create_headless_game
+
+LEVEL_PATH = FilePath(__file__).parent.parent / "levels" / "castle" / "level.yaml"
+
+
+@pytest.fixture
+def game():
+    game = create_headless_game(load_levels([str(LEVEL_PATH)])[0])
+    game.begin()
+
+    return game
+
+
+def test_fork_globals_are_independent(game):
+    game.level_script.notes = []
+    game.level_script.saved_globals.append("notes")
+
+    fork = game.fork()
+    fork.level_script.notes.append(1)
+    fork.level_script.saved_globals.remove("drink_wine_attempts")
+
+    assert game.get_saved_globals()["notes"] == []
+    assert "drink_wine_attempts" in game.level_script.saved_globals
+    assert fork.get_saved_globals()["notes"] == [1]
+
+
+def test_fork_globals_share_level_objects(game):
+    game.level_script.hall = game.level.places[0]
+
+    fork = game.fork()
+
+    assert fork.level_script.hall is game.level.places[0]
+
+
+def test_fork_functions_use_fork_globals(game):
+    fork = game.fork()
+    fork.level_script.drink_wine_attempts = 5
+
+    assert fork.hooks is not game.hooks
+    assert game.level_script.drink_wine_attempts == 0
@@ -0,0 +1,40 @@
+import pytest
+
+from mystics_and_manuscripts.game import Game
+from mystics_and_manuscripts.ui.output.backends import RenderBackend
+from mystics_and_manuscripts.ui.output.display_manager import DisplayManager
+
+
+class LineBackend(RenderBackend):
+    def __init__(self):
+        self.lines = []
+
+    def render(self, text: str) -> None:
+        pass
+
+    def write_line(self, text: str) -> None:
+        self.lines.append(text)
+
+
+def test_select_path_or_action_reads_until_valid(monkeypatch):
+    answers = iter(["north", "5", "-1", "2"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+
+    backend = LineBackend()
+
+    with pytest.deprecated_call():
+        choice = Game.select_path_or_action(["path 0", "path 1"], ["action 0"], DisplayManager(backend))
+
+    assert choice == (None, "action 0")
+    assert backend.lines == ["You must enter a number between 0 and 2"] * 3
+
+
+def test_choose_path_or_action_is_sent_answers():
+    chooser = Game.choose_path_or_action(["path 0", "path 1"], [], DisplayManager(LineBackend()))
+
+    assert next(chooser) == "I choose "
+
+    with pytest.raises(StopIteration) as stop:
+        chooser.send("1")
+
+    assert stop.value.value == ("path 1", None)
@@ -0,0 +1,17 @@
+from mystics_and_manuscripts.level import LevelLibrary
+from mystics_and_manuscripts.level.generator import LevelGenerator
+
+
+def test_small_level_has_no_multi_destination_paths(tmp_path):
+    level_file_path = LevelGenerator(2, multi_destination_share=1.0).write(tmp_path)
+    level = LevelLibrary().get_level(str(level_file_path))
+
+    assert len(level.places) == 2
+    assert all(len(path.places) == 2 for path in level.paths)
+
+
+def test_multi_destination_paths(tmp_path):
+    level_file_path = LevelGenerator(3, multi_destination_share=1.0).write(tmp_path)
+    level = LevelLibrary().get_level(str(level_file_path))
+
+    assert any(len(path.places) == 3 for path in level.paths)
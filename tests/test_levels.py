@@ -0,0 +1,46 @@
+from pathlib import Path as FilePath
+
+from mystics_and_manuscripts.level import LevelLibrary, load_levels
+from mystics_and_manuscripts.simulation import create_headless_game
+
+LEVEL_PATH = str(FilePath(__file__).parent.parent / "levels" / "castle" / "level.yaml")
+
+
+def test_load_levels_creates_new_levels():
+    level = load_levels([LEVEL_PATH])[0]
+    level.places[0].visited = True
+
+    other_level = load_levels([LEVEL_PATH])[0]
+
+    assert other_level is not level
+    assert not other_level.places[0].visited
+    assert level.places[0].visited
+
+
+def test_library_reuses_levels():
+    library = LevelLibrary()
+    level = library.get_level(LEVEL_PATH)
+    level.places[0].visited = True
+
+    assert library.get_level(LEVEL_PATH) is level
+    assert not level.places[0].visited
+
+
+def test_library_drops_least_recently_used_levels():
+    library = LevelLibrary(max_loaded_levels=0)
+    level = library.get_level(LEVEL_PATH)
+
+    assert len(library.loaded_levels) == 0
+    assert library.get_level(LEVEL_PATH) is not level
+
+
+def test_reset_level_has_no_owner():
+    level = load_levels([LEVEL_PATH])[0]
+    game = create_headless_game(level)
+    game.begin()
+
+    assert level.owner is game
+
+    level.reset()
+
+    assert level.owner is None
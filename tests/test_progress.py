@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+from mystics_and_manuscripts import progress
+from mystics_and_manuscripts.progress import DEFAULT_FLUSH_INTERVAL, get_flush_interval
+
+
+@pytest.fixture(autouse=True)
+def default_settings(monkeypatch):
+    monkeypatch.setitem(progress._settings, "flush_interval", None)
+
+
+def test_flush_interval_from_environment(monkeypatch):
+    monkeypatch.setenv("MM_FLUSH_INTERVAL", "2.5")
+
+    assert get_flush_interval() == 2.5
+
+
+@pytest.mark.parametrize("value", ["soon", "-1", "nan"])
+def test_malformed_flush_interval_is_ignored(monkeypatch, value):
+    monkeypatch.setenv("MM_FLUSH_INTERVAL", value)
+
+    with pytest.warns(UserWarning, match="MM_FLUSH_INTERVAL"):
+        assert get_flush_interval() == DEFAULT_FLUSH_INTERVAL
+
+
+def test_configured_flush_interval_wins(monkeypatch):
+    monkeypatch.setenv("MM_FLUSH_INTERVAL", "soon")
+    monkeypatch.setitem(progress._settings, "flush_interval", 0.0)
+
+    assert get_flush_interval() == 0.0
+
+
+def test_import_with_malformed_flush_interval(monkeypatch):
+    monkeypatch.setenv("MM_FLUSH_INTERVAL", "soon")
+
+    subprocess.run([sys.executable, "-c", "import mystics_and_manuscripts.progress"], check=True)
@@ -0,0 +1,116 @@
+import io
+import os
+import pickle
+import zlib
+from pathlib import Path as FilePath
+
+import pytest
+
+from mystics_and_manuscripts.level import Achievement, Path, load_levels
+from mystics_and_manuscripts.saving import create_save_header, load_game, save_game
+from mystics_and_manuscripts.simulation import create_headless_game
+
+LEVEL_PATH = FilePath(__file__).parent.parent / "levels" / "castle" / "level.yaml"
+
+
+class RunsCode:
+    def __reduce__(self):
+        return os.system, ("exit 3",)
+
+
+@pytest.fixture(scope="module")
+def level():
+    return load_levels([str(LEVEL_PATH)])[0]
+
+
+def play(game, choices):
+    game.begin()
+
+    for choice in choices:
+        observation = game.observe()
+        game.apply(*observation.get_option(choice))
+
+
+def test_save_round_trip(level, tmp_path):
+    game = create_headless_game(level)
+    play(game, [0, 0, 0])
+
+    # changes of loaded objects, objects created by scripts and script globals
+    level.places[1].description = "A changed description."
+    level.paths[0].visited = True
+    level.paths.append(Path({"places": [level.places[0].id, level.places[1].id], "name": "Secret passage"}))
+    level.achievements[0].name = "Renamed"
+    level.achievements.append(Achievement({"id": 1000, "name": "Added", "description": "Added by a script."}))
+    game.level_script.drink_wine_attempts = 3
+    game.level_script.fake_throne_room_discovered = True
+
+    save_game(game, tmp_path / "game.mmsave")
+    place, inventory = game.current_place, list(game.inventory)
+    places, paths = [dict(place) for place in level.places], [dict(path) for path in level.paths]
+    achievements = [dict(achievement) for achievement in level.achievements]
+    visited = [path.visited for path in level.paths]
+
+    loaded_game = create_headless_game(level)
+
+    assert level.paths[0].visited is False
+    assert loaded_game.level_script.drink_wine_attempts == 0
+
+    load_game(loaded_game, tmp_path / "game.mmsave")
+
+    assert loaded_game.current_place is place
+    assert list(loaded_game.inventory) == inventory
+    assert [dict(place) for place in level.places] == places
+    assert [dict(path) for path in level.paths] == paths
+    assert [path.visited for path in level.paths] == visited
+    assert [dict(achievement) for achievement in level.achievements] == achievements
+    assert level.get_achievement_by_id(1000).name == "Added"
+    assert loaded_game.get_saved_globals() == {"fake_throne_room_discovered": True, "drink_wine_attempts": 3}
+
+
+def test_save_running_code_is_rejected(level, tmp_path):
+    game = create_headless_game(level)
+
+    buffer = io.BytesIO()
+    pickle.dump(create_save_header(level), buffer)
+    pickle.dump({"lists": [], "attributes": [], "globals": {"payload": RunsCode()}}, buffer)
+
+    save_file_path = tmp_path / "shared.mmsave"
+    save_file_path.write_bytes(zlib.compress(buffer.getvalue()))
+
+    with pytest.raises(pickle.UnpicklingError, match="posix.system|nt.system"):
+        load_game(game, save_file_path)
+
+
+def test_header_running_code_is_rejected(level, tmp_path):
+    game = create_headless_game(level)
+
+    save_file_path = tmp_path / "shared.mmsave"
+    save_file_path.write_bytes(zlib.compress(pickle.dumps(RunsCode())))
+
+    with pytest.raises(pickle.UnpicklingError):
+        load_game(game, save_file_path)
+
+
+class InvalidReferencePickler(pickle.Pickler):
+    def __init__(self, file, reference):
+        super().__init__(file)
+        self.reference = reference
+
+    def persistent_id(self, obj):
+        return self.reference if isinstance(obj, RunsCode) else None
+
+
+@pytest.mark.parametrize("reference", [("places", 10 ** 6), ("places", -1), ("level", 1), ("nothing", 0),
+                                       ["places", 0], "places", ("places", "0")])
+def test_invalid_reference_is_rejected(level, tmp_path, reference):
+    game = create_headless_game(level)
+
+    buffer = io.BytesIO()
+    pickle.dump(create_save_header(level), buffer)
+    InvalidReferencePickler(buffer, reference).dump({"lists": [], "attributes": [], "place": RunsCode()})
+
+    save_file_path = tmp_path / "invalid.mmsave"
+    save_file_path.write_bytes(zlib.compress(buffer.getvalue()))
+
+    with pytest.raises(pickle.UnpicklingError, match="Invalid reference"):
+        load_game(game, save_file_path)
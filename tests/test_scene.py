@@ -0,0 +1,98 @@
+from itertools import product
+from random import Random
+
+import pytest
+
+from mystics_and_manuscripts.ui.output.scene import Scene
+from mystics_and_manuscripts.ui.output.sections import Section
+from mystics_and_manuscripts.ui.output.sections.title_section import TitleSection, get_title_section
+
+
+def to_text_by_concatenation(sections: list[Section]) -> str:
+    """
+    Compose sections the way Scene.to_text did before it joined fragments: by "+=" and slicing the whole text.
+    """
+
+    def section_to_text(section: Section, disable_top_padding: bool = False) -> str:
+        return "\n" * (0 if disable_top_padding else section.padding_top) \
+            + section.content.rstrip("\n") \
+            + "\n" * (section.padding_bottom + 1)
+
+    if len(sections) == 0:
+        return ""
+
+    text = section_to_text(sections[0])
+    bottom_padding = sections[0].padding_bottom
+
+    for section in sections[1:]:
+        if section.padding_top < bottom_padding:
+            text += section_to_text(section, disable_top_padding=True)
+            bottom_padding = section.padding_bottom
+            continue
+
+        text = text if bottom_padding == 0 else text[:-bottom_padding]
+
+        text += section_to_text(section)
+        bottom_padding = section.padding_bottom
+
+    return text
+
+
+class GoldenSection(Section):
+    def __init__(self, content: str, padding_top: int = 0, padding_bottom: int = 0):
+        super().__init__(content, padding_top, padding_bottom)
+
+        # the content as given, for the reference composition
+        self.content = content
+
+
+def compose(*sections: Section) -> str:
+    scene = Scene()
+    scene.add_sections(*sections)
+
+    return scene.to_text()
+
+
+def test_empty_scene():
+    assert compose() == ""
+
+
+@pytest.mark.parametrize("padding_bottom, padding_top", list(product(range(4), repeat=2)))
+def test_padding_collapse_matches_concatenation(padding_bottom, padding_top):
+    sections = [GoldenSection("first\n", padding_bottom=padding_bottom), GoldenSection("second", padding_top=padding_top)]
+
+    assert compose(*sections) == to_text_by_concatenation(sections)
+
+
+def test_top_padding_disabled_under_larger_bottom_padding():
+    # the bottom padding of the first section is larger, so the second one's top padding is dropped
+    assert compose(GoldenSection("a", padding_bottom=3), GoldenSection("b", padding_top=1)) == "a\n\n\n\nb\n"
+
+
+def test_larger_top_padding_replaces_bottom_padding():
+    assert compose(GoldenSection("a", padding_bottom=1), GoldenSection("b", padding_top=2)) == "a\n\n\nb\n"
+
+
+def test_random_scenes_match_concatenation():
+    rng = Random(0)
+
+    for _ in range(2000):
+        sections = [
+            GoldenSection(rng.choice(["", "text", "two\nlines", "trailing\n\n"]), rng.randrange(4), rng.randrange(4))
+            for _ in range(rng.randrange(1, 8))
+        ]
+
+        assert compose(*sections) == to_text_by_concatenation(sections)
+
+
+def test_cached_sections_match_uncached():
+    title = TitleSection("Castle")
+    uncached = Section(title.to_text().rstrip("\n"))
+
+    for disable_top_padding in (False, True, False):
+        assert title.to_text(disable_top_padding) == uncached.to_text(disable_top_padding)
+
+
+def test_title_sections_are_shared():
+    assert get_title_section("Castle") is get_title_section("Castle")
+    assert get_title_section("Castle") is not get_title_section("Tower")
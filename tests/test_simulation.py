@@ -0,0 +1,40 @@
+from pathlib import Path as FilePath
+
+from mystics_and_manuscripts.simulation import UNFINISHED, simulate
+
+LEVEL_PATH = str(FilePath(__file__).parent.parent / "levels" / "castle" / "level.yaml")
+
+# options leading to the win in the play-through with seed 21 (paths with several destinations pick one at random)
+WINNING_CHOICES = [
+    0, 1, 3, 2, 2, 0, 1, 1, 0, 0, 0, 0, 2, 4, 3, 0, 1, 0, 0, 2, 0, 1, 1, 1, 0, 2, 2, 3, 0, 2, 0, 0, 0, 0, 0, 1, 0, 2,
+    1, 3, 1, 0, 0, 0, 1, 1, 0, 0, 0, 2, 2, 4, 0, 0, 2, 1, 2, 0, 0, 1, 0, 2, 1, 2, 2, 1, 0, 1, 0, 1, 0, 0, 0, 0, 2, 2,
+    3, 0, 3, 0, 4, 1, 1, 0, 0, 2, 0, 2, 1, 1, 1, 1, 0, 0, 0, 0, 0, 1, 1, 0, 0, 2, 1, 1, 1, 2, 0, 0, 1, 3, 2, 0, 0, 0,
+    0, 1, 1, 2, 3, 0, 2, 0, 2, 2,
+]
+
+
+def test_scripted_play_through_wins():
+    report = simulate(LEVEL_PATH, 1, "scripted", WINNING_CHOICES, workers=1, seed=21)
+
+    assert report.outcomes == {"win": 1}
+    assert report.step_counts == {len(WINNING_CHOICES): 1}
+
+
+def test_scripted_outcome_counts():
+    report = simulate(LEVEL_PATH, 50, "scripted", [0, 1], workers=1)
+
+    # the second path leads to one of two places at random
+    assert report.runs == 50
+    assert report.outcomes == {UNFINISHED: 50}
+    assert report.end_places == {32: 24, 5: 26}
+    assert report.step_counts == {2: 50}
+
+
+def test_results_do_not_depend_on_workers():
+    report = simulate(LEVEL_PATH, 40, "random", workers=1, seed=7)
+    parallel_report = simulate(LEVEL_PATH, 40, "random", workers=2, seed=7)
+
+    assert report.runs == parallel_report.runs == 40
+    assert report.outcomes == parallel_report.outcomes
+    assert report.end_places == parallel_report.end_places
+    assert report.step_counts == parallel_report.step_counts
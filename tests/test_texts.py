@@ -0,0 +1,75 @@
+import pickle
+import shutil
+from pathlib import Path as FilePath
+
+import pytest
+
+from mystics_and_manuscripts.level import Level, LevelLibrary
+from mystics_and_manuscripts.level.bundle import LevelBundle, compile_level_file
+from mystics_and_manuscripts.level.cache import load_level_dict
+from mystics_and_manuscripts.level.texts import TextStore, resolve_text
+
+CASTLE_FOLDER_PATH = FilePath(__file__).parent.parent / "levels" / "castle"
+LEVEL_PATH = CASTLE_FOLDER_PATH / "level.yaml"
+
+
+def get_texts(level: Level) -> list:
+    return [level.introduction, *(dict(level_object) for level_object in [*level.places, *level.paths])]
+
+
+@pytest.fixture(scope="module")
+def plain_level():
+    return Level(load_level_dict(str(LEVEL_PATH)), str(LEVEL_PATH), "plain")
+
+
+@pytest.fixture(scope="module")
+def compressed_level():
+    return Level(load_level_dict(str(LEVEL_PATH)), str(LEVEL_PATH), "compressed")
+
+
+def test_store_round_trip():
+    texts = ["", "short", "ünïcödé", "long " * 10000]
+
+    store = TextStore()
+    indexes = [store.add(text) for text in texts]
+    list_indexes = store.add(("first", "second"))
+    store.compress()
+
+    assert [resolve_text(index, store) for index in indexes] == texts
+    assert resolve_text(list_indexes, store) == ("first", "second")
+    assert resolve_text(None, store) is None
+
+
+def test_compressed_texts_match_plain(plain_level, compressed_level):
+    assert get_texts(compressed_level) == get_texts(plain_level)
+
+
+def test_bundle_texts_match_plain(plain_level, tmp_path):
+    for file_name in ("level.yaml", "level.py"):
+        shutil.copy2(CASTLE_FOLDER_PATH / file_name, tmp_path / file_name)
+
+    bundle = LevelBundle(compile_level_file(tmp_path / "level.yaml"))
+
+    try:
+        assert get_texts(Level(bundle, str(tmp_path / "level.yaml"))) == get_texts(plain_level)
+    finally:
+        bundle.close()
+
+
+def test_overridden_description_is_restored(plain_level, compressed_level):
+    place = compressed_level.places[0]
+    place.description = "Overridden."
+
+    assert place.description == "Overridden."
+
+    compressed_level.reset()
+
+    assert dict(place) == dict(plain_level.places[0])
+
+
+@pytest.mark.parametrize("text_storage", ["plain", "compressed"])
+def test_level_can_be_pickled(plain_level, text_storage):
+    level = LevelLibrary(text_storage=text_storage).get_level(str(LEVEL_PATH))
+    unpickled_level = pickle.loads(pickle.dumps(level))
+
+    assert get_texts(unpickled_level) == get_texts(plain_level)